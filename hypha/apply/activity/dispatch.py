@@ -0,0 +1,132 @@
+import logging
+import math
+
+from django.conf import settings
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpRequest
+from django.urls import set_urlconf
+from django.utils import timezone
+
+from .tasks import queue_on_commit
+
+logger = logging.getLogger(__name__)
+
+
+def site_request():
+    """Mock a HttpRequest in order to pass the site settings into the templates"""
+    from hypha.apply.home.models import ApplyHomePage
+
+    site = ApplyHomePage.objects.first().get_site()
+    set_urlconf('hypha.apply.urls')
+
+    request = HttpRequest()
+    request.META['SERVER_NAME'] = site.hostname
+    request.META['SERVER_PORT'] = site.port
+    request.META[settings.SECURE_PROXY_SSL_HEADER] = 'https'
+    request.session = {}
+    request._messages = FallbackStorage(request)
+    return request
+
+
+class Dispatcher:
+    """
+    Sends the messages for rows which have fallen due, e.g. reminders.
+
+    Subclasses give the queryset of the rows due, how to send the message for one
+    and how to mark a set of them as sent. Rows are claimed with SELECT ... FOR
+    UPDATE SKIP LOCKED so any number of workers can dispatch at once without
+    sending a message twice.
+    """
+    name = None
+
+    def __init__(self, **options):
+        self.options = options
+
+    def due(self):
+        raise NotImplementedError
+
+    def send(self, request, instance):
+        raise NotImplementedError
+
+    def mark_sent(self, queryset):
+        raise NotImplementedError
+
+    def describe(self, instance):
+        return str(instance.pk)
+
+    def claim(self, batch_size, exclude=()):
+        # Locks only the rows being dispatched, not the rows they are joined to
+        due = self.due().exclude(pk__in=exclude)
+        return list(due.select_for_update(skip_locked=True, of=('self',))[:batch_size])
+
+    def dispatch_batch(self, batch_size, request=None, exclude=()):
+        """Claim, send and mark sent up to batch_size rows, returns the rows sent and failed"""
+        request = request or site_request()
+        sent = []
+        failed = []
+        # The emails and Slack posts are only queued once the rows are marked sent,
+        # so a batch that fails to commit doesn't send them again on the next run
+        with transaction.atomic(), queue_on_commit():
+            for instance in self.claim(batch_size, exclude=exclude):
+                try:
+                    # A savepoint each, so a failed send doesn't break the batch
+                    with transaction.atomic():
+                        self.send(request, instance)
+                except Exception:
+                    # Left unmarked to be picked up by the next run
+                    logger.exception('Failed to dispatch %s %s', self.name, self.describe(instance))
+                    failed.append(instance)
+                else:
+                    sent.append(instance)
+            self.mark_sent(self.due().model.objects.filter(pk__in=[instance.pk for instance in sent]))
+        return sent, failed
+
+    def dispatch_all(self, batch_size, request=None):
+        """Dispatch everything due in this process, batch by batch"""
+        request = request or site_request()
+        # Rows which failed are left for the next run rather than retried in this one
+        failed_ids = []
+        while True:
+            sent, failed = self.dispatch_batch(batch_size, request=request, exclude=failed_ids)
+            failed_ids.extend(instance.pk for instance in failed)
+            yield sent, failed
+            if len(sent) + len(failed) < batch_size:
+                return
+
+    def batches_due(self, batch_size):
+        return math.ceil(self.due().count() / batch_size)
+
+
+def start_run(dispatcher, batch_task, batch_size):
+    """Record a run and fan the rows due out to a batch_task per batch"""
+    from .models import DispatchRun
+
+    batches = dispatcher.batches_due(batch_size)
+    run = DispatchRun.objects.create(
+        kind=dispatcher.name,
+        batches=batches,
+        finished=None if batches else timezone.now(),
+    )
+    for _ in range(batches):
+        batch_task.delay(run.pk, batch_size, **dispatcher.options)
+    return run
+
+
+def run_batch(dispatcher, run_id, batch_size):
+    from .models import DispatchRun
+
+    sent, failed = dispatcher.dispatch_batch(batch_size)
+    DispatchRun.objects.filter(pk=run_id).update(
+        batches_done=F('batches_done') + 1,
+        sent=F('sent') + len(sent),
+        failed=F('failed') + len(failed),
+    )
+    # Finished once the last of its batches is done
+    DispatchRun.objects.filter(
+        pk=run_id,
+        finished__isnull=True,
+        batches_done__gte=F('batches'),
+    ).update(finished=timezone.now())
+    return len(sent)
@@ -1,18 +1,20 @@
 import json
 import logging
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 
-import requests
+from django.apps import apps
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
 from django.db import models
 from django.template.loader import render_to_string
+from django.test import RequestFactory
 from django.utils import timezone
 
 from .models import ALL, TEAM
 from .options import MESSAGES
-from .tasks import send_mail
+from .tasks import queue_message, send_mail, send_slack_message
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -82,9 +84,85 @@ def is_ready_for_review(message_type):
     return message_type in [MESSAGES.READY_FOR_REVIEW, MESSAGES.BATCH_READY_FOR_REVIEW]
 
 
+# The objects of these are gone by the time a task could fetch them again
+PROCESS_IN_REQUEST = {
+    MESSAGES.DELETE_SUBMISSION,
+    MESSAGES.BATCH_DELETE_SUBMISSION,
+    MESSAGES.DELETE_REVIEW,
+    MESSAGES.DELETE_PAYMENT_REQUEST,
+    MESSAGES.DELETE_REMINDER,
+}
+
+
+def serialize(value):
+    """The value in a form which can be queued, with the objects in it by id"""
+    from hypha.apply.funds.workflow import WORKFLOWS, Phase
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, models.Model) and value.pk is not None:
+        return {'model': value._meta.label, 'pk': value.pk}
+    if isinstance(value, models.QuerySet):
+        return {'queryset': value.model._meta.label, 'pks': list(value.values_list('pk', flat=True))}
+    if isinstance(value, (list, tuple)):
+        return {'list': [serialize(item) for item in value]}
+    if isinstance(value, dict):
+        # As pairs, the keys are often ids which JSON would turn into strings
+        return {'dict': [[serialize(key), serialize(item)] for key, item in value.items()]}
+    if isinstance(value, Phase):
+        for workflow in WORKFLOWS.values():
+            if workflow.get(value.name) is value:
+                return {'phase': [workflow.admin_name, value.name]}
+    raise TypeError(f'{value!r} can not be queued')
+
+
+def deserialize(value):
+    """The value as serialized, with the objects fetched again in one query per model"""
+    from hypha.apply.funds.workflow import WORKFLOWS
+
+    pks = defaultdict(set)
+
+    def collect(value):
+        if not isinstance(value, dict):
+            return
+        if 'model' in value:
+            pks[value['model']].add(value['pk'])
+        for item in value.get('list', []):
+            collect(item)
+        for pair in value.get('dict', []):
+            collect(pair[0])
+            collect(pair[1])
+
+    collect(value)
+    objects = {
+        label: apps.get_model(label)._default_manager.in_bulk(ids)
+        for label, ids in pks.items()
+    }
+
+    def build(value):
+        if not isinstance(value, dict):
+            return value
+        if 'model' in value:
+            try:
+                return objects[value['model']][value['pk']]
+            except KeyError:
+                raise apps.get_model(value['model']).DoesNotExist(value) from None
+        if 'queryset' in value:
+            return apps.get_model(value['queryset'])._default_manager.filter(pk__in=value['pks'])
+        if 'list' in value:
+            return [build(item) for item in value['list']]
+        if 'dict' in value:
+            return {build(key): build(item) for key, item in value['dict']}
+        workflow_name, phase_name = value['phase']
+        return WORKFLOWS[workflow_name][phase_name]
+
+    return build(value)
+
+
 class AdapterBase:
     messages = {}
     always_send = False
+    # Otherwise run by a task once the events are committed
+    in_request = False
 
     def message(self, message_type, **kwargs):
         try:
@@ -188,7 +266,8 @@ class AdapterBase:
                     debug_message = '{} [to: {}]: {}'.format(self.adapter_type, recipient, message)
                 else:
                     debug_message = '{}: {}'.format(self.adapter_type, message)
-                messages.add_message(request, messages.DEBUG, debug_message)
+                # Not kept when run by a task, there is no one to show them to
+                messages.add_message(request, messages.DEBUG, debug_message, fail_silently=True)
 
     def create_logs(self, message, recipient, *events):
         from .models import Message
@@ -650,7 +729,19 @@ class SlackAdapter(AdapterBase):
 
         return target_rooms
 
-    def send_message(self, message, recipient, source, **kwargs):
+    def process_batch(self, *args, **kwargs):
+        # Batch actions send a message per lead, coalesce those going to the
+        # same rooms into a single post
+        pending = OrderedDict()
+        super().process_batch(*args, pending_posts=pending, **kwargs)
+        for target_rooms, (lines, logs) in pending.items():
+            data = {
+                "room": list(target_rooms),
+                "message": "\n".join(lines),
+            }
+            send_slack_message(self.destination, data, logs=logs)
+
+    def send_message(self, message, recipient, source, logs=None, pending_posts=None, **kwargs):
         target_rooms = self.slack_channels(source, **kwargs)
 
         if not self.destination or not any(target_rooms):
@@ -663,13 +754,17 @@ class SlackAdapter(AdapterBase):
 
         message = ' '.join([recipient, message]).strip()
 
+        if pending_posts is not None:
+            messages, pending_logs = pending_posts.setdefault(tuple(target_rooms), ([], []))
+            messages.append(message)
+            pending_logs.extend(logs or [])
+            return
+
         data = {
             "room": target_rooms,
             "message": message,
         }
-        response = requests.post(self.destination, json=data)
-
-        return str(response.status_code) + ': ' + response.content.decode()
+        send_slack_message(self.destination, data, logs=logs)
 
 
 class EmailAdapter(AdapterBase):
@@ -717,11 +812,11 @@ class EmailAdapter(AdapterBase):
         }
 
     def handle_transition(self, old_phase, source, **kwargs):
-        from hypha.apply.funds.workflow import PHASES
+        from hypha.apply.funds.workflow import PHASE_INDEX
         submission = source
         # Retrive status index to see if we are going forward or backward.
-        old_index = list(dict(PHASES).keys()).index(old_phase.name)
-        target_index = list(dict(PHASES).keys()).index(submission.status)
+        old_index = PHASE_INDEX[old_phase.name]
+        target_index = PHASE_INDEX[submission.status]
         is_forward = old_index < target_index
 
         if is_forward:
@@ -888,6 +983,7 @@ class EmailAdapter(AdapterBase):
 class DjangoMessagesAdapter(AdapterBase):
     adapter_type = 'Django'
     always_send = True
+    in_request = True
 
     messages = {
         MESSAGES.BATCH_REVIEWERS_UPDATED: 'batch_reviewers_updated',
@@ -969,19 +1065,59 @@ class MessengerBackend:
         return self.send(*args, related=related, **kwargs)
 
     def send(self, message_type, request, user, related, source=None, sources=list(), **kwargs):
+        """
+        Record the events, then render and send the messages of each adapter.
+
+        Only the adapters which need the request run straight away. The others are
+        queued with the objects by id and run by process_message_task, unless the
+        objects can't be fetched again.
+        """
         from .models import Event
         if source:
-            event = Event.objects.create(type=message_type.name, by=user, source=source)
-            for adapter in self.adapters:
-                adapter.process(message_type, event, request=request, user=user, source=source, related=related, **kwargs)
-
+            events = [Event.objects.create(type=message_type.name, by=user, source=source)]
         elif sources:
             events = Event.objects.bulk_create(
                 Event(type=message_type.name, by=user, source=source)
                 for source in sources
             )
-            for adapter in self.adapters:
-                adapter.process_batch(message_type, events, request=request, user=user, sources=sources, related=related, **kwargs)
+        else:
+            return
+
+        kwargs = {'user': user, 'related': related, **kwargs}
+        try:
+            queued = None if message_type in PROCESS_IN_REQUEST else serialize({'source': source, 'sources': sources, **kwargs})
+        except TypeError:
+            queued = None
+
+        for adapter in self.adapters:
+            if queued is None or adapter.in_request:
+                self.process(adapter, message_type, events, request, source=source, sources=sources, **kwargs)
+            else:
+                queue_message(
+                    adapter_type=adapter.adapter_type,
+                    message_type=message_type.name,
+                    event_ids=[event.id for event in events],
+                    request=request and {'host': request.get_host(), 'secure': request.is_secure()},
+                    values=queued,
+                )
+
+    def process(self, adapter, message_type, events, request, source, sources, **kwargs):
+        if source:
+            adapter.process(message_type, events[0], request=request, source=source, **kwargs)
+        else:
+            adapter.process_batch(message_type, events, request=request, sources=sources, **kwargs)
+
+    def process_queued(self, adapter_type, message_type, event_ids, request, values):
+        """Run an adapter queued by send, with the objects fetched again"""
+        from .models import Event
+        adapter = next(adapter for adapter in self.adapters if adapter.adapter_type == adapter_type)
+        events = list(Event.objects.filter(id__in=event_ids).prefetch_related('source').order_by('id'))
+        kwargs = deserialize(values)
+        if request is not None:
+            # Enough of the request for the links and templates of the messages
+            request = RequestFactory().get('/', HTTP_HOST=request['host'], secure=request['secure'])
+            request.user = kwargs['user'] or AnonymousUser()
+        self.process(adapter, MESSAGES[message_type], events, request, **kwargs)
 
 
 adapters = [
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.16 on 2026-10-17 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity', '0055_add_batch_delete_submission'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DispatchRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50)),
+                ('started', models.DateTimeField(auto_now_add=True)),
+                ('finished', models.DateTimeField(null=True)),
+                ('batches', models.PositiveIntegerField(default=0)),
+                ('batches_done', models.PositiveIntegerField(default=0)),
+                ('sent', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-started'],
+            },
+        ),
+    ]
@@ -188,3 +188,21 @@ class Message(models.Model):
                 default=Concat('status', Value('<br />' + status))
             )
             self.save()
+
+
+class DispatchRun(models.Model):
+    """Counts for a scheduled dispatch of due messages, see activity.dispatch"""
+
+    kind = models.CharField(max_length=50)
+    started = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(null=True)
+    batches = models.PositiveIntegerField(default=0)
+    batches_done = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-started']
+
+    def __str__(self):
+        return f'{self.kind} at {self.started}: {self.sent} sent, {self.failed} failed'
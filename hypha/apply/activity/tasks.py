@@ -1,15 +1,47 @@
+import threading
+from contextlib import contextmanager
+
+import requests
 from celery import Celery
 from django.conf import settings
 from django.core.mail import EmailMessage
+from django.db import transaction
+
+from hypha.apply.utils.slack import post_to_slack
 
 app = Celery('tasks')
 
 app.config_from_object(settings, namespace='CELERY', force=True)
+# Pick up the tasks modules of the other apps
+app.autodiscover_tasks()
+
+
+_deferred = threading.local()
+
+
+@contextmanager
+def queue_on_commit():
+    """Hold the messages sent within back until the current transaction commits"""
+    previous = getattr(_deferred, 'active', False)
+    _deferred.active = True
+    try:
+        yield
+    finally:
+        _deferred.active = previous
+
+
+def queue(task, **options):
+    if getattr(_deferred, 'active', False):
+        # Dropped along with the savepoint if the send is rolled back
+        transaction.on_commit(lambda: task.apply_async(**options))
+    else:
+        task.apply_async(**options)
 
 
 def send_mail(subject, message, from_address, recipients, logs=None):
     # Convenience method to wrap the tasks and handle the callback
-    send_mail_task.apply_async(
+    queue(
+        send_mail_task,
         kwargs={
             'subject': subject,
             'body': message,
@@ -40,6 +72,53 @@ def send_mail_task(**kwargs):
     return response
 
 
+def send_slack_message(destination, data, logs=None):
+    # Post to slack outside of the request, the status is recorded on the logs once sent
+    queue(
+        send_slack_message_task,
+        kwargs={
+            'destination': destination,
+            'data': data,
+        },
+        link=update_message_status.s([log.pk for log in logs or []]),
+    )
+
+
+@app.task(bind=True, max_retries=5)
+def send_slack_message_task(self, destination, data):
+    retries_left = self.request.retries < self.max_retries
+    # Back off exponentially: 1, 2, 4, 8 then 16 seconds
+    countdown = 2 ** self.request.retries
+    try:
+        response = post_to_slack(destination, data)
+    except requests.RequestException as e:
+        if retries_left:
+            raise self.retry(exc=e, countdown=countdown)
+        return {'status': 'Error: ' + str(e), 'id': None}
+
+    if response.status_code >= 500 and retries_left:
+        raise self.retry(countdown=countdown)
+
+    return {
+        'status': str(response.status_code) + ': ' + response.content.decode(),
+        'id': None,
+    }
+
+
+def queue_message(**kwargs):
+    # Fetches the objects again so can only run once they are committed
+    if process_message_task.app.conf.task_always_eager:
+        process_message_task(**kwargs)
+    else:
+        transaction.on_commit(lambda: process_message_task.apply_async(kwargs=kwargs))
+
+
+@app.task
+def process_message_task(adapter_type, message_type, event_ids, request, values):
+    from .messaging import messenger
+    messenger.process_queued(adapter_type, message_type, event_ids, request, values)
+
+
 @app.task
 def update_message_status(response, message_pks):
     from .models import Message
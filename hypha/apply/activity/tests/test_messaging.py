@@ -8,6 +8,7 @@ from django.contrib.messages import get_messages
 from django.core import mail
 from django.test import TestCase, override_settings
 
+from hypha.apply.funds.models import ApplicationSubmission
 from hypha.apply.funds.tests.factories import (
     ApplicationSubmissionFactory,
     AssignedReviewersFactory,
@@ -30,9 +31,12 @@ from ..messaging import (
     EmailAdapter,
     MessengerBackend,
     SlackAdapter,
+    deserialize,
     neat_related,
+    serialize,
 )
 from ..models import ALL, TEAM, Activity, Event, Message
+from ..tasks import process_message_task
 from .factories import CommentFactory, EventFactory, MessageFactory
 
 
@@ -204,6 +208,41 @@ class TestMessageBackendProject(TestMessageBackendApplication):
     source_factory = ProjectFactory
 
 
+@override_settings(ROOT_URLCONF='hypha.apply.urls', SEND_MESSAGES=True)
+class TestQueuedMessages(TestCase):
+    def test_values_fetched_again(self):
+        submission = ApplicationSubmissionFactory()
+        values = {
+            'source': submission,
+            'sources': ApplicationSubmission.objects.filter(id=submission.id),
+            'transitions': {submission.id: submission.phase},
+            'added': [(None, submission.user)],
+        }
+        restored = deserialize(json.loads(json.dumps(serialize(values))))
+        self.assertEqual(restored['source'], submission)
+        self.assertEqual(list(restored['sources']), [submission])
+        self.assertIs(restored['transitions'][submission.id], submission.phase)
+        self.assertEqual(restored['added'], [[None, submission.user]])
+
+    def test_unsaved_objects_not_queued(self):
+        with self.assertRaises(TypeError):
+            serialize({'related': ApplicationSubmission()})
+
+    def test_adapters_run_once_committed(self):
+        submission = ApplicationSubmissionFactory()
+        messenger = MessengerBackend(ActivityAdapter())
+        with patch('hypha.apply.activity.tasks.process_message_task') as task, \
+                patch('django.db.transaction.on_commit') as on_commit:
+            task.app.conf.task_always_eager = False
+            messenger(MESSAGES.NEW_SUBMISSION, request=make_request(), user=submission.user, source=submission, related=None)
+            self.assertEqual(Event.objects.count(), 1)
+            self.assertFalse(Activity.objects.exists())
+            on_commit.call_args[0][0]()
+
+        process_message_task(**json.loads(json.dumps(task.apply_async.call_args[1]['kwargs'])))
+        self.assertEqual(Activity.objects.get().source, submission)
+
+
 @override_settings(SEND_MESSAGES=True)
 class TestActivityAdapter(TestCase):
     def setUp(self):
@@ -459,6 +498,30 @@ class TestSlackAdapter(AdapterMixin, TestCase):
         self.assertEqual(sent_message.content[0:10], self.adapter.messages[MESSAGES.NEW_SUBMISSION][0:10])
         self.assertEqual(sent_message.status, '400: Bad Request')
 
+    @override_settings(
+        SLACK_DESTINATION_URL=target_url,
+        SLACK_DESTINATION_ROOM=target_room,
+    )
+    @responses.activate
+    def test_batch_messages_coalesced_into_one_post(self):
+        responses.add(responses.POST, self.target_url, status=200, body='OK')
+        submissions = ApplicationSubmissionFactory.create_batch(2)
+        sources = ApplicationSubmission.objects.filter(id__in=[submission.id for submission in submissions])
+        events = [EventFactory(source=source) for source in sources]
+
+        SlackAdapter().process_batch(
+            MESSAGES.BATCH_DELETE_SUBMISSION,
+            events,
+            request=make_request(),
+            user=StaffFactory(),
+            sources=sources,
+        )
+        self.assertEqual(len(responses.calls), 1)
+        posted = json.loads(responses.calls[0].request.body)
+        self.assertEqual(posted['room'], [self.target_room])
+        self.assertEqual(len(posted['message'].split('\n')), 2)
+        self.assertEqual(Message.objects.filter(status='200: OK').count(), 2)
+
 
 @override_settings(SEND_MESSAGES=True)
 class TestEmailAdapter(AdapterMixin, TestCase):
@@ -1,8 +1,10 @@
 from unittest.mock import patch
 
+import responses
 from django.test import TestCase
 
-from ..tasks import send_mail
+from ..models import Message
+from ..tasks import send_mail, send_slack_message
 from .factories import MessageFactory
 
 
@@ -17,3 +19,23 @@ class TestSendEmail(TestCase):
         }
         send_mail(*kwargs, logs=[MessageFactory()])
         email_mock.assert_called_once_with(**kwargs)
+
+
+class TestSendSlackMessage(TestCase):
+    target_url = 'https://my-slack-backend.com/incoming/my-very-secret-key'
+
+    @responses.activate
+    def test_status_recorded_on_logs(self):
+        responses.add(responses.POST, self.target_url, status=200, body='OK')
+        log = MessageFactory(status='')
+        send_slack_message(self.target_url, {'room': ['#room'], 'message': 'message'}, logs=[log])
+        self.assertEqual(Message.objects.get(id=log.id).status, '200: OK')
+
+    @responses.activate
+    def test_retries_server_errors(self):
+        responses.add(responses.POST, self.target_url, status=503, body='Unavailable')
+        responses.add(responses.POST, self.target_url, status=200, body='OK')
+        log = MessageFactory(status='')
+        send_slack_message(self.target_url, {'room': ['#room'], 'message': 'message'}, logs=[log])
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(Message.objects.get(id=log.id).status, '200: OK')
@@ -9,6 +9,7 @@ from hypha.apply.funds.models import (
     LabType,
     RoundsAndLabs,
 )
+from hypha.apply.funds.tables import SubmissionSearchFilter
 from hypha.apply.funds.workflow import PHASES
 
 
@@ -25,14 +26,16 @@ class SubmissionsFilter(filters.FilterSet):
     status = filters.MultipleChoiceFilter(choices=PHASES)
     active = filters.BooleanFilter(method='filter_active', label='Active')
     submit_date = filters.DateFromToRangeFilter(field_name='submit_time', label='Submit date')
+    value = filters.RangeFilter(field_name='named_value', label='Value')
     fund = filters.ModelMultipleChoiceFilter(
         field_name='page', label='fund',
         queryset=Page.objects.type(FundType) | Page.objects.type(LabType)
     )
+    query = SubmissionSearchFilter(label='Search')
 
     class Meta:
         model = ApplicationSubmission
-        fields = ('status', 'round', 'active', 'submit_date', 'fund', )
+        fields = ('status', 'round', 'active', 'submit_date', 'value', 'fund', 'query', )
 
     def filter_active(self, qs, name, value):
         if value is None:
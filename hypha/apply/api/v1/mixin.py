@@ -8,3 +8,23 @@ class SubmissionNestedMixin:
         return get_object_or_404(
             ApplicationSubmission, id=self.kwargs['submission_pk']
         )
+
+
+class KeysetPaginationMixin:
+    """
+    Switch to the keyset_pagination_class when the request includes a cursor.
+
+    Send an empty cursor (?cursor=) to request the first page.
+    """
+    keyset_pagination_class = None
+
+    def use_keyset_pagination(self):
+        if not self.keyset_pagination_class or self.request is None:
+            return False
+        return self.keyset_pagination_class.cursor_query_param in self.request.query_params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.use_keyset_pagination():
+            self._paginator = self.keyset_pagination_class()
+        return super().paginator
@@ -1,6 +1,67 @@
+from collections import OrderedDict
+
+from django_tables2.paginators import LazyPaginator
 from rest_framework import pagination
+from rest_framework.response import Response
 
 
 class StandardResultsSetPagination(pagination.PageNumberPagination):
+    """
+    Page number pagination, pass count=false to skip counting the total results.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    count_query_param = 'count'
+    count_results = True
+
+    @property
+    def django_paginator_class(self):
+        if self.count_results:
+            return super().django_paginator_class
+        # Looks one row past the page to find out if there is a next page
+        return LazyPaginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_results = request.query_params.get(self.count_query_param, '').lower() != 'false'
+        return super().paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        if self.count_results:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', None),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class KeysetResultsSetPagination(pagination.CursorPagination):
+    """
+    Cursor pagination, the cost of a page doesn't grow with how deep it is.
+
+    No total count is returned. Subclasses list the supported orderings, the
+    first one is the default and the others are picked with ?ordering=<name>.
+    """
     page_size_query_param = 'page_size'
     max_page_size = 1000
+    ordering_query_param = 'ordering'
+    orderings = {}
+
+    def get_ordering(self, request, queryset, view):
+        default = next(iter(self.orderings.values()))
+        return self.orderings.get(request.query_params.get(self.ordering_query_param), default)
+
+
+class SubmissionKeysetPagination(KeysetResultsSetPagination):
+    orderings = OrderedDict([
+        ('submit_time', ('submit_time', 'id')),
+        # Annotated by the view from the indexed SubmissionTableStats.last_activity
+        ('last_update', ('last_activity', 'id')),
+    ])
+
+
+class CommentKeysetPagination(KeysetResultsSetPagination):
+    orderings = OrderedDict([
+        ('timestamp', ('timestamp', 'id')),
+    ])
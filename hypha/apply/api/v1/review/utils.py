@@ -40,7 +40,7 @@ def review_workflow_actions(request, submission):
 
 def get_review_form_fields_for_stage(submission):
     forms = submission.get_from_parent('review_forms').all()
-    index = submission.workflow.stages.index(submission.stage)
+    index = submission.workflow.stage_index(submission.stage)
     try:
         return forms[index].form.form_fields
     except IndexError:
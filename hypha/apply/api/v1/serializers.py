@@ -10,7 +10,11 @@ from hypha.apply.determinations.templatetags.determination_tags import (
     show_determination_button,
 )
 from hypha.apply.determinations.views import DeterminationCreateOrUpdateView
-from hypha.apply.funds.models import ApplicationSubmission, RoundsAndLabs
+from hypha.apply.funds.models import (
+    ApplicationSubmission,
+    RoundsAndLabs,
+    SubmissionStats,
+)
 from hypha.apply.review.models import Review, ReviewOpinion
 from hypha.apply.review.options import RECOMMENDATION_CHOICES
 from hypha.apply.users.groups import PARTNER_GROUP_NAME, STAFF_GROUP_NAME
@@ -219,10 +223,11 @@ class SubmissionActionSerializer(serializers.ModelSerializer):
 
 class RoundLabDetailSerializer(serializers.ModelSerializer):
     workflow = serializers.SerializerMethodField()
+    stats = serializers.SerializerMethodField()
 
     class Meta:
         model = RoundsAndLabs
-        fields = ('id', 'title', 'workflow')
+        fields = ('id', 'title', 'workflow', 'stats')
 
     def get_workflow(self, obj):
         return [
@@ -233,6 +238,18 @@ class RoundLabDetailSerializer(serializers.ModelSerializer):
             for phase in obj.workflow.values()
         ]
 
+    def get_stats(self, obj):
+        stats = SubmissionStats.objects.for_round(obj).current()
+        totals = stats.totals()
+        return {
+            'submissions': totals['submissions'],
+            'closed': stats.inactive().totals()['submissions'],
+            'value_count': totals['value__count'],
+            'value_sum': totals['value__sum'],
+            'value_average': totals['value__avg'],
+            'statuses': stats.status_counts(),
+        }
+
 
 class RoundLabSerializer(serializers.ModelSerializer):
     class Meta:
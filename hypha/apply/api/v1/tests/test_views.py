@@ -3,7 +3,9 @@ from django.urls import reverse_lazy
 
 from hypha.apply.activity.models import ALL, APPLICANT, Activity
 from hypha.apply.activity.tests.factories import CommentFactory
-from hypha.apply.users.tests.factories import UserFactory
+from hypha.apply.funds.tests.factories import ApplicationSubmissionFactory
+from hypha.apply.users.tests.factories import StaffFactory, UserFactory
+from hypha.apply.utils.testing import OnCommitMixin
 
 
 @override_settings(ROOT_URLCONF='hypha.apply.urls')
@@ -90,3 +92,55 @@ class TestCommentEdit(TestCase):
         self.assertEqual(response_one.status_code, 200, response_one.json())
         self.assertEqual(response_two.status_code, 404, response_two.json())
         self.assertEqual(Activity.objects.count(), 2)
+
+
+@override_settings(ROOT_URLCONF='hypha.apply.urls')
+class TestSubmissionPagination(TestCase):
+    def setUp(self):
+        self.client.force_login(StaffFactory())
+        self.submissions = ApplicationSubmissionFactory.create_batch(3)
+
+    def get_page(self, url=None, **params):
+        url = url or reverse_lazy('api:v1:submissions-list')
+        response = self.client.get(url, data=params, secure=True)
+        self.assertEqual(response.status_code, 200, response.json())
+        return response.json()
+
+    def test_can_skip_count(self):
+        data = self.get_page(page_size=2, count='false')
+        self.assertIsNone(data['count'])
+        self.assertEqual(len(data['results']), 2)
+        self.assertIsNotNone(data['next'])
+
+    def test_cursor_walks_all_submissions(self):
+        data = self.get_page(cursor='', page_size=2)
+        self.assertNotIn('count', data)
+        ids = [result['id'] for result in data['results']]
+
+        data = self.get_page(url=data['next'])
+        ids += [result['id'] for result in data['results']]
+
+        self.assertIsNone(data['next'])
+        self.assertEqual(ids, [submission.id for submission in self.submissions])
+
+    def test_cursor_by_last_update(self):
+        CommentFactory(source=self.submissions[0])
+        data = self.get_page(cursor='', ordering='last_update', page_size=10)
+        ids = [result['id'] for result in data['results']]
+        self.assertEqual(ids, [submission.id for submission in self.submissions[1:] + self.submissions[:1]])
+
+
+@override_settings(ROOT_URLCONF='hypha.apply.urls')
+class TestRoundStats(OnCommitMixin, TestCase):
+    def test_round_detail_has_stats(self):
+        self.client.force_login(StaffFactory())
+        submission = ApplicationSubmissionFactory()
+        ApplicationSubmissionFactory(round=submission.round)
+
+        response = self.client.get(
+            reverse_lazy('api:v1:rounds-detail', kwargs={'pk': submission.round.id}),
+            secure=True,
+        )
+        stats = response.json()['stats']
+        self.assertEqual(stats['submissions'], 2)
+        self.assertEqual(stats['statuses'], {submission.status: 2})
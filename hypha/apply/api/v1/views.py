@@ -1,6 +1,6 @@
 from django.core.exceptions import PermissionDenied as DjangoPermissionDenied
 from django.db import transaction
-from django.db.models import Prefetch
+from django.db.models import F, Prefetch
 from django.utils import timezone
 from django_filters import rest_framework as filters
 from rest_framework import mixins, permissions, viewsets
@@ -17,8 +17,12 @@ from hypha.apply.funds.models import ApplicationSubmission, RoundsAndLabs
 from hypha.apply.review.models import Review
 
 from .filters import CommentFilter, SubmissionsFilter
-from .mixin import SubmissionNestedMixin
-from .pagination import StandardResultsSetPagination
+from .mixin import KeysetPaginationMixin, SubmissionNestedMixin
+from .pagination import (
+    CommentKeysetPagination,
+    StandardResultsSetPagination,
+    SubmissionKeysetPagination,
+)
 from .permissions import IsApplyStaffUser, IsAuthor
 from .serializers import (
     CommentCreateSerializer,
@@ -33,13 +37,14 @@ from .serializers import (
 )
 
 
-class SubmissionViewSet(viewsets.ReadOnlyModelViewSet):
+class SubmissionViewSet(KeysetPaginationMixin, viewsets.ReadOnlyModelViewSet):
     permission_classes = (
         HasAPIKey | permissions.IsAuthenticated, HasAPIKey | IsApplyStaffUser,
     )
     filter_backends = (filters.DjangoFilterBackend,)
     filter_class = SubmissionsFilter
     pagination_class = StandardResultsSetPagination
+    keyset_pagination_class = SubmissionKeysetPagination
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -48,7 +53,11 @@ class SubmissionViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         if self.action == 'list':
-            return ApplicationSubmission.objects.current().with_latest_update()
+            # Read from the stored, indexed table stats so the cursor can seek on them
+            return ApplicationSubmission.objects.current().annotate(
+                last_update=F('table_stats__last_update'),
+                last_activity=F('table_stats__last_activity'),
+            )
         return ApplicationSubmission.objects.all().prefetch_related(
             Prefetch('reviews', Review.objects.submitted()),
         )
@@ -139,6 +148,7 @@ class RoundViewSet(
 
 
 class SubmissionCommentViewSet(
+    KeysetPaginationMixin,
     SubmissionNestedMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -155,6 +165,7 @@ class SubmissionCommentViewSet(
     filter_backends = (filters.DjangoFilterBackend,)
     filter_class = CommentFilter
     pagination_class = StandardResultsSetPagination
+    keyset_pagination_class = CommentKeysetPagination
 
     def get_queryset(self):
         return super().get_queryset().filter(
@@ -7,6 +7,15 @@ from wagtail.core.utils import resolve_model_string
 
 from hypha.apply.stream_forms.blocks import OptionalFormFieldBlock
 
+from .cache import category_options
+
+
+class LazyChosenInstance(SimpleLazyObject):
+    """Loads the chosen instance on first use, its primary key is known up front"""
+    def __init__(self, func, pk):
+        super().__init__(func)
+        self.__dict__['chosen_pk'] = pk
+
 
 class ModelChooserBlock(ChooserBlock):
     widget = forms.Select
@@ -21,7 +30,7 @@ class ModelChooserBlock(ChooserBlock):
 
     def to_python(self, value):
         super_method = super().to_python
-        return SimpleLazyObject(lambda: super_method(value))
+        return LazyChosenInstance(lambda: super_method(value), getattr(value, 'pk', value))
 
 
 class CategoryQuestionBlock(OptionalFormFieldBlock):
@@ -48,6 +57,11 @@ class CategoryQuestionBlock(OptionalFormFieldBlock):
         else:
             return forms.ChoiceField
 
+    def get_category_id(self, value):
+        category = value['category']
+        # Avoid loading the lazy category just to find its id
+        return getattr(category, 'chosen_pk', None) or category.pk
+
     def use_defaults_from_category(self, kwargs, category):
         category_fields = {'label': 'name', 'help_text': 'help_text'}
 
@@ -59,16 +73,14 @@ class CategoryQuestionBlock(OptionalFormFieldBlock):
 
     def get_field_kwargs(self, struct_value):
         kwargs = super().get_field_kwargs(struct_value)
-        category = struct_value['category']
+        category, options = category_options.get(self.get_category_id(struct_value))
         kwargs = self.use_defaults_from_category(kwargs, category)
-        choices = category.options.values_list('id', 'value')
-        kwargs.update({'choices': choices})
+        kwargs.update({'choices': list(options.items())})
         return kwargs
 
     def get_widget(self, struct_value):
         if struct_value['multi']:
-            category = struct_value['category']
-            category_size = category.options.count()
+            category_size = len(category_options.options(self.get_category_id(struct_value)))
             # Pick widget according to number of options to maintain good usability.
             if category_size < 32:
                 return forms.CheckboxSelectMultiple
@@ -78,9 +90,22 @@ class CategoryQuestionBlock(OptionalFormFieldBlock):
             return forms.RadioSelect
 
     def prepare_data(self, value, data, serialize):
-        category = value['category']
         if data:
-            data = category.options.filter(id__in=data).values_list('value', flat=True)
+            if isinstance(data, (str, int)):
+                # Single select answers are stored as the id on its own
+                data = [data]
+            selected = set()
+            for option_id in data:
+                try:
+                    selected.add(int(option_id))
+                except (TypeError, ValueError):
+                    # Legacy answers may hold something other than an option id
+                    pass
+            options = category_options.options(self.get_category_id(value))
+            data = [
+                option for option_id, option in options.items()
+                if option_id in selected
+            ]
         return data
 
     def get_searchable_content(self, value, data):
@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+
+from django.core.signals import request_started
+
+from hypha.apply.stream_forms.cache import definitions_version
+
+
+class CategoryOptionsCache:
+    """Per process map of the categories and their option id -> value
+
+    Follows the shared stream form definitions version, which is bumped whenever a
+    category or option changes, so every process drops its copy together. The
+    version is read once per request, or once per batch by preload_category_options,
+    rather than for every answer rendered.
+    """
+    def __init__(self):
+        self._categories = {}
+        self._version = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def clear(self):
+        with self._lock:
+            self._categories.clear()
+
+    def expire(self, **kwargs):
+        # Check the shared version again before the categories are next used
+        self._local.checked = False
+
+    def refresh(self, version=None):
+        """Drop the cached categories if the definitions changed since they were loaded"""
+        if version is None:
+            version = definitions_version()
+        with self._lock:
+            if version != self._version:
+                self._categories.clear()
+                self._version = version
+        self._local.checked = True
+
+    def preload(self, category_ids, version=None):
+        """Load any of the categories not already cached in two queries"""
+        from .models import Category, Option
+
+        if version is not None or not getattr(self._local, 'checked', False):
+            self.refresh(version)
+
+        with self._lock:
+            missing = set(category_ids) - set(self._categories) - {None}
+
+        if not missing:
+            return
+
+        categories = {
+            category.id: (category, OrderedDict())
+            for category in Category.objects.filter(id__in=missing)
+        }
+        # Orderable keeps the options in the order the editors gave them
+        for category_id, option_id, value in Option.objects.filter(
+            category_id__in=categories,
+        ).values_list('category_id', 'id', 'value'):
+            categories[category_id][1][option_id] = value
+
+        with self._lock:
+            self._categories.update(categories)
+
+    def get(self, category_id):
+        self.preload([category_id])
+        return self._categories.get(category_id, (None, OrderedDict()))
+
+    def category(self, category_id):
+        return self.get(category_id)[0]
+
+    def options(self, category_id):
+        return self.get(category_id)[1]
+
+
+category_options = CategoryOptionsCache()
+request_started.connect(category_options.expire, dispatch_uid='category_options_expire')
+
+
+def category_ids(form_fields):
+    """The ids of the categories asked about by a form, without loading its blocks"""
+    if not getattr(form_fields, 'is_lazy', False):
+        return {
+            field.block.get_category_id(field.value)
+            for field in form_fields
+            if field.block_type == 'category'
+        }
+    return {
+        field_data['value'].get('category')
+        for field_data in form_fields.stream_data
+        if field_data['type'] == 'category'
+    }
+
+
+def preload_category_options(instances):
+    """Resolve the category options for a batch of form data in one go"""
+    ids = set()
+    for instance in instances:
+        ids |= category_ids(instance.form_fields)
+    category_options.preload(ids, version=definitions_version())
@@ -1,6 +1,8 @@
 from django import forms
 from django.core.exceptions import PermissionDenied
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.template.loader import render_to_string
 from django.utils.translation import gettext_lazy as _
 from modelcluster.fields import ParentalKey
@@ -12,6 +14,10 @@ from wagtail.core.fields import RichTextField
 from wagtail.core.models import Orderable
 from wagtail.search import index
 
+from hypha.apply.stream_forms.cache import invalidate_form_classes
+
+from .cache import category_options
+
 
 class Option(Orderable):
     value = models.CharField(max_length=255)
@@ -40,6 +46,16 @@ class Category(ClusterableModel):
         verbose_name_plural = 'Categories'
 
 
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Option)
+@receiver(post_delete, sender=Option)
+def invalidate_category_form_classes(sender, **kwargs):
+    # The category questions take their label and options from here
+    invalidate_form_classes()
+    category_options.clear()
+
+
 class MetaTerm(index.Indexed, MP_Node):
     """ Hierarchal "Meta" terms """
     name = models.CharField(
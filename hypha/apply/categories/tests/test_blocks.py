@@ -1,7 +1,11 @@
+from unittest import mock
+
 from django import forms
 from django.test import TestCase
 
 from hypha.apply.categories.blocks import CategoryQuestionBlock
+from hypha.apply.categories.cache import category_options
+from hypha.apply.stream_forms.cache import definitions_version
 
 from .factories import CategoryFactory, OptionFactory
 
@@ -56,3 +60,36 @@ class TestCategoryQuestionBlock(TestCase):
     def test_can_render_if_no_response(self):
         display = self.block.render({'category': self.category}, {'data': None})
         self.assertIn(self.block.no_response()[0], display)
+
+    def test_prepare_data_keeps_option_order(self):
+        options = [OptionFactory(category=self.category, sort_order=order) for order in range(3)]
+        value = self.block.to_python({'category': self.category.id})
+        data = self.block.prepare_data(value, [str(options[2].id), str(options[0].id)], False)
+        self.assertEqual(data, [options[0].value, options[2].value])
+
+    def test_prepare_data_single_select(self):
+        option = OptionFactory(category=self.category)
+        value = self.block.to_python({'category': self.category.id})
+        self.assertEqual(self.block.prepare_data(value, str(option.id), False), [option.value])
+
+    def test_prepare_data_uses_cached_options(self):
+        option = OptionFactory(category=self.category)
+        value = self.block.to_python({'category': self.category.id})
+        self.block.prepare_data(value, [option.id], False)
+        with self.assertNumQueries(0):
+            self.block.prepare_data(value, [option.id], False)
+
+    def test_prepare_data_skips_values_which_arent_ids(self):
+        option = OptionFactory(category=self.category)
+        value = self.block.to_python({'category': self.category.id})
+        self.assertEqual(self.block.prepare_data(value, ['legacy', str(option.id)], False), [option.value])
+
+    def test_preload_reads_version_once(self):
+        option = OptionFactory(category=self.category)
+        value = self.block.to_python({'category': self.category.id})
+        category_options.preload([self.category.id], version=definitions_version())
+        with mock.patch('hypha.apply.categories.cache.definitions_version') as version:
+            self.block.prepare_data(value, [option.id], False)
+            self.block.get_field_kwargs(value)
+            self.block.get_widget(value)
+        version.assert_not_called()
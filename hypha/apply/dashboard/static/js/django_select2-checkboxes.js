@@ -14,13 +14,15 @@
               closeOnSelect: false,
               templateSelection: function(data) {
                 let filterType = $element.data('placeholder');
+                // Only the selected options are rendered when they are searched for
+                let total = $element.data('choices-count') || data.all.length;
 
                 if (!data.selected.length) {
                   return filterType
-                } else if (data.selected.length == data.all.length) {
+                } else if (data.selected.length == total) {
                   return 'All ' + filterType + ' selected';
                 }
-                return data.selected.length + ' of ' + data.all.length + ' ' + filterType + ' selected';
+                return data.selected.length + ' of ' + total + ' ' + filterType + ' selected';
               },
               selectionAdapter: SelectionAdapter,
               returnesultsAdapter: ResultsAdapter
@@ -3,6 +3,8 @@ from django.conf import settings
 from django.contrib.postgres.fields import JSONField
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from wagtail.admin.edit_handlers import (
@@ -16,6 +18,7 @@ from wagtail.contrib.settings.models import BaseSetting, register_setting
 from wagtail.core.fields import RichTextField, StreamField
 
 from hypha.apply.funds.models.mixins import AccessFormData
+from hypha.apply.stream_forms.cache import invalidate_form_classes
 
 from .blocks import (
     DeterminationBlock,
@@ -84,6 +87,12 @@ class DeterminationForm(DeterminationFormFieldsMixin, models.Model):
         return self.name
 
 
+@receiver(post_save, sender=DeterminationForm)
+@receiver(post_delete, sender=DeterminationForm)
+def invalidate_determination_form_classes(sender, **kwargs):
+    invalidate_form_classes()
+
+
 class Determination(DeterminationFormFieldsMixin, AccessFormData, models.Model):
     submission = models.ForeignKey(
         'funds.ApplicationSubmission',
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from urllib import parse
 
 from django.conf import settings
@@ -205,6 +206,7 @@ class BatchDeterminationCreateView(BaseStreamForm, CreateView):
             related=determinations,
         )
 
+        to_transition = defaultdict(list)
         for submission in submissions:
             try:
                 determination = determinations[submission.id]
@@ -230,7 +232,21 @@ class BatchDeterminationCreateView(BaseStreamForm, CreateView):
                         related_object=determination,
                     )
 
-                submission.perform_transition(transition, self.request.user, request=self.request, notify=False)
+                to_transition[transition].append(submission.id)
+
+        # The outcome maps to a different transition in each workflow
+        for transition, submission_ids in to_transition.items():
+            _, failed = submissions.filter(id__in=submission_ids).bulk_transition(
+                [transition],
+                self.request.user,
+                request=self.request,
+                notify=False,
+            )
+            for submission in failed:
+                messages.warning(
+                    self.request,
+                    'Unable to progress submission "{title}"'.format(title=submission.title),
+                )
         return response
 
     @classmethod
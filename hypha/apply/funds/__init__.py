@@ -0,0 +1 @@
+default_app_config = 'hypha.apply.funds.apps.FundsConfig'
@@ -1,5 +1,8 @@
 from django.apps import AppConfig
 
 
-class ApplyConfig(AppConfig):
-    name = 'apply'
+class FundsConfig(AppConfig):
+    name = 'hypha.apply.funds'
+
+    def ready(self):
+        from . import choices  # NOQA
@@ -0,0 +1,193 @@
+"""
+Options offered by the filters of the submission tables, dashboards and results.
+
+Working out which rounds, funds, leads, reviewers, screening statuses and meta
+terms are in use joins the whole submissions table, so the ids are kept in the
+shared cache and dropped by the receivers below when what they depend on
+changes. Lists longer than ChoiceProvider.lazy_threshold are searched through
+FilterChoicesView instead of being rendered in full.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from wagtail.core.models import Page
+
+from hypha.apply.categories.models import MetaTerm
+from hypha.apply.users.groups import STAFF_GROUP_NAME
+
+from .models import ApplicationSubmission, AssignedReviewers, Round, ScreeningStatus
+
+User = get_user_model()
+
+
+class ChoiceProvider:
+    cache_timeout = 60 * 60
+    lazy_threshold = 100
+    page_size = 30
+
+    def __init__(self, name, used, search_fields, ordering):
+        self.name = name
+        self.used = used
+        self.search_fields = search_fields
+        # Ends with the pk so the pages of the search are stable
+        self.ordering = ordering
+
+    def __call__(self, request=None):
+        # Called by django-filter to get the queryset of the filter
+        return self.queryset()
+
+    @property
+    def cache_key(self):
+        return f'funds:filter_choices:{self.name}'
+
+    def ids(self):
+        ids = cache.get(self.cache_key)
+        if ids is None:
+            ids = list(self.used().order_by().values_list('id', flat=True))
+            cache.set(self.cache_key, ids, self.cache_timeout)
+        return ids
+
+    def queryset(self):
+        return self.used().model._default_manager.filter(id__in=self.ids())
+
+    def is_lazy(self):
+        return len(self.ids()) > self.lazy_threshold
+
+    def search(self, term, page=1):
+        """One page of the options matching the term, and if there are more"""
+        queryset = self.queryset()
+        if term:
+            query = Q()
+            for field in self.search_fields:
+                query |= Q(**{f'{field}__icontains': term})
+            queryset = queryset.filter(query)
+        queryset = queryset.order_by(*self.ordering)
+
+        start = (page - 1) * self.page_size
+        options = list(queryset[start:start + self.page_size + 1])
+        return options[:self.page_size], len(options) > self.page_size
+
+    def invalidate(self):
+        cache.delete(self.cache_key)
+
+
+class UserChoiceProvider(ChoiceProvider):
+    def queryset(self):
+        # The options are labelled with the users' roles
+        return super().queryset().with_roles()
+
+
+round_choices = ChoiceProvider(
+    'rounds',
+    lambda: Round.objects.filter(submissions__isnull=False).distinct(),
+    search_fields=['title'],
+    ordering=['title', 'pk'],
+)
+
+# Use page to pick up on both Labs and Funds
+fund_choices = ChoiceProvider(
+    'funds',
+    lambda: Page.objects.filter(applicationsubmission__isnull=False).distinct(),
+    search_fields=['title'],
+    ordering=['title', 'pk'],
+)
+
+lead_choices = UserChoiceProvider(
+    'leads',
+    lambda: User.objects.filter(submission_lead__isnull=False).distinct(),
+    search_fields=['full_name', 'email'],
+    ordering=['full_name', 'email', 'pk'],
+)
+
+# All assigned reviewers, staff or admin
+reviewer_choices = UserChoiceProvider(
+    'reviewers',
+    lambda: User.objects.filter(
+        Q(submissions_reviewer__isnull=False) | Q(groups__name=STAFF_GROUP_NAME) | Q(is_superuser=True)
+    ).distinct(),
+    search_fields=['full_name', 'email'],
+    ordering=['full_name', 'email', 'pk'],
+)
+
+screening_status_choices = ChoiceProvider(
+    'screening_statuses',
+    lambda: ScreeningStatus.objects.filter(
+        id__in=ApplicationSubmission.objects.all().values('screening_statuses__id').distinct('screening_statuses__id'),
+    ),
+    search_fields=['title'],
+    ordering=['title', 'pk'],
+)
+
+meta_term_choices = ChoiceProvider(
+    'meta_terms',
+    lambda: MetaTerm.objects.filter(
+        filter_on_dashboard=True,
+        id__in=ApplicationSubmission.objects.all().values('meta_terms__id').distinct('meta_terms__id'),
+    ),
+    search_fields=['name'],
+    ordering=['name', 'pk'],
+)
+
+PROVIDERS = {
+    provider.name: provider
+    for provider in [
+        round_choices,
+        fund_choices,
+        lead_choices,
+        reviewer_choices,
+        screening_status_choices,
+        meta_term_choices,
+    ]
+}
+
+
+def invalidate(*providers):
+    for provider in providers:
+        provider.invalidate()
+
+    # Again once committed, in case a request cached the lists from before the change
+    def invalidate_committed():
+        for provider in providers:
+            provider.invalidate()
+    transaction.on_commit(invalidate_committed)
+
+
+@receiver(post_save, sender=ApplicationSubmission)
+def invalidate_for_submission(sender, instance, created, **kwargs):
+    key = (instance.page_id, instance.round_id, instance.lead_id)
+    if created or getattr(instance, '_loaded_choice_key', None) != key:
+        invalidate(round_choices, fund_choices, lead_choices)
+        instance._loaded_choice_key = key
+
+
+@receiver(post_delete, sender=ApplicationSubmission)
+def invalidate_for_deleted_submission(sender, instance, **kwargs):
+    invalidate(*PROVIDERS.values())
+
+
+@receiver(post_save, sender=AssignedReviewers)
+@receiver(post_delete, sender=AssignedReviewers)
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_for_reviewer(sender, **kwargs):
+    invalidate(reviewer_choices)
+
+
+@receiver(post_save, sender=User)
+def invalidate_for_user(sender, instance, update_fields=None, **kwargs):
+    # Logging in only updates last_login
+    if update_fields is None or 'is_superuser' in update_fields:
+        invalidate(reviewer_choices)
+
+
+@receiver(m2m_changed, sender=ApplicationSubmission.screening_statuses.through)
+def invalidate_for_screening_status(sender, **kwargs):
+    invalidate(screening_status_choices)
+
+
+@receiver(m2m_changed, sender=ApplicationSubmission.meta_terms.through)
+@receiver(post_save, sender=MetaTerm)
+def invalidate_for_meta_term(sender, **kwargs):
+    invalidate(meta_term_choices)
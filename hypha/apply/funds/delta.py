@@ -0,0 +1,40 @@
+"""
+JSON patches (RFC 6902) between the form data of two revisions.
+
+Form data is a flat mapping of field id to answer, so the patches only ever
+add, replace or remove whole answers at the top level.
+"""
+
+
+def escape(key):
+    return key.replace('~', '~0').replace('/', '~1')
+
+
+def unescape(path):
+    return path[1:].replace('~1', '/').replace('~0', '~')
+
+
+def make_patch(old, new):
+    patch = [
+        {'op': 'remove', 'path': '/' + escape(key)}
+        for key in old if key not in new
+    ]
+    for key, value in new.items():
+        if key not in old:
+            patch.append({'op': 'add', 'path': '/' + escape(key), 'value': value})
+        elif old[key] != value:
+            patch.append({'op': 'replace', 'path': '/' + escape(key), 'value': value})
+    return patch
+
+
+def apply_patch(data, patch):
+    data = dict(data)
+    for operation in patch:
+        key = unescape(operation['path'])
+        if operation['op'] == 'remove':
+            del data[key]
+        elif operation['op'] in ('add', 'replace'):
+            data[key] = operation['value']
+        else:
+            raise ValueError(f'Unsupported patch operation: {operation["op"]}')
+    return data
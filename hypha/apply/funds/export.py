@@ -0,0 +1,143 @@
+import csv
+from collections import OrderedDict, defaultdict
+
+from django.db.models import Q
+
+from hypha.apply.categories.cache import preload_category_options
+from hypha.apply.stream_forms.cache import fingerprint
+
+# Answers exported from questions found by their label, the matching questions
+# are looked up once per form definition
+LABELLED_QUESTIONS = OrderedDict([
+    ('reapplied', lambda label: 'or received funding' in label),
+    ('region', lambda label: label == 'Region'),
+    ('country', lambda label: label == 'Country'),
+    ('focus', lambda label: label == 'Focus'),
+])
+
+
+def submission_type(submission, answers):
+    return submission.round or submission.page
+
+
+COLUMNS = OrderedDict([
+    ('id', ('Submission ID', lambda submission, answers: submission.id)),
+    ('title', ('Submission title', lambda submission, answers: submission.title)),
+    ('author', ('Submission author', lambda submission, answers: submission.full_name)),
+    ('email', ('Submission e-mail', lambda submission, answers: submission.email)),
+    ('value', ('Submission value', lambda submission, answers: submission.value)),
+    ('duration', ('Submission duration', lambda submission, answers: submission.duration)),
+    ('reapplied', ('Submission reapplied', lambda submission, answers: answers['reapplied'])),
+    ('stage', ('Submission stage', lambda submission, answers: submission.stage)),
+    ('phase', ('Submission phase', lambda submission, answers: submission.phase)),
+    ('screening', ('Submission screening', lambda submission, answers: submission.joined_screening_statuses)),
+    ('date', ('Submission date', lambda submission, answers: submission.submit_time.strftime('%Y-%m-%d'))),
+    ('region', ('Submission region', lambda submission, answers: answers['region'])),
+    ('country', ('Submission country', lambda submission, answers: answers['country'])),
+    ('focus', ('Submission focus', lambda submission, answers: answers['focus'])),
+    ('round', ('Round/Lab/Fellowship', submission_type)),
+])
+
+
+def changed_since(queryset, since):
+    return queryset.filter(
+        Q(submit_time__gte=since) |
+        Q(live_revision__timestamp__gte=since) |
+        Q(table_stats__last_update__gte=since)
+    )
+
+
+class SubmissionExporter:
+    """Builds the export rows for a queryset of submissions
+
+    The queryset is read in chunks of ``chunk_size`` submissions, each chunk with its
+    related objects prefetched, so memory use doesn't grow with the size of the export.
+    """
+    def __init__(self, columns=None, chunk_size=500):
+        self.columns = list(columns or COLUMNS)
+        unknown = set(self.columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f'Unknown columns: {", ".join(sorted(unknown))}')
+        self.chunk_size = chunk_size
+        self._labelled_fields = {}
+
+    @property
+    def headers(self):
+        return [COLUMNS[column][0] for column in self.columns]
+
+    def prefetch(self, queryset):
+        return queryset.select_related('round', 'page').prefetch_related('screening_statuses')
+
+    def chunked_ids(self, queryset):
+        chunk = []
+        for submission_id in queryset.order_by('id').values_list('id', flat=True).iterator(chunk_size=self.chunk_size):
+            chunk.append(submission_id)
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def rows_for_ids(self, model, ids):
+        submissions = list(self.prefetch(model.objects.filter(id__in=ids).order_by('id')))
+        preload_category_options(submissions)
+        return [self.row(submission) for submission in submissions]
+
+    def rows(self, queryset):
+        for ids in self.chunked_ids(queryset):
+            yield from self.rows_for_ids(queryset.model, ids)
+
+    def labelled_fields(self, submission):
+        # Submissions sharing a form definition share the labelled fields
+        key = fingerprint(submission.form_fields)
+        if key in self._labelled_fields:
+            return self._labelled_fields[key]
+
+        matches = defaultdict(list)
+        for field_id in submission.question_text_field_ids:
+            if field_id in submission.named_blocks:
+                continue
+            label = submission.serialize(field_id)['question']
+            for name, matcher in LABELLED_QUESTIONS.items():
+                if matcher(label):
+                    matches[name].append(field_id)
+
+        if key is not None:
+            self._labelled_fields[key] = matches
+        return matches
+
+    def labelled_answers(self, submission):
+        answers = dict.fromkeys(LABELLED_QUESTIONS, '')
+        if not set(self.columns) & set(LABELLED_QUESTIONS):
+            return answers
+
+        for name, field_ids in self.labelled_fields(submission).items():
+            for field_id in field_ids:
+                answer = submission.serialize(field_id)['answer']
+                if not isinstance(answer, str):
+                    answer = ','.join(answer)
+                if answer and not answer == 'N':
+                    answers[name] = answer
+        return answers
+
+    def row(self, submission):
+        answers = self.labelled_answers(submission)
+        return [COLUMNS[column][1](submission, answers) for column in self.columns]
+
+
+class Echo:
+    """File-like object handing each written line straight back to the caller"""
+    def write(self, value):
+        return value
+
+
+def stream_csv(exporter, queryset):
+    writer = csv.writer(Echo(), quoting=csv.QUOTE_ALL)
+    yield writer.writerow(exporter.headers)
+    for row in exporter.rows(queryset):
+        yield writer.writerow(row)
+
+
+def write_csv(exporter, queryset, csvfile):
+    for line in stream_csv(exporter, queryset):
+        csvfile.write(line)
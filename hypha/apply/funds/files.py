@@ -1,6 +1,7 @@
 import os
 
 from django.urls import reverse
+from django.utils.text import slugify
 
 from hypha.apply.stream_forms.files import StreamFieldFile
 
@@ -13,6 +14,24 @@ def generate_submission_file_path(submission_id, field_id, file_name):
     return os.path.join(path, file_name)
 
 
+def submission_attachments(submission, folder=''):
+    """The (archive name, storage, name) of each file uploaded to the submission"""
+    for field_id in submission.file_field_ids:
+        files = submission.data(field_id)
+        # Multiple file fields hold a list of files
+        if not isinstance(files, list):
+            files = [files]
+        for file in files:
+            if file:
+                yield os.path.join(folder, file.filename), file.storage, file.name
+
+
+def submissions_attachments(submissions):
+    """The files of each submission, in a folder per submission"""
+    for submission in submissions.iterator():
+        yield from submission_attachments(submission, folder=f'{submission.id}-{slugify(submission.title)}')
+
+
 class SubmissionStreamFieldFile(StreamFieldFile):
     def generate_filename(self):
         from hypha.apply.funds.models.submissions import ApplicationRevision
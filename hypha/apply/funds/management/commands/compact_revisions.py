@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from hypha.apply.funds.models import ApplicationRevision, ApplicationSubmission
+
+
+class Command(BaseCommand):
+    help = "Store the existing submission revisions as deltas against the revision before."
+
+    def handle(self, *args, **options):
+        submission_ids = list(ApplicationSubmission.objects.order_by('id').values_list('id', flat=True))
+        count = 0
+        for submission_id in submission_ids:
+            with transaction.atomic():
+                # Holds off new revisions of the submission while its history is rewritten
+                live_revision_id, draft_revision_id = ApplicationSubmission.objects.select_for_update().values_list(
+                    'live_revision_id', 'draft_revision_id',
+                ).get(id=submission_id)
+                count += ApplicationRevision.objects.filter(submission_id=submission_id).rebuild_deltas(
+                    keep=[live_revision_id, draft_revision_id],
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Compacted {count} revisions from {len(submission_ids)} submissions')
+        )
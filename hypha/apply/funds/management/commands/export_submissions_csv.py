@@ -1,47 +1,67 @@
 import csv
+import multiprocessing
+import sys
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.dateparse import parse_date, parse_datetime
 
+from hypha.apply.funds.export import COLUMNS, SubmissionExporter, changed_since
 from hypha.apply.funds.models import ApplicationSubmission
 
 
+def export_chunk(args):
+    # Runs in the worker processes, each with its own database connection
+    columns, chunk_size, ids = args
+    exporter = SubmissionExporter(columns=columns, chunk_size=chunk_size)
+    return exporter.rows_for_ids(ApplicationSubmission, ids)
+
+
 class Command(BaseCommand):
     help = "Export submission stats to a csv file."
 
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='export_submissions.csv', help='File to write to, use - for stdout.')
+        parser.add_argument('--columns', help=f'Comma separated columns to export, from: {", ".join(COLUMNS)}.')
+        parser.add_argument('--since', help='Only export submissions submitted, edited or updated since this date(time).')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Number of submissions loaded at a time.')
+        parser.add_argument('--processes', type=int, default=1, help='Number of worker processes.')
+
     def handle(self, *args, **options):
-        with open('export_submissions.csv', 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile, quoting=csv.QUOTE_ALL)
-            writer.writerow(['Submission ID', 'Submission title', 'Submission author', 'Submission e-mail', 'Submission value', 'Submission duration', 'Submission reapplied', 'Submission stage', 'Submission phase', 'Submission screening', 'Submission date', 'Submission region', 'Submission country', 'Submission focus', 'Round/Lab/Fellowship'])
-            for submission in ApplicationSubmission.objects.all():
-                submission_region = ''
-                submission_country = ''
-                submission_focus = ''
-                submission_reapplied = ''
-                for field_id in submission.question_text_field_ids:
-                    if field_id not in submission.named_blocks:
-                        question_field = submission.serialize(field_id)
-                        name = question_field['question']
-                        if isinstance(question_field['answer'], str):
-                            answer = question_field['answer']
-                        else:
-                            answer = ','.join(question_field['answer'])
-                        if answer and not answer == 'N':
-                            if name == 'Region':
-                                submission_region = answer
-                            elif name == 'Country':
-                                submission_country = answer
-                            elif name == 'Focus':
-                                submission_focus = answer
-                            elif 'or received funding' in name:
-                                submission_reapplied = answer
-
-                if submission.round:
-                    submission_type = submission.round
-                else:
-                    submission_type = submission.page
-
-                try:
-                    submission_value = submission.value
-                except KeyError:
-                    submission_value = 0
-                writer.writerow([submission.id, submission.title, submission.full_name, submission.email, submission_value, submission.duration, submission_reapplied, submission.stage, submission.phase, submission.joined_screening_statuses, submission.submit_time.strftime('%Y-%m-%d'), submission_region, submission_country, submission_focus, submission_type])
+        columns = options['columns'].split(',') if options['columns'] else None
+        try:
+            exporter = SubmissionExporter(columns=columns, chunk_size=options['chunk_size'])
+        except ValueError as e:
+            raise CommandError(e)
+
+        submissions = ApplicationSubmission.objects.all()
+        if options['since']:
+            since = parse_datetime(options['since']) or parse_date(options['since'])
+            if not since:
+                raise CommandError(f'Could not parse --since "{options["since"]}"')
+            submissions = changed_since(submissions, since)
+
+        if options['output'] == '-':
+            self.write(sys.stdout, exporter, submissions, options['processes'])
+        else:
+            with open(options['output'], 'w', newline='') as csvfile:
+                self.write(csvfile, exporter, submissions, options['processes'])
+
+    def write(self, csvfile, exporter, submissions, processes):
+        writer = csv.writer(csvfile, quoting=csv.QUOTE_ALL)
+        writer.writerow(exporter.headers)
+
+        if processes <= 1:
+            writer.writerows(exporter.rows(submissions))
+            return
+
+        chunks = [
+            (exporter.columns, exporter.chunk_size, ids)
+            for ids in exporter.chunked_ids(submissions)
+        ]
+        # Forked workers must not share the parent's connection
+        connections.close_all()
+        with multiprocessing.Pool(processes) as pool:
+            # imap hands back the chunks in order as the workers finish them
+            for rows in pool.imap(export_chunk, chunks):
+                writer.writerows(rows)
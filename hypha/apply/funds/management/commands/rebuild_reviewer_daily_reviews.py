@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from hypha.apply.funds.models import ReviewerDailyReviews
+
+
+class Command(BaseCommand):
+    help = "Recalculate the number of reviews per reviewer per day shown on the reviewer leaderboard."
+
+    def handle(self, *args, **options):
+        days = ReviewerDailyReviews.objects.rebuild()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt review counts for {len(days)} reviewer days')
+        )
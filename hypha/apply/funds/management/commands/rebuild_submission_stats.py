@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from hypha.apply.funds.models import SubmissionStats
+
+
+class Command(BaseCommand):
+    help = "Recalculate the submission counts and values per round shown on the results and overview pages."
+
+    def handle(self, *args, **options):
+        stats = SubmissionStats.objects.rebuild()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {len(stats)} rows of submission stats')
+        )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from hypha.apply.funds.models import ApplicationSubmission, SubmissionTableStats
+
+
+class Command(BaseCommand):
+    help = "Recalculate the denormalised counts shown in the submission tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Number of submissions rebuilt per transaction.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        submission_ids = list(ApplicationSubmission.objects.order_by('id').values_list('id', flat=True))
+        for start in range(0, len(submission_ids), chunk_size):
+            chunk = submission_ids[start:start + chunk_size]
+            SubmissionTableStats.objects.rebuild(ApplicationSubmission.objects.filter(id__in=chunk))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt table stats for {len(submission_ids)} submissions')
+        )
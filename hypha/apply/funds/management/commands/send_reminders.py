@@ -1,41 +1,22 @@
 from django.conf import settings
-from django.contrib.messages.storage.fallback import FallbackStorage
 from django.core.management.base import BaseCommand
-from django.http import HttpRequest
-from django.urls import set_urlconf
-from django.utils import timezone
 
-from hypha.apply.activity.messaging import messenger
-from hypha.apply.funds.models import Reminder
-from hypha.apply.home.models import ApplyHomePage
+from hypha.apply.funds.tasks import ReminderDispatcher
 
 
 class Command(BaseCommand):
-    help = 'Send reminders'
+    help = 'Send reminders, the dispatch_reminders task does the same on a schedule'
 
-    def handle(self, *args, **options):
-        site = ApplyHomePage.objects.first().get_site()
-        set_urlconf('hypha.apply.urls')
-
-        # Mock a HTTPRequest in order to pass the site settings into the
-        # templates
-        request = HttpRequest()
-        request.META['SERVER_NAME'] = site.hostname
-        request.META['SERVER_PORT'] = site.port
-        request.META[settings.SECURE_PROXY_SSL_HEADER] = 'https'
-        request.session = {}
-        request._messages = FallbackStorage(request)
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.DISPATCH_BATCH_SIZE)
 
-        for reminder in Reminder.objects.filter(sent=False, time__lte=timezone.now()):
-            messenger(
-                reminder.action_message,
-                request=request,
-                user=None,
-                source=reminder.submission,
-                related=reminder,
-            )
-            self.stdout.write(
-                self.style.SUCCESS(f'Reminder sent: {reminder.id}')
-            )
-            reminder.sent = True
-            reminder.save()
+    def handle(self, *args, **options):
+        for sent, failed in ReminderDispatcher().dispatch_all(options['batch_size']):
+            for reminder in sent:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Reminder sent: {reminder.id}')
+                )
+            for reminder in failed:
+                self.stdout.write(
+                    self.style.ERROR(f'Reminder failed: {reminder.id}')
+                )
@@ -0,0 +1,47 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from hypha.apply.funds.files import submission_attachments, submissions_attachments
+from hypha.apply.funds.models import ApplicationSubmission
+from hypha.apply.projects.files import project_attachments
+from hypha.apply.projects.models import Project
+from hypha.apply.utils.archive import stream_zip
+
+
+class Command(BaseCommand):
+    help = "Write a zip of the files uploaded to a submission, a round or lab, or a project."
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--submission', type=int, help='Id of the submission.')
+        target.add_argument('--round', type=int, help='Id of the round or lab, for the files of all its submissions.')
+        target.add_argument('--project', type=int, help='Id of the project.')
+        parser.add_argument('--output', default='attachments.zip', help='File to write to, use - for stdout.')
+
+    def handle(self, *args, **options):
+        files = self.files(options)
+        if options['output'] == '-':
+            self.write(sys.stdout.buffer, files)
+        else:
+            with open(options['output'], 'wb') as output:
+                self.write(output, files)
+
+    def files(self, options):
+        try:
+            if options['submission']:
+                return submission_attachments(ApplicationSubmission.objects.get(id=options['submission']))
+            if options['project']:
+                return project_attachments(Project.objects.get(id=options['project']))
+        except (ApplicationSubmission.DoesNotExist, Project.DoesNotExist) as e:
+            raise CommandError(e)
+
+        submissions = ApplicationSubmission.objects.filter(
+            Q(round=options['round']) | Q(page=options['round']),
+        ).exclude_draft().current().order_by('id')
+        return submissions_attachments(submissions)
+
+    def write(self, output, files):
+        for chunk in stream_zip(files):
+            output.write(chunk)
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.16 on 2026-10-17 09:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+POPULATE_SEARCH_DOCUMENT = """
+UPDATE funds_applicationsubmission SET search_document =
+    setweight(to_tsvector('english', COALESCE(form_data->>'title', '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(form_data->>'full_name', '') || ' ' || COALESCE(form_data->>'email', '')), 'B') ||
+    setweight(to_tsvector('english', COALESCE(search_data, '')), 'D');
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('funds', '0083_remove_screening_status_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationsubmission',
+            name='search_document',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='applicationsubmission',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_document'], name='funds_submission_search_idx'),
+        ),
+        migrations.RunSQL(POPULATE_SEARCH_DOCUMENT, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 2.2.16 on 2026-10-17 10:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Same counts as ApplicationSubmissionQueryset.with_table_stats, recalculate them
+# with the rebuild_submission_table_stats command
+COUNT_EXISTING_STATS = """
+WITH submission_type AS (
+    SELECT id FROM django_content_type WHERE app_label = 'funds' AND model = 'applicationsubmission'
+), comments AS (
+    SELECT activity.* FROM activity_activity activity, submission_type
+    WHERE activity.source_content_type_id = submission_type.id
+    AND activity.type = 'comment' AND activity.current
+)
+INSERT INTO funds_submissiontablestats (
+    submission_id, comments_applicant, comments_team, comments_reviewers, comments_partners, comments_all,
+    opinion_disagree, review_staff_count, review_count, review_submitted_count, review_recommendation,
+    last_update, last_user_update
+)
+SELECT
+    submission.id,
+    (SELECT COUNT(*) FROM comments WHERE source_object_id = submission.id AND visibility = 'applicant'),
+    (SELECT COUNT(*) FROM comments WHERE source_object_id = submission.id AND visibility = 'team'),
+    (SELECT COUNT(*) FROM comments WHERE source_object_id = submission.id AND visibility = 'reviewers'),
+    (SELECT COUNT(*) FROM comments WHERE source_object_id = submission.id AND visibility = 'partners'),
+    (SELECT COUNT(*) FROM comments WHERE source_object_id = submission.id AND visibility = 'all'),
+    opinions.disagree,
+    reviewers.staff,
+    reviewers.assigned,
+    reviewers.reviewed,
+    CASE WHEN opinions.disagree > 0 THEN 1 ELSE (
+        SELECT SUM(review.recommendation) / COUNT(review.recommendation) FROM review_review review
+        WHERE review.submission_id = submission.id AND NOT review.is_draft
+        HAVING COUNT(*) > 0
+    ) END,
+    latest.timestamp,
+    latest.full_name
+FROM funds_applicationsubmission submission
+LEFT JOIN LATERAL (
+    SELECT NULLIF(COUNT(*), 0) AS disagree FROM review_reviewopinion opinion
+    JOIN review_review review ON review.id = opinion.review_id
+    WHERE review.submission_id = submission.id AND opinion.opinion = 0
+) opinions ON TRUE
+LEFT JOIN LATERAL (
+    SELECT
+        NULLIF(COUNT(*) FILTER (WHERE reviewer_type.name = 'Staff'), 0) AS staff,
+        NULLIF(COUNT(*), 0) AS assigned,
+        NULLIF(COUNT(*) FILTER (WHERE
+            EXISTS (SELECT 1 FROM review_reviewopinion opinion WHERE opinion.author_id = assigned.id AND opinion.opinion = 1)
+            OR EXISTS (SELECT 1 FROM review_review review WHERE review.author_id = assigned.id AND NOT review.is_draft)
+        ), 0) AS reviewed
+    FROM funds_assignedreviewers assigned
+    JOIN auth_group reviewer_type ON reviewer_type.id = assigned.type_id
+    WHERE assigned.submission_id = submission.id
+) reviewers ON TRUE
+LEFT JOIN LATERAL (
+    SELECT activity.timestamp, users.full_name FROM activity_activity activity, submission_type, users_user users
+    WHERE activity.source_content_type_id = submission_type.id AND activity.source_object_id = submission.id
+    AND users.id = activity.user_id
+    ORDER BY activity.timestamp DESC LIMIT 1
+) latest ON TRUE;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity', '0055_add_batch_delete_submission'),
+        ('review', '0023_add_score_without_text_block'),
+        ('users', '0014_usersettings'),
+        ('funds', '0084_applicationsubmission_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionTableStats',
+            fields=[
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='table_stats', serialize=False, to='funds.ApplicationSubmission')),
+                ('comments_applicant', models.PositiveIntegerField(default=0)),
+                ('comments_team', models.PositiveIntegerField(default=0)),
+                ('comments_reviewers', models.PositiveIntegerField(default=0)),
+                ('comments_partners', models.PositiveIntegerField(default=0)),
+                ('comments_all', models.PositiveIntegerField(default=0)),
+                ('opinion_disagree', models.PositiveIntegerField(null=True)),
+                ('review_staff_count', models.PositiveIntegerField(null=True)),
+                ('review_count', models.PositiveIntegerField(null=True)),
+                ('review_submitted_count', models.PositiveIntegerField(null=True)),
+                ('review_recommendation', models.IntegerField(null=True)),
+                ('last_update', models.DateTimeField(null=True)),
+                ('last_user_update', models.CharField(max_length=255, null=True)),
+            ],
+        ),
+        migrations.RunSQL(COUNT_EXISTING_STATS, migrations.RunSQL.noop),
+    ]
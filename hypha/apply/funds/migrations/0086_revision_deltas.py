@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-17 11:20
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+import hypha.apply.stream_forms.files
+
+
+# Existing revisions keep their full copy and are treated as snapshots until
+# the compact_revisions command is run
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('funds', '0085_submissiontablestats'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='applicationrevision',
+            old_name='form_data',
+            new_name='full_data',
+        ),
+        migrations.AlterField(
+            model_name='applicationrevision',
+            name='full_data',
+            field=django.contrib.postgres.fields.jsonb.JSONField(encoder=hypha.apply.stream_forms.files.StreamFieldDataEncoder, null=True),
+        ),
+        migrations.AddField(
+            model_name='applicationrevision',
+            name='delta',
+            field=django.contrib.postgres.fields.jsonb.JSONField(null=True),
+        ),
+        migrations.AddField(
+            model_name='applicationrevision',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
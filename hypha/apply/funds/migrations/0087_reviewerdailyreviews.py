@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-17 12:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def count_existing_reviews(apps, schema_editor):
+    Review = apps.get_model('review', 'Review')
+    ReviewerDailyReviews = apps.get_model('funds', 'ReviewerDailyReviews')
+    counts = Review.objects.annotate(
+        day=TruncDate('created_at'),
+    ).values('author__reviewer_id', 'day').annotate(count=Count('id')).order_by()
+    ReviewerDailyReviews.objects.bulk_create(
+        ReviewerDailyReviews(reviewer_id=values['author__reviewer_id'], day=values['day'], reviews=values['count'])
+        for values in counts
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('review', '0023_add_score_without_text_block'),
+        ('funds', '0086_revision_deltas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewerDailyReviews',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('reviews', models.PositiveIntegerField(default=0)),
+                ('reviewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_reviews', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('reviewer', 'day')},
+            },
+        ),
+        migrations.RunPython(count_existing_reviews, migrations.RunPython.noop),
+    ]
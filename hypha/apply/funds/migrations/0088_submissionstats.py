@@ -0,0 +1,69 @@
+# Generated by Django 2.2.16 on 2026-10-17 13:10
+
+import django.db.models.deletion
+from django.contrib.postgres.fields.jsonb import KeyTextTransform
+from django.db import migrations, models
+from django.db.models import (
+    BooleanField,
+    Case,
+    Count,
+    Exists,
+    FloatField,
+    OuterRef,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast
+
+ACCEPTED = 2
+REJECTED = 0
+
+
+def count_existing_submissions(apps, schema_editor):
+    ApplicationSubmission = apps.get_model('funds', 'ApplicationSubmission')
+    Determination = apps.get_model('determinations', 'Determination')
+    SubmissionStats = apps.get_model('funds', 'SubmissionStats')
+
+    determinations = Determination.objects.filter(
+        submission=OuterRef('pk'),
+        is_draft=False,
+        outcome__in=[ACCEPTED, REJECTED],
+    )
+    counts = ApplicationSubmission.objects.annotate(
+        value=Cast(KeyTextTransform('value', 'form_data'), output_field=FloatField()),
+        current=Case(When(next__isnull=True, then=Value(True)), default=Value(False), output_field=BooleanField()),
+        determined=Exists(determinations),
+    ).values('page_id', 'round_id', 'status', 'current', 'determined').annotate(
+        submissions=Count('pk'),
+        value_count=Count('value'),
+        value_sum=Sum('value'),
+    ).order_by()
+    SubmissionStats.objects.bulk_create(SubmissionStats(**values) for values in counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0045_assign_unlock_grouppagepermission'),
+        ('determinations', '0010_add_determination_stream_field_forms'),
+        ('funds', '0087_reviewerdailyreviews'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=50)),
+                ('current', models.BooleanField()),
+                ('determined', models.BooleanField()),
+                ('submissions', models.PositiveIntegerField(default=0)),
+                ('value_count', models.PositiveIntegerField(default=0)),
+                ('value_sum', models.FloatField(null=True)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtailcore.Page')),
+                ('round', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='wagtailcore.Page')),
+            ],
+        ),
+        migrations.RunPython(count_existing_submissions, migrations.RunPython.noop),
+    ]
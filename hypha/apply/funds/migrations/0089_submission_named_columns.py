@@ -0,0 +1,73 @@
+# Generated by Django 2.2.16 on 2026-10-17 14:02
+
+from django.db import migrations, models
+
+# Mirrors typed_answer, answers which aren't a number are left empty
+FILL_NAMED_COLUMNS = r"""
+UPDATE funds_applicationsubmission SET
+    named_title = LEFT(NULLIF(LOWER(BTRIM(form_data->>'title')), ''), 255),
+    named_full_name = LEFT(NULLIF(LOWER(BTRIM(form_data->>'full_name')), ''), 255),
+    named_email = LEFT(NULLIF(LOWER(BTRIM(form_data->>'email')), ''), 255),
+    named_value = CASE
+        WHEN form_data->>'value' ~ '^\s*[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)\s*$' THEN (form_data->>'value')::float
+    END,
+    named_duration = CASE
+        WHEN form_data->>'duration' ~ '^\s*\+?[0-9]{1,9}\s*$' THEN (form_data->>'duration')::integer
+    END;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('funds', '0088_submissionstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationsubmission',
+            name='named_duration',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='applicationsubmission',
+            name='named_email',
+            field=models.CharField(editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='applicationsubmission',
+            name='named_full_name',
+            field=models.CharField(editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='applicationsubmission',
+            name='named_title',
+            field=models.CharField(editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='applicationsubmission',
+            name='named_value',
+            field=models.FloatField(editable=False, null=True),
+        ),
+        migrations.RunSQL(FILL_NAMED_COLUMNS, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='applicationsubmission',
+            index=models.Index(fields=['named_title'], name='funds_submission_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationsubmission',
+            index=models.Index(fields=['named_full_name'], name='funds_submission_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationsubmission',
+            index=models.Index(fields=['named_email'], name='funds_submission_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationsubmission',
+            index=models.Index(fields=['named_value'], name='funds_submission_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationsubmission',
+            index=models.Index(fields=['named_duration'], name='funds_submission_duration_idx'),
+        ),
+    ]
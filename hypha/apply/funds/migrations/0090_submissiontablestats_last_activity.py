@@ -0,0 +1,35 @@
+# Generated by Django 2.2.16 on 2026-10-17 15:20
+
+from django.db import migrations, models
+
+FILL_LAST_ACTIVITY = """
+UPDATE funds_submissiontablestats stats
+SET last_activity = COALESCE(stats.last_update, submission.submit_time)
+FROM funds_applicationsubmission submission
+WHERE submission.id = stats.submission_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('funds', '0089_submission_named_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submissiontablestats',
+            name='last_activity',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunSQL(FILL_LAST_ACTIVITY, migrations.RunSQL.noop),
+        migrations.AlterField(
+            model_name='submissiontablestats',
+            name='last_activity',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='submissiontablestats',
+            index=models.Index(fields=['last_activity', 'submission'], name='funds_tablestats_activity_idx'),
+        ),
+    ]
@@ -6,8 +6,9 @@ from .reminders import Reminder
 from .reviewer_role import ReviewerRole, ReviewerSettings
 from .screening import ScreeningStatus
 from .submissions import ApplicationRevision, ApplicationSubmission, AssignedReviewers
+from .table_stats import ReviewerDailyReviews, SubmissionStats, SubmissionTableStats
 
-__all__ = ['ApplicationSubmission', 'AssignedReviewers', 'ApplicationRevision', 'ApplicationForm', 'ScreeningStatus', 'ReviewerRole', 'Reminder', 'ReviewerSettings']
+__all__ = ['ApplicationSubmission', 'AssignedReviewers', 'ApplicationRevision', 'ApplicationForm', 'ScreeningStatus', 'ReviewerRole', 'Reminder', 'ReviewerSettings', 'SubmissionTableStats', 'ReviewerDailyReviews', 'SubmissionStats']
 
 
 class FundType(ApplicationBase):
@@ -4,18 +4,7 @@ from django import forms
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import (
-    Case,
-    CharField,
-    Count,
-    F,
-    FloatField,
-    IntegerField,
-    OuterRef,
-    Q,
-    Subquery,
-    When,
-)
+from django.db.models import Case, CharField, F, FloatField, OuterRef, Q, Subquery, When
 from django.db.models.functions import Coalesce, Left, Length
 from django.http import Http404
 from django.shortcuts import render
@@ -37,6 +26,7 @@ from ..admin_forms import RoundBasePageAdminForm, WorkflowFormAdminForm
 from ..edit_handlers import ReadOnlyInlinePanel, ReadOnlyPanel
 from ..workflow import OPEN_CALL_PHASES
 from .submissions import ApplicationSubmission
+from .table_stats import SubmissionStats
 from .utils import (
     LIMIT_TO_REVIEWERS,
     LIMIT_TO_STAFF,
@@ -509,24 +499,11 @@ class RoundsAndLabsManager(PageManager):
         )
 
     def with_progress(self):
-        submissions = ApplicationSubmission.objects.filter(Q(round=OuterRef('pk')) | Q(page=OuterRef('pk'))).current()
-        closed_submissions = submissions.inactive()
+        stats = SubmissionStats.objects.current()
 
         return self.get_queryset(RoundsAndLabsProgressQueryset).annotate(
-            total_submissions=Coalesce(
-                Subquery(
-                    submissions.values('round').annotate(count=Count('pk')).values('count'),
-                    output_field=IntegerField(),
-                ),
-                0,
-            ),
-            closed_submissions=Coalesce(
-                Subquery(
-                    closed_submissions.values('round').annotate(count=Count('pk')).values('count'),
-                    output_field=IntegerField(),
-                ),
-                0,
-            ),
+            total_submissions=stats.total_for(OuterRef('pk')),
+            closed_submissions=stats.inactive().total_for(OuterRef('pk')),
         ).annotate(
             progress=Case(
                 When(total_submissions=0, then=None),
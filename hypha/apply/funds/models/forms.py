@@ -1,9 +1,13 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from modelcluster.fields import ParentalKey
 from wagtail.admin.edit_handlers import FieldPanel, StreamFieldPanel
 from wagtail.core.fields import StreamField
 from wagtail.core.models import Orderable
 
+from hypha.apply.stream_forms.cache import invalidate_form_classes
+
 from ..blocks import ApplicationCustomFormFieldsBlock
 from ..edit_handlers import FilteredFieldPanel
 
@@ -21,6 +25,12 @@ class ApplicationForm(models.Model):
         return self.name
 
 
+@receiver(post_save, sender=ApplicationForm)
+@receiver(post_delete, sender=ApplicationForm)
+def invalidate_application_form_classes(sender, **kwargs):
+    invalidate_form_classes()
+
+
 class AbstractRelatedForm(Orderable):
     FIRST_STAGE = 1
     SECOND_STAGE = 2
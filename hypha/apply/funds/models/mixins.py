@@ -1,7 +1,9 @@
+from django.core.cache import cache
 from django.core.files import File
 from django.utils.safestring import mark_safe
 from django_file_form.models import PlaceholderUploadedFile
 
+from hypha.apply.categories.cache import preload_category_options
 from hypha.apply.stream_forms.blocks import (
     FileFieldBlock,
     FormFieldBlock,
@@ -23,6 +25,61 @@ class UnusedFieldException(Exception):
     pass
 
 
+class FieldIndex:
+    """Lookup tables for the fields of a form, built in a single pass over form_fields
+
+    Treat the mappings as read only, they are shared by every lookup on the instance.
+    """
+    def __init__(self, form_fields):
+        self.form_fields = form_fields
+        self.raw_fields = {}
+        self.named_blocks = {}
+        for field in form_fields:
+            self.raw_fields[field.id] = field
+            if isinstance(field.block, SingleIncludeMixin):
+                self.named_blocks[field.block.name] = field.id
+
+        self.is_complete = None not in self.raw_fields
+        self.named_fields = {
+            field_id: field_name
+            for field_name, field_id in self.named_blocks.items()
+        }
+
+        # Named fields are moved to the end, referenced by their name
+        self.fields = self.raw_fields.copy()
+        for field_name, field_id in self.named_blocks.items():
+            self.fields[field_name] = self.fields.pop(field_id)
+
+        self.question_field_ids = []
+        self.file_field_ids = []
+        self.question_text_field_ids = []
+        self.first_group_question_text_field_ids = []
+        in_first_group = True
+        for field_id, field in self.fields.items():
+            block = field.block
+            if isinstance(block, GroupToggleBlock):
+                in_first_group = False
+            if isinstance(block, FormFieldBlock):
+                self.question_field_ids.append(field_id)
+            if isinstance(block, (FileFieldBlock, ImageFieldBlock, MultiFileFieldBlock)):
+                self.file_field_ids.append(field_id)
+            elif isinstance(block, FormFieldBlock):
+                self.question_text_field_ids.append(field_id)
+                if in_first_group:
+                    self.first_group_question_text_field_ids.append(field_id)
+
+        self.normal_blocks = [
+            field_id
+            for field_id in self.question_field_ids
+            if field_id not in self.named_blocks
+        ]
+        self.first_group_normal_text_blocks = [
+            field_id
+            for field_id in self.first_group_question_text_field_ids
+            if field_id not in self.named_blocks
+        ]
+
+
 class AccessFormData:
     """Mixin for interacting with form data from streamfields
 
@@ -33,6 +90,21 @@ class AccessFormData:
     stream_file_class = SubmissionStreamFieldFile
     storage_class = PrivateStorage
 
+    # Rendered answers are kept for a week unless a new revision replaces them first
+    answers_cache_timeout = 60 * 60 * 24 * 7
+
+    @property
+    def field_index(self):
+        # The index only depends on the form fields so it is kept until they are reassigned
+        form_fields = self.form_fields
+        index = self.__dict__.get('_field_index')
+        if index is None or index.form_fields is not form_fields:
+            index = FieldIndex(form_fields)
+            if index.is_complete:
+                # Unsaved blocks have no id yet, don't hold onto an index built from them
+                self._field_index = index
+        return index
+
     @property
     def raw_data(self):
         # Returns the data mapped by field id instead of the data stored using the must include
@@ -134,75 +206,47 @@ class AccessFormData:
     def data(self, id):
         definitive_id = self.get_definitive_id(id)
         try:
-            return self.raw_data[definitive_id]
+            return self.form_data[definitive_id]
         except KeyError:
-            # We have most likely progressed application forms so the data isnt in form_data
-            return None
+            pass
+        # Named blocks are stored using their name rather than the field id
+        field_name = self.field_index.named_fields.get(definitive_id)
+        # We have most likely progressed application forms so the data isnt in form_data
+        return self.form_data.get(field_name) if field_name else None
 
     @property
     def question_field_ids(self):
-        for field_id, field in self.fields.items():
-            if isinstance(field.block, FormFieldBlock):
-                yield field_id
+        yield from self.field_index.question_field_ids
 
     @property
     def file_field_ids(self):
-        for field_id, field in self.fields.items():
-            if isinstance(field.block, (FileFieldBlock, ImageFieldBlock, MultiFileFieldBlock)):
-                yield field_id
+        yield from self.field_index.file_field_ids
 
     @property
     def question_text_field_ids(self):
-        file_fields = list(self.file_field_ids)
-        for field_id, field in self.fields.items():
-            if field_id in file_fields:
-                pass
-            elif isinstance(field.block, FormFieldBlock):
-                yield field_id
+        yield from self.field_index.question_text_field_ids
 
     @property
     def first_group_question_text_field_ids(self):
-        file_fields = list(self.file_field_ids)
-        for field_id, field in self.fields.items():
-            if field_id in file_fields:
-                continue
-            elif isinstance(field.block, GroupToggleBlock):
-                break
-            elif isinstance(field.block, FormFieldBlock):
-                yield field_id
+        yield from self.field_index.first_group_question_text_field_ids
 
     @property
     def raw_fields(self):
         # Field ids to field class mapping - similar to raw_data
-        return {
-            field.id: field
-            for field in self.form_fields
-        }
+        return self.field_index.raw_fields
 
     @property
     def fields(self):
         # ALl fields on the application
-        fields = self.raw_fields.copy()
-        for field_name, field_id in self.named_blocks.items():
-            response = fields.pop(field_id)
-            fields[field_name] = response
-        return fields
+        return self.field_index.fields
 
     @property
     def named_blocks(self):
-        return {
-            field.block.name: field.id
-            for field in self.form_fields
-            if isinstance(field.block, SingleIncludeMixin)
-        }
+        return self.field_index.named_blocks
 
     @property
     def normal_blocks(self):
-        return [
-            field_id
-            for field_id in self.question_field_ids
-            if field_id not in self.named_blocks
-        ]
+        return list(self.field_index.normal_blocks)
 
     @property
     def group_toggle_blocks(self):
@@ -212,11 +256,7 @@ class AccessFormData:
 
     @property
     def first_group_normal_text_blocks(self):
-        return [
-            field_id
-            for field_id in self.first_group_question_text_field_ids
-            if field_id not in self.named_blocks
-        ]
+        return list(self.field_index.first_group_normal_text_blocks)
 
     def get_serialize_multi_inputs_answer(self, field):
         number_of_inputs = field.value.get('number_of_inputs')
@@ -272,12 +312,14 @@ class AccessFormData:
 
     def render_answers(self):
         # Returns a list of the rendered answers
+        preload_category_options([self])
         return [
             self.render_answer(field_id, include_question=True)
             for field_id in self.normal_blocks
         ]
 
     def render_first_group_text_answers(self):
+        preload_category_options([self])
         return [
             self.render_answer(field_id, include_question=True)
             for field_id in self.first_group_normal_text_blocks
@@ -285,21 +327,43 @@ class AccessFormData:
 
     def render_text_blocks_answers(self):
         # Returns a list of the rendered answers of type text
+        preload_category_options([self])
         return [
             self.render_answer(field_id, include_question=True)
             for field_id in self.question_text_field_ids
             if field_id not in self.named_blocks
         ]
 
+    def answers_cache_key(self, variant):
+        """The cache key for the answers rendered by variant, None if they can't be cached"""
+        return None
+
+    def cached_answers(self, variant, render):
+        key = self.answers_cache_key(variant)
+        if key is None:
+            return render()
+
+        answers = cache.get(key)
+        if answers is None:
+            answers = render()
+            cache.set(key, answers, self.answers_cache_timeout)
+        return answers
+
     def output_answers(self):
         # Returns a safe string of the rendered answers
-        return mark_safe(''.join(self.render_answers()))
+        return mark_safe(self.cached_answers(
+            'answers', lambda: ''.join(self.render_answers()),
+        ))
 
     def output_text_answers(self):
-        return mark_safe(''.join(self.render_text_blocks_answers()))
+        return mark_safe(self.cached_answers(
+            'text_answers', lambda: ''.join(self.render_text_blocks_answers()),
+        ))
 
     def output_first_group_text_answers(self):
-        return mark_safe(''.join(self.render_first_group_text_answers()))
+        return mark_safe(self.cached_answers(
+            'first_group_text_answers', lambda: ''.join(self.render_first_group_text_answers()),
+        ))
 
     def get_answer_from_label(self, label):
         for field_id in self.question_text_field_ids:
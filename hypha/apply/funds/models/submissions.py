@@ -1,4 +1,7 @@
 import json
+import math
+import re
+from collections import defaultdict
 from functools import partialmethod
 
 from django.apps import apps
@@ -8,26 +11,34 @@ from django.contrib.auth.models import Group
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.postgres.fields import JSONField
 from django.contrib.postgres.fields.jsonb import KeyTextTransform
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+)
 from django.core.exceptions import PermissionDenied
-from django.db import models
+from django.db import models, transaction
 from django.db.models import (
     Avg,
     Case,
     Count,
     F,
-    FloatField,
     IntegerField,
     OuterRef,
     Prefetch,
     Q,
     Subquery,
     Sum,
+    TextField,
+    Value,
     When,
 )
 from django.db.models.expressions import OrderBy, RawSQL
-from django.db.models.functions import Cast, Coalesce
+from django.db.models.functions import Coalesce, Concat
 from django.dispatch import receiver
-from django.urls import reverse
+from django.urls import get_urlconf, reverse
 from django.utils.text import slugify
 from django_fsm import RETURN_VALUE, FSMField, can_proceed, transition
 from django_fsm.signals import post_transition
@@ -35,23 +46,28 @@ from wagtail.contrib.forms.models import AbstractFormSubmission
 from wagtail.core.fields import StreamField
 
 from hypha.apply.activity.messaging import MESSAGES, messenger
+from hypha.apply.activity.models import VISIBILITY
 from hypha.apply.categories.models import MetaTerm
 from hypha.apply.determinations.models import Determination
 from hypha.apply.flags.models import Flag
 from hypha.apply.review.models import ReviewOpinion
 from hypha.apply.review.options import AGREE, DISAGREE, MAYBE
+from hypha.apply.stream_forms.cache import definitions_version, fingerprint
 from hypha.apply.stream_forms.files import StreamFieldDataEncoder
 from hypha.apply.stream_forms.models import BaseStreamForm
 
 from ..blocks import NAMED_BLOCKS, ApplicationCustomFormFieldsBlock
+from ..delta import apply_patch, make_patch
 from ..workflow import (
     COMMUNITY_REVIEW_PHASES,
     DETERMINATION_RESPONSE_PHASES,
     DRAFT_STATE,
     INITIAL_STATE,
-    PHASES,
+    PHASES_BY_NAME,
     PHASES_MAPPING,
+    PHASES_MAPPING_STATUSES,
     STAGE_CHANGE_ACTIONS,
+    STAGE_CHANGE_TRIGGERS,
     WORKFLOWS,
     UserPermissions,
     active_statuses,
@@ -72,9 +88,75 @@ from .utils import (
     WorkflowHelpers,
 )
 
+SEARCH_CONFIG = 'english'
+
+# Characters with a meaning in the tsquery syntax, stripped from the search terms
+SEARCH_QUERY_SPECIAL_CHARS = re.compile(r"[&|!():*<>'\"\\]")
+
+
+def build_search_query(text):
+    # Match every term as a prefix so results show up while the user is typing
+    terms = SEARCH_QUERY_SPECIAL_CHARS.sub(' ', text).split()
+    if not terms:
+        return None
+    return SearchQuery(
+        ' & '.join(f'{term}:*' for term in terms),
+        search_type='raw',
+        config=SEARCH_CONFIG,
+    )
+
+
+# Typed copies of the answers to these named blocks are kept on the submission
+# so they can be indexed. The text is lowercased, it is only sorted and filtered on
+NAMED_COLUMNS = {
+    'title': 'named_title',
+    'full_name': 'named_full_name',
+    'email': 'named_email',
+    'value': 'named_value',
+    'duration': 'named_duration',
+}
+
+
+def typed_answer(name, answer):
+    if name == 'value':
+        try:
+            value = float(answer)
+        except (TypeError, ValueError):
+            return None
+        return value if math.isfinite(value) else None
+    if name == 'duration':
+        try:
+            duration = int(answer)
+        except (TypeError, ValueError):
+            return None
+        return duration if duration >= 0 else None
+    if answer is None:
+        return None
+    return str(answer).strip().lower()[:255] or None
+
+
+def build_search_vector():
+    # Rank matches on the title above the applicant details and both above the answers
+    return (
+        SearchVector(KeyTextTransform('title', 'form_data'), weight='A', config=SEARCH_CONFIG) +
+        SearchVector(
+            Concat(
+                Coalesce(KeyTextTransform('full_name', 'form_data'), Value('')),
+                Value(' '),
+                Coalesce(KeyTextTransform('email', 'form_data'), Value('')),
+                output_field=TextField(),
+            ),
+            weight='B',
+            config=SEARCH_CONFIG,
+        ) +
+        SearchVector('search_data', weight='D', config=SEARCH_CONFIG)
+    )
+
 
 class JSONOrderable(models.QuerySet):
     json_field = ''
+    # Fields in the json with a typed copy in a column, ordered by the column instead
+    typed_fields = {}
 
     def order_by(self, *field_names):
         if not self.json_field:
@@ -94,6 +176,8 @@ class JSONOrderable(models.QuerySet):
                 field = field[1:]
             else:
                 descending = False
+            if field in self.typed_fields:
+                return OrderBy(F(self.typed_fields[field]), descending=descending, nulls_last=True)
             db_table = self.model._meta.db_table
             return OrderBy(RawSQL(f'LOWER({db_table}.{self.json_field}->>%s)', (field,)), descending=descending, nulls_last=True)
 
@@ -103,6 +187,7 @@ class JSONOrderable(models.QuerySet):
 
 class ApplicationSubmissionQueryset(JSONOrderable):
     json_field = 'form_data'
+    typed_fields = NAMED_COLUMNS
 
     def active(self):
         return self.filter(status__in=active_statuses)
@@ -168,17 +253,96 @@ class ApplicationSubmissionQueryset(JSONOrderable):
         return self.filter(status__in=PHASES_MAPPING['accepted']['statuses']).current()
 
     def value(self):
-        return self.annotate(
-            value=Cast(KeyTextTransform('value', 'form_data'), output_field=FloatField())
-        ).aggregate(
-            Count('value'),
-            Avg('value'),
-            Sum('value'),
+        return self.aggregate(
+            value__count=Count('named_value'),
+            value__avg=Avg('named_value'),
+            value__sum=Sum('named_value'),
         )
 
     def exclude_draft(self):
         return self.exclude(status=DRAFT_STATE)
 
+    def search(self, text):
+        query = build_search_query(text)
+        if query is None:
+            return self
+        return self.annotate(
+            search_rank=SearchRank(F('search_document'), query),
+        ).filter(search_document=query).order_by('-search_rank')
+
+    def update_search_document(self):
+        return self.update(search_document=build_search_vector())
+
+    def bulk_transition(self, actions, user, request=None, notify=False):
+        """
+        Move each submission on by the first of the actions the user can take on it.
+
+        Permissions and conditions are checked in memory and the plain status changes
+        are applied, and moved in the SubmissionStats, once per source and target
+        status. Transitions which run a method or lead on to a new stage go through
+        perform_transition one at a time.
+
+        Returns the old phase of each submission moved, by id, and the list of the
+        submissions which could not be moved.
+        """
+        actions = list(actions)
+        status_field = self.model._meta.get_field('status')
+        phase_changes = {}
+        failed = []
+        grouped = defaultdict(list)
+        individual = []
+
+        with transaction.atomic():
+            submissions = self.select_related('lead', 'user').select_for_update(of=('self',))
+            for submission in submissions:
+                action = submission.allowed_action(actions, user)
+                if not action:
+                    failed.append(submission)
+                elif (
+                    submission.phase.transitions[action].get('method') or
+                    action in STAGE_CHANGE_ACTIONS or
+                    action in STAGE_CHANGE_TRIGGERS
+                ):
+                    individual.append((submission, action))
+                else:
+                    grouped[submission.status, action].append(submission)
+
+            SubmissionStats = apps.get_model('funds', 'SubmissionStats')
+            for (source, target), group in grouped.items():
+                moved = self.model.objects.filter(id__in=[submission.id for submission in group])
+                moved.filter(status=source).update(status=target)
+                # Counted once for the group rather than as each submission is saved
+                SubmissionStats.objects.transitioned(moved, source)
+
+                for submission in group:
+                    old_phase = submission.phase
+                    phase_changes[submission.id] = old_phase
+                    status_field.set_state(submission, target)
+                    submission._loaded_stats = submission.stats_state()
+                    post_transition.send(
+                        sender=self.model,
+                        instance=submission,
+                        name=transition_id(target, old_phase),
+                        field=status_field,
+                        source=source,
+                        target=target,
+                        method_args=(),
+                        method_kwargs={'by': user, 'request': request, 'notify': notify},
+                    )
+
+            for submission, action in individual:
+                # Progressing to a new stage hands the instance over to the new submission
+                submission_id = submission.id
+                old_phase = submission.phase
+                try:
+                    submission.perform_transition(action, user, request=request, notify=notify)
+                except PermissionDenied:
+                    failed.append(submission)
+                else:
+                    phase_changes[submission_id] = old_phase
+
+        return phase_changes, failed
+
     def with_latest_update(self):
         activities = self.model.activities.rel.model
         latest_activity = activities.objects.filter(submission=OuterRef('id')).select_related('user')
@@ -187,25 +351,31 @@ class ApplicationSubmissionQueryset(JSONOrderable):
             last_update=Subquery(latest_activity.values('timestamp')[:1]),
         )
 
-    def for_table(self, user):
+    def with_table_stats(self):
+        # Source of the denormalised SubmissionTableStats, see for_table
         activities = self.model.activities.rel.model
-        comments = activities.comments.filter(submission=OuterRef('id')).visible_to(user)
-        roles_for_review = self.model.assigned.field.model.objects.with_roles().filter(
-            submission=OuterRef('id'), reviewer=user)
-
+        comments = activities.comments.filter(submission=OuterRef('id'))
         review_model = self.model.reviews.field.model
         reviews = review_model.objects.filter(submission=OuterRef('id'))
         opinions = review_model.opinions.field.model.objects.filter(review__submission=OuterRef('id'))
         reviewers = self.model.assigned.field.model.objects.filter(submission=OuterRef('id'))
 
-        return self.with_latest_update().annotate(
-            comment_count=Coalesce(
+        comment_counts = {
+            f'comments_{visibility}': Coalesce(
                 Subquery(
-                    comments.values('submission').order_by().annotate(count=Count('pk')).values('count'),
+                    comments.filter(visibility=visibility).values('submission').order_by().annotate(
+                        count=Count('pk')
+                    ).values('count'),
                     output_field=IntegerField(),
                 ),
                 0,
-            ),
+            )
+            for visibility in VISIBILITY
+        }
+
+        return self.with_latest_update().annotate(
+            **comment_counts,
+            last_activity=Coalesce(F('last_update'), F('submit_time')),
             opinion_disagree=Subquery(
                 opinions.filter(opinion=DISAGREE).values(
                     'review__submission'
@@ -235,6 +405,27 @@ class ApplicationSubmissionQueryset(JSONOrderable):
                     output_field=IntegerField(),
                 )
             ),
+        )
+
+    def for_table(self, user):
+        roles_for_review = self.model.assigned.field.model.objects.with_roles().filter(
+            submission=OuterRef('id'), reviewer=user)
+
+        # The counts are read from SubmissionTableStats rather than calculated per row
+        comment_counts = [
+            F(f'table_stats__comments_{visibility}')
+            for visibility in self.model.activities.rel.model.visibility_for(user)
+        ]
+
+        return self.annotate(
+            last_user_update=F('table_stats__last_user_update'),
+            last_update=F('table_stats__last_update'),
+            comment_count=Coalesce(sum(comment_counts[1:], comment_counts[0]), 0),
+            opinion_disagree=F('table_stats__opinion_disagree'),
+            review_staff_count=F('table_stats__review_staff_count'),
+            review_count=F('table_stats__review_count'),
+            review_submitted_count=F('table_stats__review_submitted_count'),
+            review_recommendation=F('table_stats__review_recommendation'),
             role_icon=Subquery(roles_for_review[:1].values('role__icon')),
         ).prefetch_related(
             Prefetch(
@@ -343,6 +534,26 @@ class AddTransitions(models.base.ModelBase):
 
         attrs['get_actions_for_user'] = get_actions_for_user
 
+        def allowed_action(self, actions, user):
+            # Checks the same permissions and conditions as the transitions without
+            # going through django_fsm, for use on many submissions at once
+            phase = self.phase
+            if not phase:
+                return None
+            for action in actions:
+                try:
+                    transition = phase.transitions[action]
+                except KeyError:
+                    continue
+                permission = getattr(self, transition_id(action, phase) + '_permission')
+                if not permission(user):
+                    continue
+                if all(getattr(self, condition)() for condition in transition.get('conditions', [])):
+                    return action
+            return None
+
+        attrs['allowed_action'] = allowed_action
+
         def perform_transition(self, action, user, request=None, **kwargs):
             transition = self.get_transition(action)
             if not transition:
@@ -452,6 +663,14 @@ class ApplicationSubmission(
     )
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     search_data = models.TextField()
+    search_document = SearchVectorField(null=True, editable=False)
+
+    # Kept in sync with the answers by save, see NAMED_COLUMNS
+    named_title = models.CharField(max_length=255, null=True, editable=False)
+    named_full_name = models.CharField(max_length=255, null=True, editable=False)
+    named_email = models.CharField(max_length=255, null=True, editable=False)
+    named_value = models.FloatField(null=True, editable=False)
+    named_duration = models.PositiveIntegerField(null=True, editable=False)
 
     # Workflow inherited from WorkflowHelpers
     status = FSMField(default=INITIAL_STATE, protected=True)
@@ -484,6 +703,16 @@ class ApplicationSubmission(
 
     objects = ApplicationSubmissionQueryset.as_manager()
 
+    class Meta(AbstractFormSubmission.Meta):
+        indexes = [
+            GinIndex(fields=['search_document'], name='funds_submission_search_idx'),
+            models.Index(fields=['named_title'], name='funds_submission_title_idx'),
+            models.Index(fields=['named_full_name'], name='funds_submission_name_idx'),
+            models.Index(fields=['named_email'], name='funds_submission_email_idx'),
+            models.Index(fields=['named_value'], name='funds_submission_value_idx'),
+            models.Index(fields=['named_duration'], name='funds_submission_duration_idx'),
+        ]
+
     def not_progressed(self):
         return not self.next
 
@@ -570,7 +799,7 @@ class ApplicationSubmission(
             if can_proceed(transition):
                 # We convert to dict as not concerned about transitions from the first phase
                 # See note in workflow.py
-                target = dict(PHASES)[phase].stage
+                target = PHASES_BY_NAME[phase].stage
         if not target:
             raise ValueError('Incorrect State for transition')
 
@@ -595,6 +824,43 @@ class ApplicationSubmission(
         self.form_data = data
         return self
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'form_data' in field_names:
+            # Kept to tell if the form data has been replaced since, see answers_cache_key
+            instance._loaded_form_data = instance.form_data
+        if 'page_id' in field_names and 'round_id' in field_names:
+            if {'status', 'next_id', 'named_value'}.issubset(field_names):
+                # Kept to move the submission out of the stats it was counted in, see SubmissionStats
+                instance._loaded_stats = instance.stats_state()
+            if 'lead_id' in field_names:
+                # Kept to tell if the filter choices have changed, see funds.choices
+                instance._loaded_choice_key = (instance.page_id, instance.round_id, instance.lead_id)
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None:
+            self._loaded_stats = self.stats_state()
+
+    def stats_state(self):
+        """The page, round, status, whether it is current and the value the submission is counted under"""
+        return self.page_id, self.round_id, self.status, self.next_id is None, self.named_value
+
+    def answers_cache_key(self, variant):
+        # Only the answers of the live revision, as loaded from the database, are cached
+        if self.is_draft or not self.live_revision_id or self.form_data is not getattr(self, '_loaded_form_data', None):
+            return None
+
+        form_hash = fingerprint(self.form_fields)
+        if not form_hash:
+            return None
+
+        # Category options and the site linked to are rendered in the answers
+        urlconf = get_urlconf() or settings.ROOT_URLCONF
+        return f'funds:answers:{self.live_revision_id}:{form_hash}:{definitions_version()}:{urlconf}:{variant}'
+
     def from_draft(self):
         self.is_draft = True
         self.form_data = self.deserialised_data(self, self.draft_revision.form_data, self.form_fields)
@@ -622,9 +888,23 @@ class ApplicationSubmission(
 
             self.draft_revision = revision
             self.save(skip_custom=True)
+            self.revisions.compact(keep=[self.live_revision_id, self.draft_revision_id])
+            if not draft:
+                self.update_search_document()
+                # Only the submissions with a project can be downloaded as a PDF
+                if hasattr(self, 'project'):
+                    self.queue_pdf()
             return revision
         return None
 
+    def queue_pdf(self):
+        # Build the PDF in the background once the revision is committed
+        from ..tasks import generate_submission_pdf_task
+        if generate_submission_pdf_task.app.conf.task_always_eager:
+            # Without a worker it would be built in this request, leave it to the first download
+            return
+        transaction.on_commit(lambda: generate_submission_pdf_task.delay(self.id))
+
     def clean_submission(self):
         self.process_form_data()
         self.ensure_user_has_account()
@@ -641,6 +921,7 @@ class ApplicationSubmission(
             # We don't want to use this approach if the user is sending data
             return super().save(*args, update_fields=update_fields, **kwargs)
         elif skip_custom:
+            self.update_named_columns()
             return super().save(*args, **kwargs)
 
         if self.is_draft:
@@ -661,11 +942,14 @@ class ApplicationSubmission(
 
         # add a denormed version of the answer for searching
         self.search_data = ' '.join(self.prepare_search_values())
+        self.update_named_columns()
 
         super().save(*args, **kwargs)
 
         if creating:
             self.process_file_data(files)
+            SubmissionTableStats = apps.get_model('funds', 'SubmissionTableStats')
+            SubmissionTableStats.objects.create(submission=self, last_activity=self.submit_time)
             for reviewer in self.get_from_parent('reviewers').all():
                 AssignedReviewers.objects.get_or_create_for_user(
                     reviewer=reviewer,
@@ -679,6 +963,16 @@ class ApplicationSubmission(
             self.live_revision = first_revision
             self.draft_revision = first_revision
             self.save()
+        else:
+            self.update_search_document()
+
+    def update_search_document(self):
+        ApplicationSubmission.objects.filter(id=self.id).update_search_document()
+
+    def update_named_columns(self):
+        # The named answers are stored under their name, see process_form_data
+        for name, column in NAMED_COLUMNS.items():
+            setattr(self, column, typed_answer(name, self.form_data.get(name)))
 
     @property
     def has_all_reviewer_roles_assigned(self):
@@ -756,36 +1050,29 @@ class ApplicationSubmission(
 
     @property
     def ready_for_determination(self):
-        return self.status in PHASES_MAPPING['ready-for-determination']['statuses']
+        return self.status in PHASES_MAPPING_STATUSES['ready-for-determination']
 
     @property
     def accepted_for_funding(self):
-        accepted = self.status in PHASES_MAPPING['accepted']['statuses']
+        accepted = self.status in PHASES_MAPPING_STATUSES['accepted']
         return self.in_final_stage and accepted
 
     @property
     def in_final_stage(self):
-        stages = self.workflow.stages
-
-        stage_index = stages.index(self.stage)
-
-        # adjust the index since list.index() is zero-based
-        adjusted_index = stage_index + 1
-
-        return adjusted_index == len(stages)
+        return self.workflow.is_final_stage(self.stage)
 
     @property
     def in_internal_review_phase(self):
-        return self.status in PHASES_MAPPING['internal-review']['statuses']
+        return self.status in PHASES_MAPPING_STATUSES['internal-review']
 
     @property
     def in_external_review_phase(self):
-        return self.status in PHASES_MAPPING['external-review']['statuses']
+        return self.status in PHASES_MAPPING_STATUSES['external-review']
 
     @property
     def is_finished(self):
-        accepted = self.status in PHASES_MAPPING['accepted']['statuses']
-        dismissed = self.status in PHASES_MAPPING['dismissed']['statuses']
+        accepted = self.status in PHASES_MAPPING_STATUSES['accepted']
+        dismissed = self.status in PHASES_MAPPING_STATUSES['dismissed']
         return accepted or dismissed
 
     # Methods for accessing data on the submission
@@ -890,12 +1177,62 @@ def log_status_update(sender, **kwargs):
         )
 
 
+class ApplicationRevisionQueryset(models.QuerySet):
+    def compact(self, keep=()):
+        """Drop the full copy of the form data of the revisions which can be rebuilt from their delta"""
+        return self.filter(
+            delta__isnull=False,
+            full_data__isnull=False,
+        ).exclude(id__in=keep).update(full_data=None)
+
+    def rebuild_deltas(self, keep=()):
+        """Store the revisions of one submission as if each had been saved after the one before"""
+        revisions = list(self.order_by('id'))
+        previous = previous_data = None
+        for revision in revisions:
+            if revision.full_data is not None:
+                data = revision.full_data
+            else:
+                data = apply_patch(previous_data, revision.delta)
+
+            if previous is None or previous.depth + 1 >= revision.snapshot_every:
+                revision.depth = 0
+                revision.delta = None
+            else:
+                revision.depth = previous.depth + 1
+                revision.delta = make_patch(previous_data, data)
+            revision.full_data = data if revision.delta is None or revision.id in keep else None
+            previous, previous_data = revision, data
+
+        # bulk_update leaves the auto_now timestamps alone
+        self.model.objects.bulk_update(revisions, ['full_data', 'delta', 'depth'])
+        return len(revisions)
+
+
 class ApplicationRevision(BaseStreamForm, AccessFormData, models.Model):
+    """
+    A revision stores its form data as a JSON patch against the previous revision
+    of the submission, with a full snapshot every ``snapshot_every`` revisions.
+
+    The live and draft revisions also keep a full copy, so reading and editing
+    them is as cheap as before. Older revisions are rebuilt from the nearest full
+    copy, see ``raw_data``, when their ``form_data`` is read.
+    """
+    snapshot_every = 10
+
     submission = models.ForeignKey(ApplicationSubmission, related_name='revisions', on_delete=models.CASCADE)
-    form_data = JSONField(encoder=StreamFieldDataEncoder)
+    full_data = JSONField(encoder=StreamFieldDataEncoder, null=True)
+    delta = JSONField(null=True)
+    # Number of deltas since the last snapshot
+    depth = models.PositiveSmallIntegerField(default=0)
     timestamp = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
 
+    objects = ApplicationRevisionQueryset.as_manager()
+
+    _form_data = None
+    _form_data_changed = False
+
     class Meta:
         ordering = ['-timestamp']
 
@@ -906,6 +1243,68 @@ class ApplicationRevision(BaseStreamForm, AccessFormData, models.Model):
     def form_fields(self):
         return self.submission.form_fields
 
+    @property
+    def form_data(self):
+        if self._form_data is None:
+            # As from_db did when the form data was a column, the files then the other answers
+            data = self.deserialised_data(self, self.raw_data(), self.form_fields)
+            self._form_data = self.deserialize_form_data(self, data, self.form_fields)
+        return self._form_data
+
+    @form_data.setter
+    def form_data(self, form_data):
+        self._form_data = form_data
+        self._form_data_changed = True
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._form_data = None
+
+    def raw_data(self):
+        """The form data as stored, rebuilt from the nearest full copy and the deltas since"""
+        if self.full_data is not None:
+            return self.full_data
+
+        revisions = ApplicationRevision.objects.filter(submission_id=self.submission_id)
+        chain = revisions.filter(
+            id__lte=self.id,
+            id__gte=Subquery(
+                revisions.filter(
+                    id__lt=self.id,
+                    full_data__isnull=False,
+                ).order_by('-id').values('id')[:1]
+            ),
+        ).order_by('id').values_list('full_data', 'delta')
+
+        (data, _), *deltas = chain
+        for _, delta in deltas:
+            data = apply_patch(data, delta)
+        return data
+
+    def previous(self):
+        revisions = ApplicationRevision.objects.filter(submission_id=self.submission_id)
+        if self.id:
+            revisions = revisions.filter(id__lt=self.id)
+        return revisions.order_by('-id').first()
+
+    def store_form_data(self):
+        data = json.loads(json.dumps(self._form_data, cls=StreamFieldDataEncoder))
+        previous = self.previous()
+        if previous is None or previous.depth + 1 >= self.snapshot_every:
+            self.depth = 0
+            self.delta = None
+        else:
+            self.depth = previous.depth + 1
+            self.delta = make_patch(previous.raw_data(), data)
+        # Kept until the revision is neither live nor the draft, see compact
+        self.full_data = data
+
+    def save(self, *args, **kwargs):
+        if self._form_data_changed:
+            self.store_form_data()
+            self._form_data_changed = False
+        super().save(*args, **kwargs)
+
     def get_compare_url_to_latest(self):
         return reverse("funds:submissions:revisions:compare", kwargs={
             'submission_pk': self.submission.id,
@@ -966,6 +1365,15 @@ class AssignedReviewersQuerySet(models.QuerySet):
     def without_roles(self):
         return self.filter(role__isnull=True)
 
+    def role_counts(self):
+        """Map of (reviewer id, role id) to the number of assignments, in one grouped query"""
+        return {
+            (reviewer_id, role_id): count
+            for reviewer_id, role_id, count in self.with_roles().order_by().values(
+                'reviewer_id', 'role_id',
+            ).annotate(count=Count('id')).values_list('reviewer_id', 'role_id', 'count')
+        }
+
     def reviewed(self):
         return self.filter(
             Q(opinions__opinion=AGREE) |
@@ -994,7 +1402,7 @@ class AssignedReviewersQuerySet(models.QuerySet):
         return self.filter(type__name=STAFF_GROUP_NAME)
 
     def get_or_create_for_user(self, submission, reviewer):
-        groups = set(reviewer.groups.values_list('name', flat=True)) & set(REVIEW_GROUPS)
+        groups = set(reviewer.roles) & set(REVIEW_GROUPS)
         if len(groups) > 1:
             if COMMUNITY_REVIEWER_GROUP_NAME in groups:
                 groups = {COMMUNITY_REVIEWER_GROUP_NAME}
@@ -1036,6 +1444,10 @@ class AssignedReviewersQuerySet(models.QuerySet):
             ],
             ignore_conflicts=True
         )
+        # bulk_create skips the signals which keep the table stats and filter choices up to date
+        apps.get_model('funds', 'SubmissionTableStats').objects.refresh([submission.id])
+        from ..choices import invalidate, reviewer_choices
+        invalidate(reviewer_choices)
 
     def update_role(self, role, reviewer, *submissions):
         # Remove role who didn't review
@@ -0,0 +1,429 @@
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models import (
+    BooleanField,
+    Case,
+    Count,
+    Exists,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, TruncDate
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from wagtail.core.models import Page
+
+from hypha.apply.activity.models import Activity
+from hypha.apply.determinations.models import Determination
+from hypha.apply.review.models import Review, ReviewOpinion
+
+from ..workflow import PHASES_MAPPING, active_statuses
+from .submissions import ApplicationSubmission, AssignedReviewers
+
+STAT_FIELDS = [
+    'comments_applicant',
+    'comments_team',
+    'comments_reviewers',
+    'comments_partners',
+    'comments_all',
+    'opinion_disagree',
+    'review_staff_count',
+    'review_count',
+    'review_submitted_count',
+    'review_recommendation',
+    'last_update',
+    'last_user_update',
+    'last_activity',
+]
+
+
+class SubmissionTableStatsQuerySet(models.QuerySet):
+    def calculate(self, submissions):
+        for values in submissions.with_table_stats().values('id', *STAT_FIELDS).order_by():
+            submission_id = values.pop('id')
+            yield self.model(submission_id=submission_id, **values)
+
+    def refresh(self, submission_ids):
+        # Rows are created along with the submission, only update them here so a
+        # cascading delete of the submission doesn't bring them back
+        submissions = ApplicationSubmission.objects.filter(id__in=submission_ids)
+        for stats in self.calculate(submissions):
+            values = {field: getattr(stats, field) for field in STAT_FIELDS}
+            self.filter(submission_id=stats.submission_id).update(**values)
+
+    def rebuild(self, submissions):
+        with transaction.atomic():
+            self.filter(submission__in=submissions).delete()
+            return self.bulk_create(self.calculate(submissions))
+
+
+class SubmissionTableStats(models.Model):
+    """Per submission counts shown in the submission tables
+
+    Calculated by ApplicationSubmissionQueryset.with_table_stats and refreshed whenever
+    a review, opinion, assigned reviewer or activity changes. Run the
+    rebuild_submission_table_stats command to recalculate them all.
+    """
+    submission = models.OneToOneField(
+        ApplicationSubmission,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='table_stats',
+    )
+    comments_applicant = models.PositiveIntegerField(default=0)
+    comments_team = models.PositiveIntegerField(default=0)
+    comments_reviewers = models.PositiveIntegerField(default=0)
+    comments_partners = models.PositiveIntegerField(default=0)
+    comments_all = models.PositiveIntegerField(default=0)
+    # Mirror the subqueries these replace, no rows gives None rather than 0
+    opinion_disagree = models.PositiveIntegerField(null=True)
+    review_staff_count = models.PositiveIntegerField(null=True)
+    review_count = models.PositiveIntegerField(null=True)
+    review_submitted_count = models.PositiveIntegerField(null=True)
+    review_recommendation = models.IntegerField(null=True)
+    last_update = models.DateTimeField(null=True)
+    last_user_update = models.CharField(max_length=255, null=True)
+    # The last update or the submit time when there is none, the API pages through these
+    last_activity = models.DateTimeField()
+
+    objects = SubmissionTableStatsQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['last_activity', 'submission'], name='funds_tablestats_activity_idx'),
+        ]
+
+    def __str__(self):
+        return f'Table stats for {self.submission_id}'
+
+
+class ReviewerDailyReviewsQuerySet(models.QuerySet):
+    def calculate(self, reviews):
+        # The day in the site's timezone, matching created_at__date
+        counts = reviews.annotate(day=TruncDate('created_at')).values('author__reviewer_id', 'day').annotate(count=Count('id')).order_by()
+        for values in counts:
+            yield self.model(reviewer_id=values['author__reviewer_id'], day=values['day'], reviews=values['count'])
+
+    def refresh(self, reviewer_id, day, create=True):
+        reviews = Review.objects.filter(author__reviewer_id=reviewer_id, created_at__date=day).count()
+        if not reviews:
+            self.filter(reviewer_id=reviewer_id, day=day).delete()
+        elif not self.filter(reviewer_id=reviewer_id, day=day).update(reviews=reviews) and create:
+            self.create(reviewer_id=reviewer_id, day=day, reviews=reviews)
+
+    def rebuild(self):
+        with transaction.atomic():
+            self.all().delete()
+            return self.bulk_create(self.calculate(Review.objects.all()))
+
+    def between(self, start=None, end=None):
+        days = self
+        if start:
+            days = days.filter(day__gte=start)
+        if end:
+            days = days.filter(day__lte=end)
+        return days
+
+    def total_for(self, reviewer, start=None, end=None):
+        """Subquery expression of the reviews of the outer reviewer between the days given"""
+        days = self.filter(reviewer=reviewer).between(start, end).order_by()
+        return Coalesce(
+            Subquery(days.values('reviewer').annotate(total=Sum('reviews')).values('total')),
+            0,
+            output_field=models.IntegerField(),
+        )
+
+    def summary(self, today=None):
+        """The total, last 90 days, this year and last year counts shown on the leaderboard"""
+        today = today or timezone.localdate()
+        return {
+            'total': self.total_for(OuterRef('pk')),
+            'ninety_days': self.total_for(OuterRef('pk'), start=today - datetime.timedelta(days=90)),
+            'this_year': self.total_for(OuterRef('pk'), start=today.replace(month=1, day=1)),
+            'last_year': self.total_for(
+                OuterRef('pk'),
+                start=datetime.date(today.year - 1, 1, 1),
+                end=datetime.date(today.year - 1, 12, 31),
+            ),
+        }
+
+
+class ReviewerDailyReviews(models.Model):
+    """Number of reviews each reviewer created per day, for the reviewer leaderboard
+
+    Refreshed whenever a review is created or deleted. Run the
+    rebuild_reviewer_daily_reviews command to recalculate them all.
+    """
+    reviewer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_reviews')
+    day = models.DateField()
+    reviews = models.PositiveIntegerField(default=0)
+
+    objects = ReviewerDailyReviewsQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ('reviewer', 'day')
+
+    def __str__(self):
+        return f'{self.reviews} reviews by {self.reviewer_id} on {self.day}'
+
+
+class SubmissionStatsQuerySet(models.QuerySet):
+    def calculate(self, submissions):
+        determinations = Determination.objects.filter(submission=OuterRef('pk')).final()
+        counts = submissions.annotate(
+            current=Case(When(next__isnull=True, then=Value(True)), default=Value(False), output_field=BooleanField()),
+            determined=Exists(determinations),
+        ).values('page_id', 'round_id', 'status', 'current', 'determined').annotate(
+            submissions=Count('pk'),
+            value_count=Count('named_value'),
+            value_sum=Sum('named_value'),
+        ).order_by()
+        for values in counts:
+            yield self.model(**values)
+
+    def transitioned(self, submissions, source):
+        """Moves the counts of the submissions, already updated to their new status, out of the source status"""
+        changes = []
+        for stats in self.calculate(submissions):
+            counts = (stats.submissions, stats.value_count, stats.value_sum or 0)
+            old_key = (stats.page_id, stats.round_id, source, stats.current, stats.determined)
+            new_key = (stats.page_id, stats.round_id, stats.status, stats.current, stats.determined)
+            changes.append((old_key, *(-count for count in counts)))
+            changes.append((new_key, *counts))
+        self.apply(changes)
+
+    def apply(self, changes):
+        """
+        Adds to the counts once the transaction commits.
+
+        Each change is a (page_id, round_id, status, current, determined) key followed
+        by the number of submissions, of values and the sum of the values to add.
+        """
+        totals = defaultdict(lambda: (0, 0, 0))
+        for key, *counts in changes:
+            totals[key] = tuple(total + count for total, count in zip(totals[key], counts))
+        totals = {key: counts for key, counts in totals.items() if any(counts)}
+        if totals:
+            transaction.on_commit(lambda: self._apply(totals))
+
+    def _apply(self, totals):
+        for key, (submissions, value_count, value_sum) in totals.items():
+            page_id, round_id, status, current, determined = key
+            row = self.filter(page_id=page_id, round_id=round_id, status=status, current=current, determined=determined)
+            values = {
+                # Never below zero, the rebuild_submission_stats command puts any drift right
+                'submissions': Greatest(F('submissions') + submissions, 0),
+                'value_count': Greatest(F('value_count') + value_count, 0),
+            }
+            if value_count or value_sum:
+                # No sum, as Sum gives, once the last value is taken away
+                values['value_sum'] = Case(
+                    When(value_count__lte=-value_count, then=Value(None)),
+                    default=Coalesce(F('value_sum'), 0.0) + value_sum,
+                    output_field=FloatField(),
+                )
+            if row.update(**values) or submissions <= 0:
+                continue
+            with transaction.atomic():
+                # Serialises the first count of a round's row so only one of them inserts it
+                if not list(Page.objects.select_for_update().filter(id=page_id).values_list('id')):
+                    continue
+                if not row.update(**values):
+                    self.create(
+                        page_id=page_id,
+                        round_id=round_id,
+                        status=status,
+                        current=current,
+                        determined=determined,
+                        submissions=submissions,
+                        value_count=max(value_count, 0),
+                        value_sum=value_sum if value_count > 0 else None,
+                    )
+
+    def rebuild(self):
+        with transaction.atomic():
+            self.all().delete()
+            return self.bulk_create(self.calculate(ApplicationSubmission.objects.all()))
+
+    def for_round(self, page):
+        # Rounds are the round of their submissions, labs their page
+        return self.filter(Q(round=page) | Q(page=page))
+
+    def current(self):
+        return self.filter(current=True)
+
+    def undetermined(self):
+        return self.filter(determined=False)
+
+    def accepted(self):
+        return self.filter(status__in=PHASES_MAPPING['accepted']['statuses'])
+
+    def inactive(self):
+        return self.exclude(status__in=active_statuses)
+
+    def totals(self):
+        """Matches the Count, Sum and Avg of ApplicationSubmissionQueryset.value plus the number of submissions"""
+        totals = self.aggregate(
+            submissions=Coalesce(Sum('submissions'), 0, output_field=models.IntegerField()),
+            value__count=Coalesce(Sum('value_count'), 0, output_field=models.IntegerField()),
+            value__sum=Sum('value_sum'),
+        )
+        value_count, value_sum = totals['value__count'], totals['value__sum']
+        totals['value__avg'] = value_sum / value_count if value_count else None
+        return totals
+
+    def status_counts(self):
+        return dict(
+            # Rows stay behind once the last submission moves out of them
+            self.order_by().filter(submissions__gt=0).values('status').annotate(count=Sum('submissions')).values_list('status', 'count')
+        )
+
+    def total_for(self, page, **filters):
+        """Subquery expression of the number of submissions in the outer round or lab"""
+        stats = self.for_round(page).filter(**filters).order_by()
+        return Coalesce(
+            Subquery(stats.values('page').annotate(total=Sum('submissions')).values('total')),
+            0,
+            output_field=models.IntegerField(),
+        )
+
+
+class SubmissionStats(models.Model):
+    """Number of submissions and sum of their values per round, status and determination
+
+    Counts for submissions in a lab have no round. The rows a submission
+    leaves and enters are updated once the change to it, or its determinations,
+    is committed. Run the rebuild_submission_stats command to recalculate them all.
+    """
+    page = models.ForeignKey('wagtailcore.Page', on_delete=models.CASCADE, related_name='+')
+    round = models.ForeignKey('wagtailcore.Page', on_delete=models.CASCADE, related_name='+', null=True)
+    status = models.CharField(max_length=50)
+    # The stage the submission is in hasn't been progressed to a new submission
+    current = models.BooleanField()
+    determined = models.BooleanField()
+    submissions = models.PositiveIntegerField(default=0)
+    value_count = models.PositiveIntegerField(default=0)
+    value_sum = models.FloatField(null=True)
+
+    objects = SubmissionStatsQuerySet.as_manager()
+
+    def __str__(self):
+        return f'{self.submissions} {self.status} submissions in {self.round_id or self.page_id}'
+
+
+# The fields of the submission in its ApplicationSubmission.stats_state
+STATS_STATE_FIELDS = ['page', 'round', 'status', 'next', 'named_value']
+
+
+def submission_change(state, determined, sign):
+    page_id, round_id, status, current, value = state
+    return (page_id, round_id, status, current, determined), sign, sign * (value is not None), sign * (value or 0)
+
+
+@receiver(pre_save, sender=ApplicationSubmission)
+def load_submission_stats(sender, instance, **kwargs):
+    if instance._state.adding or hasattr(instance, '_loaded_stats'):
+        return
+    # Saved without having been loaded with the fields counted, find what it is counted under
+    stored = sender.objects.only(*STATS_STATE_FIELDS).filter(id=instance.id).first()
+    if stored:
+        instance._loaded_stats = stored._loaded_stats
+
+
+@receiver(post_save, sender=ApplicationSubmission)
+def update_submission_stats(sender, instance, created, **kwargs):
+    state = instance.stats_state()
+    loaded = None if created else getattr(instance, '_loaded_stats', None)
+    instance._loaded_stats = state
+    if state == loaded:
+        return
+
+    # Only a determination changes whether the submission is counted as determined
+    determined = not created and instance.determinations.final().exists()
+    changes = [submission_change(state, determined, 1)]
+    if loaded:
+        changes.append(submission_change(loaded, determined, -1))
+    SubmissionStats.objects.apply(changes)
+
+
+@receiver(post_delete, sender=ApplicationSubmission)
+def remove_submission_stats(sender, instance, **kwargs):
+    # Its determinations are deleted first, which moved it to the undetermined counts
+    state = getattr(instance, '_loaded_stats', instance.stats_state())
+    SubmissionStats.objects.apply([submission_change(state, False, -1)])
+
+
+def is_determined(submission_id):
+    return Determination.objects.filter(submission_id=submission_id).final().exists()
+
+
+@receiver(pre_save, sender=Determination)
+@receiver(pre_delete, sender=Determination)
+def load_submission_determined(sender, instance, **kwargs):
+    instance._submission_determined = is_determined(instance.submission_id)
+
+
+@receiver(post_save, sender=Determination)
+@receiver(post_delete, sender=Determination)
+def update_submission_stats_for_determination(sender, instance, **kwargs):
+    determined = is_determined(instance.submission_id)
+    if determined == instance._submission_determined:
+        return
+
+    submission = ApplicationSubmission.objects.only(*STATS_STATE_FIELDS).filter(id=instance.submission_id).first()
+    if submission:
+        state = submission.stats_state()
+        SubmissionStats.objects.apply([
+            submission_change(state, not determined, -1),
+            submission_change(state, determined, 1),
+        ])
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def refresh_reviewer_daily_reviews(sender, instance, created=None, **kwargs):
+    # Only a new or deleted review changes the counts. A delete never adds a row,
+    # so one cascading from the reviewer's account doesn't bring theirs back
+    if created is False:
+        return
+    reviewer_ids = AssignedReviewers.objects.filter(id=instance.author_id).values_list('reviewer_id', flat=True)
+    for reviewer_id in reviewer_ids:
+        ReviewerDailyReviews.objects.refresh(
+            reviewer_id,
+            timezone.localdate(instance.created_at),
+            create=bool(created),
+        )
+
+
+@receiver(post_save, sender=AssignedReviewers)
+@receiver(post_delete, sender=AssignedReviewers)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def refresh_submission_table_stats(sender, instance, **kwargs):
+    SubmissionTableStats.objects.refresh([instance.submission_id])
+
+
+@receiver(post_save, sender=ReviewOpinion)
+@receiver(post_delete, sender=ReviewOpinion)
+def refresh_table_stats_for_opinion(sender, instance, **kwargs):
+    submission_ids = Review.objects.filter(id=instance.review_id).values('submission_id')
+    SubmissionTableStats.objects.refresh(submission_ids)
+
+
+@receiver(post_save, sender=Activity)
+@receiver(post_delete, sender=Activity)
+def refresh_table_stats_for_activity(sender, instance, **kwargs):
+    submission_type = ContentType.objects.get_for_model(ApplicationSubmission)
+    if instance.source_content_type_id == submission_type.id:
+        SubmissionTableStats.objects.refresh([instance.source_object_id])
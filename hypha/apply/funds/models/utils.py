@@ -97,7 +97,7 @@ class WorkflowStreamForm(WorkflowHelpers, AbstractStreamForm):  # type: ignore
         if not stage:
             stage_num = 1
         else:
-            stage_num = self.workflow.stages.index(stage) + 1
+            stage_num = self.workflow.stage_index(stage) + 1
         return self.forms.filter(stage=stage_num)[form_index].fields
 
     def render_landing_page(self, request, form_submission=None, *args, **kwargs):
@@ -0,0 +1,55 @@
+from hypha.apply.stream_forms.cache import definitions_version
+from hypha.apply.utils.models import PDFPageSettings
+from hypha.apply.utils.pdfs import (
+    draw_submission_content,
+    make_pdf,
+    pdf_digest,
+    stored_pdf,
+)
+
+
+def default_page_size():
+    """The page size set for the apply site, for PDFs built outside of a request"""
+    from hypha.apply.home.models import ApplyHomePage
+
+    site = ApplyHomePage.objects.first().get_site()
+    return PDFPageSettings.for_site(site).download_page_size
+
+
+def submission_meta(submission):
+    return [
+        submission.stage,
+        submission.page,
+        submission.round,
+        f"Lead: { submission.lead }",
+    ]
+
+
+def submission_section(submission):
+    return {
+        'content': draw_submission_content(submission.output_text_answers()),
+        'title': 'Submission',
+        'meta': submission_meta(submission),
+    }
+
+
+def submission_pdf_path(submission, pagesize):
+    # The meta and question labels can change without a new revision
+    digest = pdf_digest(submission.title, definitions_version(), *submission_meta(submission))
+    return f'pdfs/submissions/{submission.id}/{submission.live_revision_id}-{digest}-{pagesize}.pdf'
+
+
+def render_submission_pdf(submission, pagesize):
+    return make_pdf(
+        title=submission.title,
+        sections=[submission_section(submission)],
+        pagesize=pagesize,
+    )
+
+
+def submission_pdf(submission, pagesize):
+    """The PDF of the live revision of the submission, only built when not already stored"""
+    return stored_pdf(
+        submission_pdf_path(submission, pagesize),
+        lambda: render_submission_pdf(submission, pagesize),
+    )
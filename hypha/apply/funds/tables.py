@@ -5,22 +5,28 @@ import django_filters as filters
 import django_tables2 as tables
 from django import forms
 from django.contrib.auth import get_user_model
-from django.db.models import F, Q
+from django.db.models import F, OuterRef
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from django_tables2.utils import A
-from wagtail.core.models import Page
 
-from hypha.apply.categories.models import MetaTerm
 from hypha.apply.review.models import Review
-from hypha.apply.users.groups import STAFF_GROUP_NAME
 from hypha.apply.utils.image import generate_image_tag
 from hypha.images.models import CustomImage
 
-from .models import ApplicationSubmission, Round, ScreeningStatus
+from .choices import (
+    ChoiceProvider,
+    fund_choices,
+    lead_choices,
+    meta_term_choices,
+    reviewer_choices,
+    round_choices,
+    screening_status_choices,
+)
+from .models import ApplicationSubmission, ReviewerDailyReviews
 from .widgets import Select2MultiCheckboxesWidget
 from .workflow import STATUSES, get_review_active_statuses
 
@@ -181,39 +187,15 @@ class SummarySubmissionsTableWithRole(BaseAdminSubmissionsTable):
         return ''
 
 
-def get_used_rounds(request):
-    return Round.objects.filter(submissions__isnull=False).distinct()
-
-
-def get_used_funds(request):
-    # Use page to pick up on both Labs and Funds
-    return Page.objects.filter(applicationsubmission__isnull=False).distinct()
-
-
-def get_round_leads(request):
-    return User.objects.filter(submission_lead__isnull=False).distinct()
-
-
-def get_reviewers(request):
-    """ All assigned reviewers, staff or admin """
-    return User.objects.filter(Q(submissions_reviewer__isnull=False) | Q(groups__name=STAFF_GROUP_NAME) | Q(is_superuser=True)).distinct()
-
-
-def get_screening_statuses(request):
-    return ScreeningStatus.objects.filter(
-        id__in=ApplicationSubmission.objects.all().values('screening_statuses__id').distinct('screening_statuses__id'))
-
-
-def get_meta_terms(request):
-    return MetaTerm.objects.filter(
-        filter_on_dashboard=True,
-        id__in=ApplicationSubmission.objects.all().values('meta_terms__id').distinct('meta_terms__id'))
-
-
 class Select2CheckboxWidgetMixin(filters.Filter):
     def __init__(self, *args, **kwargs):
         label = kwargs.get('label')
-        kwargs.setdefault('widget', Select2MultiCheckboxesWidget(attrs={'data-placeholder': label}))
+        queryset = kwargs.get('queryset')
+        choice_provider = queryset if isinstance(queryset, ChoiceProvider) else None
+        kwargs.setdefault('widget', Select2MultiCheckboxesWidget(
+            attrs={'data-placeholder': label},
+            choice_provider=choice_provider,
+        ))
         super().__init__(*args, **kwargs)
 
 
@@ -251,18 +233,26 @@ class StatusMultipleChoiceFilter(Select2MultipleChoiceFilter):
         return {f'{ self.field_name }__in': self.status_map[v]}
 
 
+class SubmissionSearchFilter(filters.CharFilter):
+    """Ranked, prefix matching full text search over the submission search document"""
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        return qs.search(value)
+
+
 class SubmissionFilter(filters.FilterSet):
     PAGE_CHOICES = (
         (25, '25'),
         (50, '50'),
         (100, '100'),
     )
-    round = Select2ModelMultipleChoiceFilter(queryset=get_used_rounds, label='Rounds')
-    fund = Select2ModelMultipleChoiceFilter(field_name='page', queryset=get_used_funds, label='Funds')
-    lead = Select2ModelMultipleChoiceFilter(queryset=get_round_leads, label='Leads')
-    reviewers = Select2ModelMultipleChoiceFilter(queryset=get_reviewers, label='Reviewers')
-    screening_statuses = Select2ModelMultipleChoiceFilter(queryset=get_screening_statuses, label='Screening', null_label='No Status')
-    meta_terms = Select2ModelMultipleChoiceFilter(queryset=get_meta_terms, label='Terms')
+    round = Select2ModelMultipleChoiceFilter(queryset=round_choices, label='Rounds')
+    fund = Select2ModelMultipleChoiceFilter(field_name='page', queryset=fund_choices, label='Funds')
+    lead = Select2ModelMultipleChoiceFilter(queryset=lead_choices, label='Leads')
+    reviewers = Select2ModelMultipleChoiceFilter(queryset=reviewer_choices, label='Reviewers')
+    screening_statuses = Select2ModelMultipleChoiceFilter(queryset=screening_status_choices, label='Screening', null_label='No Status')
+    meta_terms = Select2ModelMultipleChoiceFilter(queryset=meta_term_choices, label='Terms')
     per_page = filters.ChoiceFilter(choices=PAGE_CHOICES, empty_label=_('Items per page'), label='Per page', method='per_page_handler')
 
     class Meta:
@@ -286,12 +276,12 @@ class SubmissionFilter(filters.FilterSet):
 
 
 class SubmissionFilterAndSearch(SubmissionFilter):
-    query = filters.CharFilter(field_name='search_data', lookup_expr="icontains", widget=forms.HiddenInput)
+    query = SubmissionSearchFilter(widget=forms.HiddenInput)
 
 
 class SubmissionDashboardFilter(filters.FilterSet):
-    round = Select2ModelMultipleChoiceFilter(queryset=get_used_rounds, label='Rounds')
-    fund = Select2ModelMultipleChoiceFilter(field_name='page', queryset=get_used_funds, label='Funds')
+    round = Select2ModelMultipleChoiceFilter(queryset=round_choices, label='Rounds')
+    fund = Select2ModelMultipleChoiceFilter(field_name='page', queryset=fund_choices, label='Funds')
 
     class Meta:
         model = ApplicationSubmission
@@ -308,7 +298,7 @@ class SubmissionDashboardFilter(filters.FilterSet):
 
 
 class SubmissionReviewerFilterAndSearch(SubmissionDashboardFilter):
-    query = filters.CharFilter(field_name='search_data', lookup_expr="icontains", widget=forms.HiddenInput)
+    query = SubmissionSearchFilter(widget=forms.HiddenInput)
 
 
 class RoundsTable(tables.Table):
@@ -383,12 +373,26 @@ class OpenRoundFilter(Select2MultipleChoiceFilter):
 
 
 class RoundsFilter(filters.FilterSet):
-    fund = Select2ModelMultipleChoiceFilter(queryset=get_used_funds, label='Funds')
-    lead = Select2ModelMultipleChoiceFilter(queryset=get_round_leads, label='Leads')
+    fund = Select2ModelMultipleChoiceFilter(queryset=fund_choices, label='Funds')
+    lead = Select2ModelMultipleChoiceFilter(queryset=lead_choices, label='Leads')
     active = ActiveRoundFilter(label='Active')
     round_state = OpenRoundFilter(label='Open')
 
 
+class DateRangeInputWidget(filters.widgets.SuffixedMultiWidget):
+    template_name = 'application_projects/filters/widgets/date_range_input_widget.html'
+    suffixes = ['after', 'before']
+
+    def __init__(self, attrs=None):
+        widgets = (forms.DateInput, forms.DateInput)
+        super().__init__(widgets, attrs)
+
+    def decompress(self, value):
+        if value:
+            return [value.start, value.stop]
+        return [None, None]
+
+
 class ReviewerLeaderboardFilterForm(forms.ModelForm):
     """
     Form to "clean" a list of User objects to their PKs.
@@ -413,17 +417,24 @@ class ReviewerLeaderboardFilter(filters.FilterSet):
     reviewer = Select2ModelMultipleChoiceFilter(
         field_name='pk',
         label='Reviewers',
-        queryset=get_reviewers,
+        queryset=reviewer_choices,
     )
     funds = Select2ModelMultipleChoiceFilter(
-        field_name='submission__page',
+        field_name='assignedreviewers__submission__page',
         label='Funds',
-        queryset=get_used_funds,
+        queryset=fund_choices,
+        method='filter_submissions',
     )
     rounds = Select2ModelMultipleChoiceFilter(
-        field_name='submission__round',
+        field_name='assignedreviewers__submission__round',
         label='Rounds',
-        queryset=get_used_rounds,
+        queryset=round_choices,
+        method='filter_submissions',
+    )
+    period = filters.DateFromToRangeFilter(
+        label='Reviewed',
+        method='filter_period',
+        widget=DateRangeInputWidget,
     )
 
     class Meta:
@@ -435,6 +446,20 @@ class ReviewerLeaderboardFilter(filters.FilterSet):
         form = ReviewerLeaderboardFilterForm
         model = User
 
+    def filter_submissions(self, queryset, name, value):
+        # The reviewers assigned to the submissions, without joining them to the
+        # rows which would list a reviewer once per submission
+        reviewers = User.objects.filter(**{f'{name}__in': value}).values('pk')
+        return queryset.filter(pk__in=reviewers)
+
+    def filter_period(self, queryset, name, value):
+        # Counts the reviews in the period rather than dropping any reviewers
+        start = value.start and value.start.date()
+        end = value.stop and value.stop.date()
+        return queryset.annotate(
+            period=ReviewerDailyReviews.objects.total_for(OuterRef('pk'), start=start, end=end),
+        )
+
 
 class ReviewerLeaderboardTable(tables.Table):
     full_name = tables.LinkColumn('funds:submissions:reviewer_leaderboard_detail', args=[A('pk')], orderable=True, verbose_name="Reviewer", attrs={'td': {'class': 'title'}})
@@ -0,0 +1,127 @@
+import datetime
+import io
+import tempfile
+import zipfile
+
+from django.conf import settings
+from django.core.files import File
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from hypha.apply.activity.dispatch import Dispatcher, run_batch, start_run
+from hypha.apply.activity.messaging import messenger
+from hypha.apply.activity.tasks import app, send_mail_task
+from hypha.apply.utils.storage import PrivateStorage
+
+from .export import SubmissionExporter, write_csv
+from .models import ApplicationSubmission, Reminder
+from .pdfs import default_page_size, submission_pdf
+
+# Where the exports emailed to users are written, removed by delete_expired_exports
+EXPORT_DIRECTORY = 'submission_exports'
+
+
+@app.task
+def export_submissions_task(submission_ids, file_path, download_url, email):
+    # Exports too large to stream in a request are written to private storage
+    # and the link is sent to the user who asked for them
+    exporter = SubmissionExporter()
+    submissions = ApplicationSubmission.objects.filter(id__in=submission_ids)
+    with tempfile.TemporaryFile() as raw_file:
+        csvfile = io.TextIOWrapper(raw_file, encoding='utf-8', newline='')
+        write_csv(exporter, submissions, csvfile)
+        csvfile.flush()
+        raw_file.seek(0)
+        PrivateStorage().save(file_path, File(raw_file))
+        csvfile.detach()
+
+    send_mail_task(
+        subject='Your submissions export is ready',
+        body=(
+            f'The {len(submission_ids)} submissions you exported can be downloaded from {download_url} '
+            f'for the next {settings.EXPORT_EXPIRE_DAYS} days'
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email],
+    )
+
+
+@app.task
+def generate_submission_pdf_task(submission_id, pagesize=None):
+    # Built ahead of the first download, later downloads are served the stored copy
+    submission = ApplicationSubmission.objects.filter(id=submission_id).first()
+    if submission:
+        submission_pdf(submission, pagesize or default_page_size()).close()
+
+
+@app.task
+def export_round_pdfs_task(round_id, pagesize, file_path, download_url, email):
+    submissions = ApplicationSubmission.objects.filter(
+        Q(round=round_id) | Q(page=round_id),
+    ).current_accepted().select_related('round', 'page', 'lead').order_by('id')
+
+    count = 0
+    with tempfile.TemporaryFile() as raw_file:
+        # PDFs are already compressed, so they are stored as they are
+        with zipfile.ZipFile(raw_file, 'w') as archive:
+            for submission in submissions.iterator():
+                with submission_pdf(submission, pagesize) as pdf:
+                    archive.writestr(f'{submission.id}-{slugify(submission.title)}.pdf', pdf.read())
+                count += 1
+        raw_file.seek(0)
+        PrivateStorage().save(file_path, File(raw_file))
+
+    send_mail_task(
+        subject='Your submission PDFs are ready',
+        body=(
+            f'The PDFs of the {count} accepted submissions can be downloaded from {download_url} '
+            f'for the next {settings.EXPORT_EXPIRE_DAYS} days'
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email],
+    )
+
+
+@app.task
+def delete_expired_exports():
+    storage = PrivateStorage()
+    expired = timezone.now() - datetime.timedelta(days=settings.EXPORT_EXPIRE_DAYS)
+    try:
+        _, file_names = storage.listdir(EXPORT_DIRECTORY)
+    except FileNotFoundError:
+        # Nothing has been exported yet
+        return
+    for file_name in file_names:
+        file_path = f'{EXPORT_DIRECTORY}/{file_name}'
+        if storage.get_modified_time(file_path) < expired:
+            storage.delete(file_path)
+
+
+class ReminderDispatcher(Dispatcher):
+    name = 'reminders'
+
+    def due(self):
+        return Reminder.objects.filter(sent=False, time__lte=timezone.now()).select_related('submission')
+
+    def send(self, request, reminder):
+        messenger(
+            reminder.action_message,
+            request=request,
+            user=None,
+            source=reminder.submission,
+            related=reminder,
+        )
+
+    def mark_sent(self, reminders):
+        reminders.update(sent=True)
+
+
+@app.task
+def dispatch_reminders(batch_size=None):
+    start_run(ReminderDispatcher(), send_reminders_batch, batch_size or settings.DISPATCH_BATCH_SIZE)
+
+
+@app.task
+def send_reminders_batch(run_id, batch_size):
+    return run_batch(ReminderDispatcher(), run_id, batch_size)
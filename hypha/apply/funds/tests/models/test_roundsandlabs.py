@@ -8,9 +8,10 @@ from hypha.apply.funds.tests.factories import (
     LabSubmissionFactory,
     RoundFactory,
 )
+from hypha.apply.utils.testing import OnCommitMixin
 
 
-class BaseRoundsAndLabTestCase:
+class BaseRoundsAndLabTestCase(OnCommitMixin):
     def test_can_get(self):
         obj = self.base_factory()
         qs = RoundsAndLabs.objects.all()
@@ -123,7 +124,7 @@ class TestForRound(BaseRoundsAndLabTestCase, TestCase):
         self.assertEqual(fetched_obj, obj)
 
 
-class TestRoundsAndLabsManager(TestCase):
+class TestRoundsAndLabsManager(OnCommitMixin, TestCase):
     def test_cant_get_fund(self):
         FundTypeFactory()
         qs = RoundsAndLabs.objects.all()
@@ -0,0 +1,40 @@
+import csv
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from .factories import ApplicationSubmissionFactory
+
+
+class TestExportSubmissionsCSV(TestCase):
+    def export(self, *args):
+        out = StringIO()
+        with mock.patch('sys.stdout', out):
+            call_command('export_submissions_csv', '--output', '-', *args)
+        return list(csv.reader(StringIO(out.getvalue())))
+
+    def test_exports_all_columns(self):
+        submission = ApplicationSubmissionFactory()
+        header, row = self.export()
+        self.assertEqual(header[0], 'Submission ID')
+        self.assertEqual(len(header), len(row))
+        self.assertEqual(row[:2], [str(submission.id), submission.title])
+
+    def test_exports_selected_columns(self):
+        submission = ApplicationSubmissionFactory()
+        rows = self.export('--columns', 'title,email')
+        self.assertEqual(rows, [
+            ['Submission title', 'Submission e-mail'],
+            [submission.title, submission.email],
+        ])
+
+    def test_exports_in_chunks(self):
+        submissions = ApplicationSubmissionFactory.create_batch(3)
+        rows = self.export('--columns', 'id', '--chunk-size', '2')
+        self.assertEqual(rows[1:], [[str(submission.id)] for submission in submissions])
+
+    def test_unknown_column(self):
+        with self.assertRaises(CommandError):
+            self.export('--columns', 'nope')
@@ -1,22 +1,39 @@
 import itertools
 import os
 from datetime import date, timedelta
+from unittest.mock import patch
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
 from django.core import mail
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
+from hypha.apply.activity.tests.factories import CommentFactory
+from hypha.apply.determinations.tests.factories import DeterminationFactory
 from hypha.apply.funds.blocks import EmailBlock, FullNameBlock
-from hypha.apply.funds.models import ApplicationSubmission, Reminder
+from hypha.apply.funds.files import SubmissionStreamFieldFile
+from hypha.apply.funds.models import (
+    ApplicationRevision,
+    ApplicationSubmission,
+    Reminder,
+    ReviewerDailyReviews,
+    RoundsAndLabs,
+    SubmissionStats,
+    SubmissionTableStats,
+)
 from hypha.apply.funds.workflow import Request
+from hypha.apply.review.models import Review
 from hypha.apply.review.options import MAYBE, NO
 from hypha.apply.review.tests.factories import ReviewFactory, ReviewOpinionFactory
-from hypha.apply.users.tests.factories import StaffFactory
-from hypha.apply.utils.testing import make_request
+from hypha.apply.users.tests.factories import ApplicantFactory, StaffFactory
+from hypha.apply.utils.testing import OnCommitMixin, make_request
 
 from .factories import (
     ApplicationSubmissionFactory,
@@ -188,6 +205,24 @@ class TestRoundModelWorkflowAndForms(TestCase):
             self.assertNotEqual(round_form, fund_form)
 
 
+class TestFormClassCache(TestCase):
+    def setUp(self):
+        self.fund = FundTypeFactory()
+
+    def test_form_class_reused(self):
+        self.assertIs(self.fund.get_form_class(), self.fund.get_form_class())
+
+    def test_draft_form_class_separate(self):
+        self.assertIsNot(self.fund.get_form_class(), self.fund.get_form_class(draft=True))
+
+    def test_form_class_rebuilt_when_form_saved(self):
+        form_class = self.fund.get_form_class()
+        form = self.fund.forms.first().form
+        form.name = 'Changed'
+        form.save()
+        self.assertIsNot(form_class, self.fund.get_form_class())
+
+
 @override_settings(ROOT_URLCONF='hypha.apply.urls')
 class TestFormSubmission(TestCase):
     def setUp(self):
@@ -405,6 +440,42 @@ class TestApplicationSubmission(TestCase):
         submission = self.make_submission(form_data__number=value)
         self.assertNotIn(str(value), submission.search_data)
 
+    def test_search_matches_prefix_of_title(self):
+        submission = self.make_submission(form_data__title='Decentralised mesh networking')
+        self.make_submission(round=submission.round, form_data__title='Something else')
+        self.assertEqual(list(ApplicationSubmission.objects.search('decentral mesh')), [submission])
+
+    def test_search_ranks_title_above_answers(self):
+        in_answer = self.make_submission(form_data__char='Tor bridges')
+        in_title = self.make_submission(round=in_answer.round, form_data__title='Tor bridges')
+        self.assertEqual(list(ApplicationSubmission.objects.search('bridges')), [in_title, in_answer])
+
+    def test_search_updated_on_revision(self):
+        submission = self.make_submission()
+        submission.form_data['title'] = 'Censorship circumvention'
+        submission.create_revision()
+        self.assertIn(submission, ApplicationSubmission.objects.search('circumvention'))
+
+    def test_named_columns_updated_on_revision(self):
+        submission = self.make_submission()
+        submission.form_data['title'] = 'Mesh Networking '
+        submission.form_data['value'] = '1500'
+        submission.create_revision()
+
+        submission = self.refresh(submission)
+        self.assertEqual(submission.named_title, 'mesh networking')
+        self.assertEqual(submission.named_value, 1500)
+
+    def test_named_column_left_empty_for_invalid_answer(self):
+        submission = self.make_submission(form_data__value='a lot')
+        self.assertIsNone(self.refresh(submission).named_value)
+
+    def test_ordered_by_value_as_number(self):
+        ten = self.make_submission(form_data__value=10)
+        nine = self.make_submission(round=ten.round, form_data__value=9)
+        self.assertEqual(list(ApplicationSubmission.objects.order_by('value')), [nine, ten])
+        self.assertEqual(list(ApplicationSubmission.objects.order_by('-value')), [ten, nine])
+
     def test_file_gets_uploaded(self):
         filename = 'file_name.png'
         submission = self.make_submission(form_data__image__filename=filename)
@@ -490,6 +561,24 @@ class TestApplicationSubmission(TestCase):
         submission.create_revision(draft=True)
         self.assertEqual(submission.revisions.count(), 2)
 
+    def test_field_index_reused_between_lookups(self):
+        submission = ApplicationSubmissionFactory()
+        self.assertIs(submission.field_index, submission.field_index)
+
+    def test_field_index_rebuilt_when_form_fields_replaced(self):
+        submission = ApplicationSubmissionFactory()
+        index = submission.field_index
+        submission.form_fields = self.refresh(submission).form_fields
+        self.assertIsNot(submission.field_index, index)
+        self.assertEqual(submission.named_blocks, index.named_blocks)
+
+    def test_data_follows_reassigned_form_data(self):
+        submission = ApplicationSubmissionFactory()
+        title = 'My new title'
+        submission.new_data({**submission.form_data, 'title': title})
+        self.assertEqual(submission.title, title)
+        self.assertEqual(submission.data(submission.named_blocks['title']), title)
+
     def test_in_final_stage(self):
         submission = InvitedToProposalFactory().previous
         self.assertFalse(submission.in_final_stage)
@@ -498,7 +587,137 @@ class TestApplicationSubmission(TestCase):
         self.assertTrue(submission.in_final_stage)
 
 
+@patch.object(ApplicationRevision, 'snapshot_every', 3)
+class TestRevisionDeltas(TestCase):
+    def save_titles(self, submission, titles, draft=False):
+        saved = []
+        for title in titles:
+            submission.form_data['title'] = title
+            submission.create_revision(draft=draft)
+            saved.append(dict(submission.draft_revision.full_data))
+        return saved
+
+    def stored(self, submission):
+        return list(ApplicationRevision.objects.filter(submission=submission).order_by('id'))
+
+    def test_older_revisions_stored_as_deltas(self):
+        submission = ApplicationSubmissionFactory()
+        self.save_titles(submission, ['One', 'Two', 'Three'])
+
+        first, second, third, live = self.stored(submission)
+        self.assertEqual([first.depth, second.depth, third.depth, live.depth], [0, 1, 2, 0])
+        # The snapshots and the live revision keep a full copy
+        self.assertIsNotNone(first.full_data)
+        self.assertIsNone(second.full_data)
+        self.assertIsNone(third.full_data)
+        self.assertIsNotNone(live.full_data)
+        self.assertIn({'op': 'replace', 'path': '/title', 'value': 'One'}, second.delta)
+
+    def test_rebuilt_form_data(self):
+        submission = ApplicationSubmissionFactory()
+        saved = self.save_titles(submission, ['One', 'Two', 'Three', 'Four'])
+
+        for revision, data in zip(self.stored(submission)[1:], saved):
+            self.assertEqual(revision.raw_data(), data)
+            self.assertEqual(revision.form_data['title'], data['title'])
+
+    def test_rebuilt_form_data_deserialised(self):
+        submission = ApplicationSubmissionFactory()
+        self.save_titles(submission, ['One', 'Two'])
+        self.save_titles(submission, ['Draft'], draft=True)
+        file_id = next(submission.file_field_ids)
+        date_id = next(field.id for field in submission.form_fields if field.block_type == 'date')
+
+        rebuilt = self.stored(submission)[1]
+        self.assertIsNone(rebuilt.full_data)
+        draft = ApplicationSubmission.objects.get(id=submission.id).from_draft()
+        for form_data in [rebuilt.form_data, draft.form_data]:
+            self.assertIsInstance(form_data[file_id], SubmissionStreamFieldFile)
+            self.assertIsInstance(form_data[date_id], date)
+
+    def test_draft_rewritten_against_live(self):
+        submission = ApplicationSubmissionFactory()
+        self.save_titles(submission, ['Live'])
+        self.save_titles(submission, ['Draft', 'Newer draft'], draft=True)
+
+        *_, live, draft = self.stored(submission)
+        self.assertIsNotNone(live.full_data)
+        self.assertIn({'op': 'replace', 'path': '/title', 'value': 'Newer draft'}, draft.delta)
+        self.assertEqual(submission.from_draft().title, 'Newer draft')
+
+    def test_rebuild_deltas_of_full_revisions(self):
+        submission = ApplicationSubmissionFactory()
+        saved = self.save_titles(submission, ['One', 'Two', 'Three'])
+        ApplicationRevision.objects.filter(submission=submission).update(delta=None, depth=0)
+        for revision, data in zip(self.stored(submission)[1:], saved):
+            revision.full_data = data
+            revision.save()
+
+        ApplicationRevision.objects.filter(submission=submission).rebuild_deltas(keep=[submission.live_revision_id])
+
+        revisions = self.stored(submission)
+        self.assertEqual([revision.depth for revision in revisions], [0, 1, 2, 0])
+        self.assertEqual([revision.full_data is None for revision in revisions], [False, True, True, False])
+        self.assertEqual([revision.raw_data() for revision in revisions[1:]], saved)
+
+
 @override_settings(ROOT_URLCONF='hypha.apply.urls')
+class TestBulkTransition(TestCase):
+    def refresh(self, instance):
+        return instance.__class__.objects.get(id=instance.id)
+
+    def test_moves_submissions_in_one_update(self):
+        staff = StaffFactory()
+        submissions = ApplicationSubmissionFactory.create_batch(3)
+        queryset = ApplicationSubmission.objects.filter(id__in=[submission.id for submission in submissions])
+
+        with CaptureQueriesContext(connection) as queries:
+            phase_changes, failed = queryset.bulk_transition(['internal_review'], staff)
+
+        updates = [query for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(set(phase_changes), {submission.id for submission in submissions})
+        for submission in submissions:
+            self.assertEqual(self.refresh(submission).status, 'internal_review')
+
+    def test_applicant_cant_transition(self):
+        submission = ApplicationSubmissionFactory()
+        queryset = ApplicationSubmission.objects.filter(id=submission.id)
+
+        phase_changes, failed = queryset.bulk_transition(['internal_review'], submission.user)
+
+        self.assertEqual(phase_changes, {})
+        self.assertEqual(failed, [submission])
+        self.assertEqual(self.refresh(submission).status, submission.status)
+
+    def test_action_not_available_from_phase(self):
+        staff = StaffFactory()
+        moved = ApplicationSubmissionFactory()
+        stuck = ApplicationSubmissionFactory(rejected=True)
+        queryset = ApplicationSubmission.objects.filter(id__in=[moved.id, stuck.id])
+
+        phase_changes, failed = queryset.bulk_transition(['internal_review'], staff)
+
+        self.assertEqual(list(phase_changes), [moved.id])
+        self.assertEqual(failed, [stuck])
+        self.assertEqual(self.refresh(stuck).status, 'rejected')
+
+    def test_stage_change_progresses_submission(self):
+        staff = StaffFactory()
+        submission = ApplicationSubmissionFactory(status='concept_review_discussion', workflow_stages=2, lead=staff)
+        queryset = ApplicationSubmission.objects.filter(id=submission.id)
+
+        phase_changes, failed = queryset.bulk_transition(['invited_to_proposal'], staff)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(list(phase_changes), [submission.id])
+        submission = self.refresh(submission)
+        self.assertEqual(submission.status, 'invited_to_proposal')
+        self.assertIsNotNone(submission.next)
+
+
 class TestSubmissionRenderMethods(TestCase):
     def test_named_blocks_not_included_in_answers(self):
         submission = ApplicationSubmissionFactory()
@@ -562,6 +781,52 @@ class TestSubmissionRenderMethods(TestCase):
                 file_url_in_answers(file_response)
 
 
+class TestRenderedAnswersCache(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def load(self, submission):
+        return ApplicationSubmission.objects.get(id=submission.id)
+
+    def test_answers_rendered_once_per_revision(self):
+        submission = self.load(ApplicationSubmissionFactory())
+        answers = submission.output_answers()
+
+        submission = self.load(submission)
+        with patch.object(ApplicationSubmission, 'render_answers') as render_answers:
+            self.assertEqual(submission.output_answers(), answers)
+        render_answers.assert_not_called()
+
+    def test_variants_cached_separately(self):
+        submission = self.load(ApplicationSubmissionFactory())
+        self.assertNotEqual(submission.output_answers(), submission.output_text_answers())
+
+    def test_new_revision_rendered(self):
+        submission = self.load(ApplicationSubmissionFactory())
+        submission.output_answers()
+
+        field_id = next(
+            field_id for field_id in submission.question_text_field_ids
+            if field_id not in submission.named_blocks
+        )
+        submission.form_data[field_id] = 'A brand new answer'
+        submission.create_revision(by=submission.user)
+
+        self.assertIn('A brand new answer', self.load(submission).output_answers())
+
+    def test_replaced_data_not_cached(self):
+        submission = self.load(ApplicationSubmissionFactory())
+        self.assertIsNotNone(submission.answers_cache_key('answers'))
+
+        submission.form_data = submission.form_data.copy()
+        self.assertIsNone(submission.answers_cache_key('answers'))
+
+    def test_draft_not_cached(self):
+        submission = self.load(ApplicationSubmissionFactory())
+        submission.is_draft = True
+        self.assertIsNone(submission.answers_cache_key('answers'))
+
+
 class TestRequestForPartners(TestCase):
     def test_message_when_no_round(self):
         rfp = RequestForPartnersFactory()
@@ -674,6 +939,146 @@ class TestForTableQueryset(TestCase):
         self.assertEqual(submission.review_submitted_count, 1)
         self.assertEqual(submission.review_recommendation, NO)
 
+    def test_comment_count_visible_to_user(self):
+        staff = StaffFactory()
+        submission = ApplicationSubmissionFactory()
+        CommentFactory(source=submission)
+        CommentFactory(source=submission, internal=True)
+
+        qs = ApplicationSubmission.objects.for_table(user=staff)
+        self.assertEqual(qs[0].comment_count, 2)
+
+        qs = ApplicationSubmission.objects.for_table(user=ApplicantFactory())
+        self.assertEqual(qs[0].comment_count, 1)
+
+    def test_rebuild_matches_maintained_stats(self):
+        staff = StaffFactory()
+        submission = ApplicationSubmissionFactory()
+        review = ReviewFactory(submission=submission)
+        ReviewOpinionFactory(opinion_disagree=True, review=review)
+        maintained = SubmissionTableStats.objects.get(submission=submission)
+
+        SubmissionTableStats.objects.all().delete()
+        SubmissionTableStats.objects.rebuild(ApplicationSubmission.objects.all())
+
+        rebuilt = SubmissionTableStats.objects.get(submission=submission)
+        self.assertEqual(rebuilt.review_count, maintained.review_count)
+        self.assertEqual(rebuilt.opinion_disagree, 1)
+        submission = ApplicationSubmission.objects.for_table(user=staff)[0]
+        self.assertEqual(submission.review_recommendation, MAYBE)
+
+
+class TestReviewerDailyReviews(TestCase):
+    def test_review_counted_on_create_and_delete(self):
+        review = ReviewFactory()
+        other = ReviewFactory(author__reviewer=review.author.reviewer)
+        days = ReviewerDailyReviews.objects.get(reviewer=review.author.reviewer)
+        self.assertEqual(days.day, timezone.localdate())
+        self.assertEqual(days.reviews, 2)
+
+        other.delete()
+        self.assertEqual(ReviewerDailyReviews.objects.get(reviewer=review.author.reviewer).reviews, 1)
+        review.delete()
+        self.assertFalse(ReviewerDailyReviews.objects.exists())
+
+    def test_rebuild_counts_by_day(self):
+        review = ReviewFactory()
+        reviewer = review.author.reviewer
+        ReviewFactory(author__reviewer=reviewer)
+        Review.objects.filter(id=review.id).update(created_at=timezone.now() - timedelta(days=400))
+
+        ReviewerDailyReviews.objects.rebuild()
+
+        days = ReviewerDailyReviews.objects.filter(reviewer=reviewer).order_by('day')
+        self.assertEqual([day.reviews for day in days], [1, 1])
+
+    def test_summary(self):
+        today = date(2020, 6, 15)
+        reviewer = ReviewFactory().author.reviewer
+        ReviewerDailyReviews.objects.all().delete()
+        for day, reviews in [(date(2020, 6, 1), 2), (date(2020, 1, 10), 3), (date(2019, 5, 1), 4), (date(2017, 1, 1), 5)]:
+            ReviewerDailyReviews.objects.create(reviewer=reviewer, day=day, reviews=reviews)
+
+        counts = get_user_model().objects.filter(pk=reviewer.pk).annotate(
+            **ReviewerDailyReviews.objects.summary(today=today)
+        ).get()
+        self.assertEqual(counts.ninety_days, 2)
+        self.assertEqual(counts.this_year, 5)
+        self.assertEqual(counts.last_year, 4)
+        self.assertEqual(counts.total, 14)
+
+
+class TestSubmissionStats(OnCommitMixin, TestCase):
+    def setUp(self):
+        self.round = RoundFactory()
+        self.submissions = ApplicationSubmissionFactory.create_batch(3, round=self.round)
+
+    def stats(self):
+        return SubmissionStats.objects.for_round(self.round)
+
+    def test_counts_match_submissions(self):
+        DeterminationFactory(submission=self.submissions[0], accepted=True, submitted=True)
+        submissions = ApplicationSubmission.objects.filter(round=self.round)
+
+        totals = self.stats().current().totals()
+        values = submissions.current().value()
+        self.assertEqual(totals['submissions'], 3)
+        self.assertEqual(totals['value__count'], values['value__count'])
+        self.assertAlmostEqual(totals['value__sum'], values['value__sum'])
+        self.assertEqual(self.stats().undetermined().totals()['submissions'], 2)
+
+    def test_bulk_transition_updates_statuses(self):
+        queryset = ApplicationSubmission.objects.filter(id__in=[submission.id for submission in self.submissions[:2]])
+        queryset.bulk_transition(['internal_review'], StaffFactory())
+
+        counts = self.stats().current().status_counts()
+        self.assertEqual(counts['internal_review'], 2)
+        self.assertEqual(counts[self.submissions[2].status], 1)
+
+    def test_moving_submission_refreshes_both_rounds(self):
+        other_round = RoundFactory(parent=self.round.get_parent())
+        submission = ApplicationSubmission.objects.get(id=self.submissions[0].id)
+        submission.round = other_round
+        submission.save()
+
+        self.assertEqual(self.stats().totals()['submissions'], 2)
+        self.assertEqual(SubmissionStats.objects.for_round(other_round).totals()['submissions'], 1)
+
+    def test_counts_match_recount(self):
+        determination = DeterminationFactory(submission=self.submissions[0], accepted=True, submitted=True)
+        self.submissions[1].delete()
+        submission = ApplicationSubmission.objects.get(id=self.submissions[2].id)
+        submission.form_data['value'] = 10
+        submission.save()
+        determination.delete()
+
+        def rows():
+            return sorted(
+                self.stats().filter(submissions__gt=0).values_list(
+                    'status', 'current', 'determined', 'submissions', 'value_count', 'value_sum',
+                )
+            )
+
+        counted = rows()
+        SubmissionStats.objects.rebuild()
+        self.assertEqual(counted, rows())
+
+    def test_counts_applied_on_commit(self):
+        with patch('django.db.transaction.on_commit') as on_commit:
+            ApplicationSubmissionFactory(round=self.round)
+        self.assertEqual(self.stats().totals()['submissions'], 3)
+        on_commit.call_args[0][0]()
+        self.assertEqual(self.stats().totals()['submissions'], 4)
+
+    def test_progress(self):
+        ApplicationSubmission.objects.filter(id=self.submissions[0].id).update(status='rejected')
+        SubmissionStats.objects.rebuild()
+
+        progress = RoundsAndLabs.objects.with_progress().get(id=self.round.id)
+        self.assertEqual(progress.total_submissions, 3)
+        self.assertEqual(progress.closed_submissions, 1)
+        self.assertEqual(progress.progress, 33)
+
 
 class TestReminderModel(TestCase):
 
@@ -0,0 +1,154 @@
+import datetime
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from hypha.apply.activity.models import DispatchRun
+from hypha.apply.utils.storage import PrivateStorage
+
+from ..models import Reminder
+from ..pdfs import submission_pdf, submission_pdf_path
+from ..tasks import (
+    EXPORT_DIRECTORY,
+    ReminderDispatcher,
+    delete_expired_exports,
+    dispatch_reminders,
+    export_round_pdfs_task,
+    send_reminders_batch,
+)
+from .factories import ApplicationSubmissionFactory, ReminderFactory
+
+
+def in_past(days=1):
+    return timezone.now() - datetime.timedelta(days=days)
+
+
+@override_settings(ROOT_URLCONF='hypha.apply.urls')
+class TestDispatchReminders(TestCase):
+    def test_due_reminders_sent_in_batches(self):
+        due = ReminderFactory.create_batch(3, time=in_past())
+        future = ReminderFactory()
+
+        with patch('hypha.apply.funds.tasks.messenger') as messenger:
+            dispatch_reminders(batch_size=2)
+
+        self.assertEqual(messenger.call_count, 3)
+        self.assertEqual(Reminder.objects.filter(sent=True).count(), len(due))
+        self.assertFalse(Reminder.objects.get(id=future.id).sent)
+
+        run = DispatchRun.objects.get()
+        self.assertEqual(run.kind, 'reminders')
+        self.assertEqual(run.batches, 2)
+        self.assertEqual(run.batches_done, 2)
+        self.assertEqual(run.sent, 3)
+        self.assertEqual(run.failed, 0)
+
+    def test_run_finished_after_last_batch(self):
+        ReminderFactory.create_batch(2, time=in_past())
+        run = DispatchRun.objects.create(kind='reminders', batches=2)
+
+        with patch('hypha.apply.funds.tasks.messenger'):
+            send_reminders_batch(run.id, 1)
+            self.assertIsNone(DispatchRun.objects.get(id=run.id).finished)
+            send_reminders_batch(run.id, 1)
+        self.assertIsNotNone(DispatchRun.objects.get(id=run.id).finished)
+
+    def test_failed_reminder_not_retried_in_same_run(self):
+        ReminderFactory.create_batch(2, time=in_past())
+
+        with patch('hypha.apply.funds.tasks.messenger', side_effect=Exception) as messenger:
+            list(ReminderDispatcher().dispatch_all(batch_size=1))
+
+        self.assertEqual(messenger.call_count, 2)
+
+    def test_nothing_due_finishes_run(self):
+        ReminderFactory()
+        dispatch_reminders()
+        run = DispatchRun.objects.get()
+        self.assertEqual(run.batches, 0)
+        self.assertIsNotNone(run.finished)
+
+    def test_sent_reminders_not_sent_again(self):
+        ReminderFactory(time=in_past(), sent=True)
+        self.assertEqual(ReminderDispatcher().claim(10), [])
+
+    def test_failed_reminder_left_to_retry(self):
+        reminder = ReminderFactory(time=in_past())
+
+        with patch('hypha.apply.funds.tasks.messenger', side_effect=Exception):
+            dispatch_reminders()
+
+        self.assertFalse(Reminder.objects.get(id=reminder.id).sent)
+        self.assertEqual(DispatchRun.objects.get().failed, 1)
+
+
+def fake_pdf(submission, pagesize):
+    return io.BytesIO(f'%PDF {submission.title}'.encode())
+
+
+@patch('hypha.apply.funds.pdfs.render_submission_pdf', side_effect=fake_pdf)
+class TestSubmissionPDFs(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        media = override_settings(MEDIA_ROOT=self.media)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.addCleanup(shutil.rmtree, self.media)
+
+    def test_pdf_stored_after_first_render(self, render):
+        submission = ApplicationSubmissionFactory()
+        for _ in range(2):
+            with submission_pdf(submission, 'A4') as pdf:
+                self.assertEqual(pdf.read(), f'%PDF {submission.title}'.encode())
+        self.assertEqual(render.call_count, 1)
+
+    def test_new_revision_replaces_stored_pdf(self, render):
+        submission = ApplicationSubmissionFactory()
+        submission_pdf(submission, 'A4').close()
+        old_path = submission_pdf_path(submission, 'A4')
+
+        submission.form_data['title'] = 'A new title'
+        submission.create_revision()
+        submission_pdf(submission, 'A4').close()
+
+        self.assertEqual(render.call_count, 2)
+        self.assertNotEqual(submission_pdf_path(submission, 'A4'), old_path)
+        self.assertFalse(PrivateStorage().exists(old_path))
+
+    def test_other_page_size_kept(self, render):
+        submission = ApplicationSubmissionFactory()
+        submission_pdf(submission, 'A4').close()
+        submission_pdf(submission, 'letter').close()
+        self.assertTrue(PrivateStorage().exists(submission_pdf_path(submission, 'A4')))
+
+    def test_round_export_zips_accepted_submissions(self, render):
+        accepted = ApplicationSubmissionFactory(status='accepted')
+        ApplicationSubmissionFactory(status='accepted')
+        ApplicationSubmissionFactory(round=accepted.round, lead=accepted.lead)
+
+        export_round_pdfs_task(accepted.round.id, 'A4', 'exports/round.zip', 'http://example.com', 'staff@example.com')
+
+        with PrivateStorage().open('exports/round.zip') as export, zipfile.ZipFile(export) as archive:
+            self.assertEqual(len(archive.namelist()), 1)
+            self.assertTrue(archive.namelist()[0].startswith(f'{accepted.id}-'))
+        self.assertEqual(len(mail.outbox), 1)
+
+    @override_settings(EXPORT_EXPIRE_DAYS=7)
+    def test_expired_exports_deleted(self, render):
+        storage = PrivateStorage()
+        old_path = storage.save(f'{EXPORT_DIRECTORY}/old.csv', io.BytesIO(b'old'))
+        new_path = storage.save(f'{EXPORT_DIRECTORY}/new.zip', io.BytesIO(b'new'))
+        old_time = in_past(days=8).timestamp()
+        os.utime(storage.path(old_path), (old_time, old_time))
+
+        delete_expired_exports()
+
+        self.assertFalse(storage.exists(old_path))
+        self.assertTrue(storage.exists(new_path))
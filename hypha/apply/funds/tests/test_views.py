@@ -1,11 +1,17 @@
+import io
 import re
+import zipfile
 from datetime import timedelta
+from unittest import mock
 
 from bs4 import BeautifulSoup
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
+from django.db import connection
 from django.http import Http404
 from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import slugify
@@ -29,6 +35,7 @@ from hypha.apply.funds.workflow import INITIAL_STATE
 from hypha.apply.home.factories import ApplySiteFactory
 from hypha.apply.projects.models import Project
 from hypha.apply.projects.tests.factories import ProjectFactory
+from hypha.apply.review.models import Review
 from hypha.apply.review.tests.factories import ReviewFactory
 from hypha.apply.users.tests.factories import (
     ApplicantFactory,
@@ -41,12 +48,16 @@ from hypha.apply.users.tests.factories import (
 from hypha.apply.utils.testing import make_request
 from hypha.apply.utils.testing.tests import BaseViewTestCase
 
+from ..choices import ChoiceProvider, round_choices
 from ..models import (
     ApplicationRevision,
     ApplicationSubmission,
+    ReviewerDailyReviews,
     ReviewerSettings,
+    Round,
     ScreeningStatus,
 )
+from ..tables import SubmissionFilter
 from ..views import SubmissionDetailSimplifiedView, SubmissionDetailView
 from .factories import CustomFormFieldsFactory
 
@@ -1259,6 +1270,31 @@ class TestUserSubmissionFileView(BaseSubmissionFileViewTestCase):
         self.assertEqual(response.redirect_chain, [])
 
 
+class TestSubmissionAttachmentsView(BaseViewTestCase):
+    url_name = 'funds:submissions:{}'
+    base_view_name = 'attachments'
+    user_factory = StaffFactory
+
+    def get_kwargs(self, instance):
+        return {'pk': instance.pk}
+
+    def test_zip_of_uploaded_files(self):
+        submission = ApplicationSubmissionFactory()
+        response = self.get_page(submission)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        field_id = next(submission.file_field_ids)
+        document = submission.data(field_id)
+        self.assertEqual(archive.namelist(), [document.filename])
+        self.assertEqual(archive.read(document.filename), document.read())
+
+    def test_applicant_cant_download(self):
+        self.client.force_login(ApplicantFactory())
+        response = self.get_page(ApplicationSubmissionFactory())
+        self.assertEqual(response.status_code, 403)
+
+
 class TestAnonSubmissionFileView(BaseSubmissionFileViewTestCase):
     user_factory = AnonymousUser
 
@@ -1303,6 +1339,66 @@ class TestUserReminderDeleteView(BaseProjectDeleteTestCase):
         self.assertEqual(response.status_code, 403)
 
 
+@override_settings(ROOT_URLCONF='hypha.apply.urls')
+class TestFilterChoices(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.submission = ApplicationSubmissionFactory()
+
+    def get_choices(self, name, **params):
+        return self.client.get(reverse('funds:submissions:filter_choices', args=[name]), params, secure=True)
+
+    def test_choices_cached(self):
+        self.assertEqual(round_choices.ids(), [self.submission.round.id])
+        with self.assertNumQueries(0):
+            round_choices.ids()
+
+    def test_new_round_invalidates_choices(self):
+        round_choices.ids()
+        other = ApplicationSubmissionFactory()
+        self.assertCountEqual(round_choices.ids(), [self.submission.round.id, other.round.id])
+
+    def test_search(self):
+        self.client.force_login(StaffFactory())
+        ApplicationSubmissionFactory(round__title='Another round')
+        response = self.get_choices('rounds', term=self.submission.round.title)
+        self.assertEqual(response.json(), {
+            'results': [{'id': self.submission.round.id, 'text': self.submission.round.title}],
+            'pagination': {'more': False},
+        })
+
+    @mock.patch.object(ChoiceProvider, 'page_size', 2)
+    def test_pages_in_order(self):
+        self.client.force_login(StaffFactory())
+        for title in ['E round', 'C round', 'D round', 'B round']:
+            ApplicationSubmissionFactory(round__title=title)
+
+        ids = []
+        for page in [1, 2, 3]:
+            data = self.get_choices('rounds', page=page).json()
+            ids += [option['id'] for option in data['results']]
+            self.assertEqual(data['pagination']['more'], page < 3)
+
+        expected = Round.objects.filter(submissions__isnull=False).distinct().order_by('title', 'pk')
+        self.assertEqual(ids, list(expected.values_list('id', flat=True)))
+
+    def test_reviewer_cant_list_people(self):
+        self.client.force_login(ReviewerFactory())
+        self.assertEqual(self.get_choices('rounds').status_code, 200)
+        self.assertEqual(self.get_choices('reviewers').status_code, 403)
+
+    def test_applicant_cant_list_choices(self):
+        self.client.force_login(ApplicantFactory())
+        self.assertEqual(self.get_choices('rounds').status_code, 403)
+
+    @mock.patch.object(ChoiceProvider, 'lazy_threshold', 0)
+    def test_large_list_searched_for(self):
+        filterset = SubmissionFilter(data={'round': [self.submission.round.id]}, queryset=ApplicationSubmission.objects.all())
+        html = str(filterset.form['round'])
+        self.assertIn(reverse('funds:submissions:filter_choices', args=['rounds']), html)
+        self.assertIn(f'value="{self.submission.round.id}"', html)
+
+
 @override_settings(ROOT_URLCONF='hypha.apply.urls')
 class TestReviewerLeaderboard(TestCase):
     def test_applicant_cannot_access_reviewer_leaderboard(self):
@@ -1330,6 +1426,101 @@ class TestReviewerLeaderboard(TestCase):
         response = self.client.get('/apply/submissions/reviews/', follow=True, secure=True)
         self.assertEqual(response.status_code, 200)
 
+    def test_counts_reviews_in_period(self):
+        reviewer = ReviewerFactory()
+        review = ReviewFactory(author__reviewer=reviewer)
+        ReviewFactory(author__reviewer=reviewer)
+        Review.objects.filter(id=review.id).update(created_at=timezone.now() - timedelta(days=120))
+        ReviewerDailyReviews.objects.rebuild()
+
+        self.client.force_login(StaffFactory())
+        start = timezone.localdate() - timedelta(days=10)
+        response = self.client.get(
+            reverse('funds:submissions:reviewer_leaderboard'),
+            {'period_after': start.isoformat()},
+            secure=True,
+        )
+        record = next(row.record for row in response.context['table'].rows if row.record == reviewer)
+        self.assertEqual(record.total, 2)
+        self.assertEqual(record.ninety_days, 1)
+        self.assertEqual(record.period, 1)
+        self.assertContains(response, 'In period')
+
+    def test_reviewer_listed_once_per_round(self):
+        reviewer = ReviewerFactory()
+        review = ReviewFactory(author__reviewer=reviewer)
+        ReviewFactory(author__reviewer=reviewer, submission__round=review.submission.round)
+
+        self.client.force_login(StaffFactory())
+        response = self.client.get(
+            reverse('funds:submissions:reviewer_leaderboard'),
+            {'rounds': [review.submission.round.id]},
+            secure=True,
+        )
+        records = [row.record for row in response.context['table'].rows]
+        self.assertEqual(records, [reviewer])
+        self.assertEqual(records[0].total, 2)
+
+    def test_detail_summary(self):
+        reviewer = ReviewFactory().author.reviewer
+        self.client.force_login(StaffFactory())
+        response = self.client.get(
+            reverse('funds:submissions:reviewer_leaderboard_detail', args=[reviewer.pk]),
+            secure=True,
+        )
+        self.assertEqual(response.context['summary']['total'], 1)
+        self.assertEqual(response.context['summary']['ninety_days'], 1)
+
+
+@override_settings(ROOT_URLCONF='hypha.apply.urls')
+class TestSubmissionSearch(TestCase):
+    def setUp(self):
+        self.client.force_login(StaffFactory())
+        self.in_answer = ApplicationSubmissionFactory(form_data__char='Tor bridges')
+        self.in_title = ApplicationSubmissionFactory(round=self.in_answer.round, form_data__title='Tor bridges')
+
+    def search(self, **params):
+        response = self.client.get(reverse('funds:submissions:list'), {'query': 'bridges', **params}, secure=True)
+        return [row.record for row in response.context['table'].rows]
+
+    def test_results_ordered_by_rank(self):
+        self.assertEqual(self.search(), [self.in_title, self.in_answer])
+
+    def test_sorted_column_overrides_rank(self):
+        self.assertEqual(self.search(sort='submit_time'), [self.in_answer, self.in_title])
+
+
+@override_settings(ROOT_URLCONF='hypha.apply.urls')
+class TestSubmissionExport(TestCase):
+    def setUp(self):
+        self.client.force_login(StaffFactory())
+
+    def export(self, **params):
+        return self.client.get(reverse('funds:submissions:list'), {'export': 'csv', **params}, secure=True)
+
+    def test_streams_filtered_submissions(self):
+        submission = ApplicationSubmissionFactory()
+        other = ApplicationSubmissionFactory()
+        response = self.export(round=submission.round.id)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn(submission.title, content)
+        self.assertNotIn(other.title, content)
+
+    def test_large_export_runs_in_background(self):
+        submissions = ApplicationSubmissionFactory.create_batch(2)
+        with mock.patch('hypha.apply.funds.views.SubmissionExportMixin.export_stream_limit', 1), \
+                mock.patch('hypha.apply.funds.views.export_submissions_task') as task:
+            response = self.export()
+        self.assertEqual(response.status_code, 302)
+        submission_ids = task.delay.call_args[0][0]
+        self.assertCountEqual(submission_ids, [submission.id for submission in submissions])
+
+    def test_applicant_cannot_export(self):
+        self.client.force_login(ApplicantFactory())
+        response = self.export()
+        self.assertNotEqual(response.get('Content-Type'), 'text/csv')
+
 
 class TestUpdateReviewersMixin(BaseSubmissionViewTestCase):
     user_factory = StaffFactory
@@ -1386,3 +1577,37 @@ class TestUpdateReviewersMixin(BaseSubmissionViewTestCase):
             submission.status,
             'proposal_internal_review'
         )
+
+
+@override_settings(ROOT_URLCONF='hypha.apply.urls')
+class TestStaffAssignments(TestCase):
+    def setUp(self):
+        self.client.force_login(StaffFactory())
+
+    def get_table(self):
+        response = self.client.get(reverse('funds:submissions:staff_assignments'), secure=True)
+        return response.context['table']
+
+    def test_counts_active_assignments_per_role(self):
+        roles = ReviewerRoleFactory.create_batch(2)
+        staff = StaffFactory()
+        AssignedReviewersFactory(reviewer=staff, role=roles[0], staff=True)
+        AssignedReviewersFactory(reviewer=staff, role=roles[0], staff=True)
+        AssignedReviewersFactory(reviewer=staff, role=roles[1], staff=True, submission__rejected=True)
+
+        row = next(row for row in self.get_table().rows if row.record == staff)
+        self.assertEqual(row.get_cell_value('role0'), 2)
+        self.assertEqual(row.get_cell_value('role1'), 0)
+
+    def test_queries_dont_grow_with_staff_and_roles(self):
+        ReviewerRoleFactory()
+        StaffFactory()
+        with CaptureQueriesContext(connection) as few:
+            self.get_table()
+
+        ReviewerRoleFactory.create_batch(3)
+        StaffFactory.create_batch(5)
+        with CaptureQueriesContext(connection) as many:
+            self.get_table()
+
+        self.assertEqual(len(many), len(few))
@@ -0,0 +1,86 @@
+from django.test import TestCase
+
+from hypha.apply.users.tests.factories import (
+    ApplicantFactory,
+    CommunityReviewerFactory,
+    ReviewerFactory,
+    StaffFactory,
+)
+
+from ..workflow import (
+    PHASE_INDEX,
+    PHASES,
+    PHASES_MAPPING,
+    PHASES_MAPPING_STATUSES,
+    ConceptProposal,
+    Request,
+    RequestCommunity,
+    get_action_mapping,
+    get_review_active_statuses,
+)
+
+
+class TestCompiledWorkflow(TestCase):
+    def test_stages_in_order(self):
+        self.assertEqual([stage.name for stage in ConceptProposal.stages], ['Concept', 'Proposal'])
+        self.assertEqual(ConceptProposal.stage_index(ConceptProposal.stages[1]), 1)
+
+    def test_final_stage(self):
+        concept, proposal = ConceptProposal.stages
+        self.assertFalse(ConceptProposal.is_final_stage(concept))
+        self.assertTrue(ConceptProposal.is_final_stage(proposal))
+        self.assertTrue(Request.is_final_stage(Request.stages[0]))
+
+    def test_display_phases_first_of_each_step(self):
+        phases = Request.phases_for()
+        self.assertEqual(phases, [Request.stepped_phases[step][0] for step in Request.stepped_phases])
+
+    def test_phases_for_hides_phases_from_applicant(self):
+        applicant_phases = Request.phases_for(ApplicantFactory())
+        staff_phases = Request.phases_for(StaffFactory())
+        self.assertTrue(set(applicant_phases) < set(staff_phases))
+        for phase in applicant_phases:
+            self.assertTrue(phase.permissions.can_view(ApplicantFactory()))
+
+    def test_previous_visible(self):
+        applicant = ApplicantFactory()
+        hidden = next(
+            phase for phase in Request.phases_for()
+            if not phase.permissions.can_view(applicant)
+        )
+        previous = Request.previous_visible(hidden, applicant)
+        self.assertTrue(previous.permissions.can_view(applicant))
+        self.assertLess(previous.step, hidden.step)
+
+    def test_review_active_statuses_match_phase_permissions(self):
+        for user in [StaffFactory(), ReviewerFactory(), CommunityReviewerFactory(), ApplicantFactory()]:
+            expected = {
+                phase_name for phase_name, phase in PHASES
+                if phase_name in get_review_active_statuses() and phase.permissions.can_review(user)
+            }
+            self.assertEqual(get_review_active_statuses(user), expected)
+
+    def test_community_reviewer_reviews_community_phases_only(self):
+        statuses = get_review_active_statuses(CommunityReviewerFactory())
+        self.assertTrue(statuses)
+        self.assertTrue(statuses <= set(RequestCommunity))
+
+    def test_phase_index_follows_workflow_order(self):
+        names = list(ConceptProposal)
+        self.assertLess(PHASE_INDEX[names[1]], PHASE_INDEX[names[-1]])
+
+    def test_phases_mapping_statuses(self):
+        for key, data in PHASES_MAPPING.items():
+            self.assertEqual(PHASES_MAPPING_STATUSES[key], set(data['statuses']))
+
+    def test_action_mapping_per_workflow(self):
+        mapping = get_action_mapping(Request)
+        transitions = {
+            transition
+            for phase in Request.values()
+            for transition in phase.transitions
+        }
+        self.assertEqual(
+            {transition for action in mapping.values() for transition in action['transitions']},
+            transitions,
+        )
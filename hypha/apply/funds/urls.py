@@ -3,20 +3,26 @@ from django.urls import include, path
 from hypha.apply.projects import urls as projects_urls
 
 from .views import (
+    FilterChoicesView,
     ReminderDeleteView,
     ReviewerLeaderboard,
     ReviewerLeaderboardDetail,
     RevisionCompareView,
     RevisionListView,
+    RoundAttachmentsView,
     RoundListView,
+    RoundPDFsExportView,
     StaffAssignments,
+    SubmissionAttachmentsView,
     SubmissionDeleteView,
     SubmissionDetailPDFView,
     SubmissionDetailSimplifiedView,
     SubmissionDetailView,
     SubmissionEditView,
+    SubmissionExportView,
     SubmissionListView,
     SubmissionOverviewView,
+    SubmissionPDFsExportView,
     SubmissionPrivateMediaView,
     SubmissionResultView,
     SubmissionsByRound,
@@ -42,6 +48,9 @@ submission_urls = ([
     path('', SubmissionOverviewView.as_view(), name="overview"),
     path('all/', SubmissionListView.as_view(), name="list"),
     path('result/', SubmissionResultView.as_view(), name="result"),
+    path('filter-choices/<slug:name>/', FilterChoicesView.as_view(), name="filter_choices"),
+    path('export/<uuid:export_id>/', SubmissionExportView.as_view(), name="export"),
+    path('export/<uuid:export_id>/pdfs/', SubmissionPDFsExportView.as_view(), name="export_pdfs"),
     path('flagged/', include([
         path('', SubmissionUserFlaggedView.as_view(), name="flagged"),
         path('staff/', SubmissionStaffFlaggedView.as_view(), name="staff_flagged"),
@@ -59,6 +68,7 @@ submission_urls = ([
         path('sealed/', SubmissionSealedView.as_view(), name="sealed"),
         path('simplified/', SubmissionDetailSimplifiedView.as_view(), name="simplified"),
         path('download/', SubmissionDetailPDFView.as_view(), name="download"),
+        path('attachments/', SubmissionAttachmentsView.as_view(), name="attachments"),
         path('delete/', SubmissionDeleteView.as_view(), name="delete"),
         path(
             'documents/<uuid:field_id>/<str:file_name>',
@@ -78,6 +88,8 @@ submission_urls = ([
 rounds_urls = ([
     path('', RoundListView.as_view(), name="list"),
     path('<int:pk>/', SubmissionsByRound.as_view(), name="detail"),
+    path('<int:pk>/export-pdfs/', RoundPDFsExportView.as_view(), name="export_pdfs"),
+    path('<int:pk>/attachments/', RoundAttachmentsView.as_view(), name="attachments"),
 ], 'rounds')
 
 
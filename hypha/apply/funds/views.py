@@ -1,5 +1,5 @@
+import uuid
 from copy import copy
-from datetime import timedelta
 
 import django_tables2 as tables
 from django.contrib import messages
@@ -8,16 +8,24 @@ from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.contrib.humanize.templatetags.humanize import intcomma
 from django.core.exceptions import PermissionDenied
-from django.db.models import Count, F, Q
-from django.http import FileResponse, Http404, HttpResponseRedirect
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
 from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
+from django.utils.text import slugify
 from django.utils.translation import gettext as _
 from django.views import View
-from django.views.decorators.cache import cache_page
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -48,8 +56,8 @@ from hypha.apply.projects.models import Project
 from hypha.apply.review.models import Review
 from hypha.apply.review.views import ReviewContextMixin
 from hypha.apply.users.decorators import staff_required
+from hypha.apply.utils.archive import zip_response
 from hypha.apply.utils.models import PDFPageSettings
-from hypha.apply.utils.pdfs import draw_submission_content, make_pdf
 from hypha.apply.utils.storage import PrivateMediaView
 from hypha.apply.utils.views import (
     DelegateableListView,
@@ -57,8 +65,14 @@ from hypha.apply.utils.views import (
     ViewDispatcher,
 )
 
+from .choices import PROVIDERS
 from .differ import compare
-from .files import generate_submission_file_path
+from .export import SubmissionExporter, stream_csv
+from .files import (
+    generate_submission_file_path,
+    submission_attachments,
+    submissions_attachments,
+)
 from .forms import (
     BatchDeleteSubmissionForm,
     BatchProgressSubmissionForm,
@@ -78,11 +92,15 @@ from .models import (
     AssignedReviewers,
     LabBase,
     Reminder,
+    ReviewerDailyReviews,
     ReviewerRole,
     ReviewerSettings,
     RoundBase,
     RoundsAndLabs,
+    SubmissionStats,
 )
+from .models.submissions import build_search_query
+from .pdfs import submission_pdf
 from .permissions import is_user_has_access_to_view_submission
 from .tables import (
     AdminSubmissionsTable,
@@ -97,6 +115,7 @@ from .tables import (
     SubmissionReviewerFilterAndSearch,
     SummarySubmissionsTable,
 )
+from .tasks import EXPORT_DIRECTORY, export_round_pdfs_task, export_submissions_task
 from .utils import get_default_screening_statues
 from .workflow import (
     DRAFT_STATE,
@@ -113,21 +132,21 @@ User = get_user_model()
 class SubmissionStatsMixin:
     def get_context_data(self, **kwargs):
         submissions = ApplicationSubmission.objects.all()
-        submission_undetermined_count = submissions.undetermined().count()
         review_my_count = submissions.reviewed_by(self.request.user).count()
 
-        submission_value = submissions.current().value()
+        stats = SubmissionStats.objects.all()
+        submission_undetermined_count = stats.undetermined().totals()['submissions']
+
+        submission_value = stats.current().totals()
         submission_sum = intcomma(submission_value.get('value__sum'))
         submission_count = submission_value.get('value__count')
 
-        submission_accepted = submissions.current_accepted()
-        submission_accepted_value = submission_accepted.value()
+        submission_accepted_value = stats.current().accepted().totals()
         submission_accepted_sum = intcomma(submission_accepted_value.get('value__sum'))
-        submission_accepted_count = submission_accepted.count()
+        submission_accepted_count = submission_accepted_value.get('submissions')
 
-        reviews = Review.objects.all()
-        review_count = reviews.count()
-        review_my_score = reviews.by_user(self.request.user).score()
+        review_count = ReviewerDailyReviews.objects.aggregate(count=Coalesce(Sum('reviews'), 0))['count']
+        review_my_score = Review.objects.by_user(self.request.user).score()
 
         return super().get_context_data(
             submission_undetermined_count=submission_undetermined_count,
@@ -184,6 +203,9 @@ class BaseAdminSubmissionsTable(SingleTableMixin, FilterView):
         }
 
     def get_table_kwargs(self, **kwargs):
+        if build_search_query(self.request.GET.get('query', '')) is not None and not self.request.GET.get('sort'):
+            # Keep the search results in order of rank unless a column is sorted on
+            kwargs.setdefault('order_by', ())
         return {**self.excluded, **kwargs}
 
     def get_filterset_kwargs(self, filterset_class, **kwargs):
@@ -205,6 +227,132 @@ class BaseAdminSubmissionsTable(SingleTableMixin, FilterView):
         )
 
 
+class SubmissionExportMixin:
+    """Download the filtered submissions with ?export=csv
+
+    Up to ``export_stream_limit`` submissions are streamed in the response, larger
+    exports are built in the background and the link emailed to the user.
+    """
+    export_stream_limit = 5000
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('export') != 'csv':
+            return super().get(request, *args, **kwargs)
+
+        filterset = self.get_filterset(self.get_filterset_class())
+        if not filterset.is_bound or filterset.is_valid() or not self.get_strict():
+            submissions = filterset.qs
+        else:
+            submissions = filterset.queryset.none()
+
+        exporter = SubmissionExporter()
+        submission_ids = list(submissions.order_by('id').values_list('id', flat=True))
+        if len(submission_ids) > self.export_stream_limit:
+            export_id = uuid.uuid4()
+            download_url = request.build_absolute_uri(
+                reverse('funds:submissions:export', kwargs={'export_id': export_id})
+            )
+            export_submissions_task.delay(
+                submission_ids,
+                SubmissionExportView.file_path(export_id),
+                download_url,
+                request.user.email,
+            )
+            messages.info(
+                request,
+                _('The export of {count} submissions will be emailed to you when it is ready.').format(
+                    count=len(submission_ids),
+                ),
+            )
+            query = request.GET.copy()
+            del query['export']
+            return HttpResponseRedirect(f'{request.path}?{query.urlencode()}')
+
+        response = StreamingHttpResponse(
+            stream_csv(exporter, ApplicationSubmission.objects.filter(id__in=submission_ids)),
+            content_type='text/csv',
+        )
+        file_name = f'submissions-{timezone.now():%Y-%m-%d}.csv'
+        response['Content-Disposition'] = f'attachment; filename="{file_name}"'
+        return response
+
+    def get_context_data(self, **kwargs):
+        query = self.request.GET.copy()
+        query.pop('page', None)
+        query['export'] = 'csv'
+        return super().get_context_data(
+            export_url=f'{self.request.path}?{query.urlencode()}',
+            **kwargs,
+        )
+
+
+@method_decorator(staff_required, name='dispatch')
+class SubmissionExportView(PrivateMediaView):
+    extension = 'csv'
+
+    @classmethod
+    def file_path(cls, export_id):
+        return f'{EXPORT_DIRECTORY}/{export_id}.{cls.extension}'
+
+    def get_media(self, *args, **kwargs):
+        file_path = self.file_path(kwargs['export_id'])
+        if not self.storage.exists(file_path):
+            raise Http404
+        return self.storage.open(file_path)
+
+
+@method_decorator(staff_required, name='dispatch')
+class SubmissionPDFsExportView(SubmissionExportView):
+    extension = 'zip'
+
+
+class RoundOrLabObjectMixin(SingleObjectMixin):
+    model = Page
+
+    def get_object(self, queryset=None):
+        obj = super().get_object(queryset).specific
+        if not isinstance(obj, (LabBase, RoundBase)):
+            raise Http404(_("No Round or Lab found matching the query"))
+        return obj
+
+
+@method_decorator(staff_required, name='dispatch')
+class RoundPDFsExportView(RoundOrLabObjectMixin, View):
+    """Build a zip of the PDFs of the accepted submissions in a round or lab and email the link"""
+    def post(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        export_id = uuid.uuid4()
+        download_url = request.build_absolute_uri(
+            reverse('funds:submissions:export_pdfs', kwargs={'export_id': export_id})
+        )
+        export_round_pdfs_task.delay(
+            self.object.id,
+            PDFPageSettings.for_request(request).download_page_size,
+            SubmissionPDFsExportView.file_path(export_id),
+            download_url,
+            request.user.email,
+        )
+        messages.info(
+            request,
+            _('The PDFs of the accepted submissions will be emailed to you when they are ready.'),
+        )
+        return HttpResponseRedirect(reverse('funds:rounds:detail', kwargs={'pk': self.object.id}))
+
+
+@method_decorator(staff_required, name='dispatch')
+class RoundAttachmentsView(RoundOrLabObjectMixin, View):
+    """Stream a zip of the files uploaded to the submissions in a round or lab"""
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        submissions = ApplicationSubmission.objects.filter(
+            Q(round=self.object) | Q(page=self.object),
+        ).exclude_draft().current().order_by('id')
+        return zip_response(
+            submissions_attachments(submissions),
+            f'{slugify(self.object.title)}-attachments.zip',
+        )
+
+
 @method_decorator(staff_required, name='dispatch')
 class BatchUpdateLeadView(DelegatedViewMixin, FormView):
     form_class = BatchUpdateSubmissionLeadForm
@@ -300,23 +448,12 @@ class BatchProgressSubmissionView(DelegatedViewMixin, FormView):
             if redirect:
                 return redirect
 
-        failed = []
-        phase_changes = {}
-        for submission in submissions:
-            valid_actions = {action for action, _ in submission.get_actions_for_user(self.request.user)}
-            old_phase = submission.phase
-            try:
-                transition = (valid_actions & set(transitions)).pop()
-                submission.perform_transition(
-                    transition,
-                    self.request.user,
-                    request=self.request,
-                    notify=False,
-                )
-            except (PermissionDenied, KeyError):
-                failed.append(submission)
-            else:
-                phase_changes[submission.id] = old_phase
+        phase_changes, failed = submissions.bulk_transition(
+            transitions,
+            self.request.user,
+            request=self.request,
+            notify=False,
+        )
 
         if failed:
             messages.warning(
@@ -387,11 +524,7 @@ class SubmissionOverviewView(BaseAdminSubmissionsTable):
         closed_query = '?round_state=closed'
         rounds_title = 'All Rounds and Labs'
 
-        status_counts = dict(
-            ApplicationSubmission.objects.current().values('status').annotate(
-                count=Count('status'),
-            ).values_list('status', 'count')
-        )
+        status_counts = SubmissionStats.objects.current().status_counts()
 
         grouped_statuses = {
             status: {
@@ -426,7 +559,7 @@ class SubmissionOverviewView(BaseAdminSubmissionsTable):
         }
 
 
-class SubmissionAdminListView(BaseAdminSubmissionsTable, DelegateableListView):
+class SubmissionAdminListView(SubmissionExportMixin, BaseAdminSubmissionsTable, DelegateableListView):
     template_name = 'funds/submissions.html'
     form_views = [
         BatchUpdateLeadView,
@@ -465,7 +598,7 @@ class SubmissionUserFlaggedView(UserPassesTestMixin, BaseAdminSubmissionsTable):
 
 
 @method_decorator(staff_required, name='dispatch')
-class SubmissionsByRound(BaseAdminSubmissionsTable, DelegateableListView):
+class SubmissionsByRound(SubmissionExportMixin, BaseAdminSubmissionsTable, DelegateableListView):
     template_name = 'funds/submissions_by_round.html'
     form_views = [
         BatchUpdateLeadView,
@@ -1179,6 +1312,19 @@ class SubmissionPrivateMediaView(UserPassesTestMixin, PrivateMediaView):
         return is_user_has_access_to_view_submission(self.request.user, self.submission)
 
 
+@method_decorator(staff_required, name='dispatch')
+class SubmissionAttachmentsView(SingleObjectMixin, View):
+    """Stream a zip of the files uploaded to the submission"""
+    model = ApplicationSubmission
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return zip_response(
+            submission_attachments(self.object),
+            f'{self.object.id}-{slugify(self.object.title)}-attachments.zip',
+        )
+
+
 @method_decorator(staff_required, name='dispatch')
 class SubmissionDetailSimplifiedView(DetailView):
     model = ApplicationSubmission
@@ -1208,25 +1354,7 @@ class SubmissionDetailPDFView(SingleObjectMixin, View):
     def get(self, request, *args, **kwargs):
         self.object = self.get_object()
         pdf_page_settings = PDFPageSettings.for_request(request)
-        content = draw_submission_content(
-            self.object.output_text_answers()
-        )
-        pdf = make_pdf(
-            title=self.object.title,
-            sections=[
-                {
-                    'content': content,
-                    'title': 'Submission',
-                    'meta': [
-                        self.object.stage,
-                        self.object.page,
-                        self.object.round,
-                        f"Lead: { self.object.lead }",
-                    ],
-                },
-            ],
-            pagesize=pdf_page_settings.download_page_size,
-        )
+        pdf = submission_pdf(self.object, pdf_page_settings.download_page_size)
         return FileResponse(
             pdf,
             as_attachment=True,
@@ -1234,7 +1362,6 @@ class SubmissionDetailPDFView(SingleObjectMixin, View):
         )
 
 
-@method_decorator(cache_page(60), name='dispatch')
 @method_decorator(staff_required, name='dispatch')
 class SubmissionResultView(SubmissionStatsMixin, FilterView):
     template_name = 'funds/submissions_result.html'
@@ -1258,9 +1385,32 @@ class SubmissionResultView(SubmissionStatsMixin, FilterView):
     def get_queryset(self):
         return self.filterset_class._meta.model.objects.current()
 
+    def get_stats_filters(self):
+        """The filters as filters of SubmissionStats, or None if they can't be answered by them"""
+        if not self.filterset.is_valid():
+            return None
+
+        data = self.filterset.form.cleaned_data
+        if any(value for name, value in data.items() if name not in ('fund', 'round', 'status', 'per_page')):
+            return None
+
+        filters = {}
+        if data.get('fund'):
+            filters['page__in'] = data['fund']
+        if data.get('round'):
+            filters['round__in'] = data['round']
+        if data.get('status'):
+            status_map = self.filterset.filters['status'].status_map
+            filters['status__in'] = [status for name in data['status'] for status in status_map[name]]
+        return filters
+
     def get_context_data(self, **kwargs):
         search_term = self.request.GET.get('query')
-        submission_values = self.object_list.value()
+        stats_filters = self.get_stats_filters()
+        if stats_filters is None:
+            submission_values = self.object_list.value()
+        else:
+            submission_values = SubmissionStats.objects.current().filter(**stats_filters).totals()
         count_values = submission_values.get('value__count')
         total_value = intcomma(submission_values.get('value__sum'))
         average_value = intcomma(round(submission_values.get('value__avg')))
@@ -1275,6 +1425,33 @@ class SubmissionResultView(SubmissionStatsMixin, FilterView):
         )
 
 
+@method_decorator(login_required, name='dispatch')
+class FilterChoicesView(UserPassesTestMixin, View):
+    """Options of a submission filter matching the search term, in the format select2 expects"""
+    # Also offered on the reviewer dashboard, the people listed in the others are for staff only
+    reviewer_providers = ['rounds', 'funds']
+
+    def test_func(self):
+        return self.request.user.is_apply_staff or self.request.user.is_reviewer
+
+    def get(self, request, *args, **kwargs):
+        provider = PROVIDERS.get(kwargs['name'])
+        if not provider:
+            raise Http404
+        if not request.user.is_apply_staff and provider.name not in self.reviewer_providers:
+            raise PermissionDenied
+
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            page = 1
+        options, more = provider.search(request.GET.get('term', '').strip(), page=page)
+        return JsonResponse({
+            'results': [{'id': option.pk, 'text': str(option)} for option in options],
+            'pagination': {'more': more},
+        })
+
+
 @method_decorator(staff_required, name='dispatch')
 class ReviewerLeaderboard(SingleTableMixin, FilterView):
     filterset_class = ReviewerLeaderboardFilter
@@ -1294,18 +1471,16 @@ class ReviewerLeaderboard(SingleTableMixin, FilterView):
 
     def get_queryset(self):
         # Only list reviewers.
-        return self.filterset_class._meta.model.objects.reviewers()
+        return self.filterset_class._meta.model.objects.reviewers().with_roles()
 
     def get_table_data(self):
-        ninety_days_ago = timezone.now() - timedelta(days=90)
-        this_year = timezone.now().year
-        last_year = timezone.now().year - 1
-        return super().get_table_data().annotate(
-            total=Count('assignedreviewers__review'),
-            ninety_days=Count('assignedreviewers__review', filter=Q(assignedreviewers__review__created_at__date__gte=ninety_days_ago)),
-            this_year=Count('assignedreviewers__review', filter=Q(assignedreviewers__review__created_at__year=this_year)),
-            last_year=Count('assignedreviewers__review', filter=Q(assignedreviewers__review__created_at__year=last_year)),
-        )
+        return super().get_table_data().annotate(**ReviewerDailyReviews.objects.summary())
+
+    def get_table_kwargs(self):
+        kwargs = super().get_table_kwargs()
+        if self.filterset.is_valid() and self.filterset.form.cleaned_data.get('period'):
+            kwargs['extra_columns'] = [('period', tables.Column(verbose_name='In period'))]
+        return kwargs
 
 
 @method_decorator(staff_required, name='dispatch')
@@ -1318,19 +1493,15 @@ class ReviewerLeaderboardDetail(SingleTableMixin, ListView):
 
     def get_context_data(self, **kwargs):
         obj = User.objects.get(pk=self.kwargs.get('pk'))
-        return super().get_context_data(object=obj, **kwargs)
+        summary = User.objects.filter(pk=obj.pk).annotate(
+            **ReviewerDailyReviews.objects.summary()
+        ).values('total', 'ninety_days', 'this_year', 'last_year').get()
+        return super().get_context_data(object=obj, summary=summary, **kwargs)
 
     def get_table_data(self):
         return super().get_table_data().filter(author__reviewer_id=self.kwargs.get('pk')).select_related('submission')
 
 
-class RoleColumn(tables.Column):
-    def render(self, value, record):
-        return AssignedReviewers.objects.filter(
-            reviewer=record, role=self.verbose_name, submission__status__in=active_statuses
-        ).count()
-
-
 @method_decorator(staff_required, name='dispatch')
 class StaffAssignments(SingleTableMixin, ListView):
     model = User
@@ -1340,23 +1511,28 @@ class StaffAssignments(SingleTableMixin, ListView):
 
     def get_queryset(self):
         # Only list staff.
-        return self.model.objects.staff()
+        return self.model.objects.staff().with_roles()
+
+    @cached_property
+    def reviewer_roles(self):
+        return list(ReviewerRole.objects.all().order_by('order'))
 
     def get_table_data(self):
-        table_data = super().get_table_data()
-        reviewer_roles = ReviewerRole.objects.all().order_by('order')
+        table_data = list(super().get_table_data())
+        role_counts = AssignedReviewers.objects.filter(
+            reviewer__in=table_data,
+            submission__status__in=active_statuses,
+        ).role_counts()
         for data in table_data:
-            for i, role in enumerate(reviewer_roles):
-                # Only setting column name with dummy value 0.
-                # Actual value will be set in RoleColumn render method.
-                setattr(data, f'role{i}', 0)
+            for i, role in enumerate(self.reviewer_roles):
+                setattr(data, f'role{i}', role_counts.get((data.id, role.id), 0))
         return table_data
 
     def get_table_kwargs(self):
-        reviewer_roles = ReviewerRole.objects.all().order_by('order')
-        extra_columns = []
-        for i, role in enumerate(reviewer_roles):
-            extra_columns.append((f'role{i}', RoleColumn(verbose_name=role)))
+        extra_columns = [
+            (f'role{i}', tables.Column(verbose_name=role))
+            for i, role in enumerate(self.reviewer_roles)
+        ]
         return {
             'extra_columns': extra_columns,
         }
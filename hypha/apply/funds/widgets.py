@@ -1,4 +1,5 @@
 from django.contrib.staticfiles.templatetags.staticfiles import static
+from django.urls import reverse
 from django_select2.forms import Select2MultipleWidget
 
 
@@ -9,17 +10,36 @@ class Select2MultiCheckboxesWidget(Select2MultipleWidget):
             static('js/django_select2-checkboxes.js'),
         )
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, choice_provider=None, **kwargs):
         attrs = kwargs.get('attrs', {})
         attrs.setdefault('data-placeholder', 'items')
         kwargs['attrs'] = attrs
+        self.choice_provider = choice_provider
         super().__init__(*args, **kwargs)
 
+    @property
+    def is_lazy(self):
+        return self.choice_provider is not None and self.choice_provider.is_lazy()
+
     def build_attrs(self, *args, **kwargs):
         attrs = super().build_attrs(*args, **kwargs)
         attrs['class'] = attrs['class'].replace('django-select2', 'django-select2-checkboxes')
+        if self.is_lazy:
+            attrs['data-ajax--url'] = reverse('funds:submissions:filter_choices', args=[self.choice_provider.name])
+            attrs['data-ajax--delay'] = 250
+            attrs['data-choices-count'] = len(self.choice_provider.ids())
         return attrs
 
+    def optgroups(self, name, value, attrs=None):
+        if self.is_lazy:
+            # Only render the selected options, the rest are searched for with the autocomplete
+            ids = [item for item in value if str(item).isdigit()]
+            self.choices = [
+                (option.pk, str(option))
+                for option in self.choice_provider.queryset().filter(pk__in=ids)
+            ]
+        return super().optgroups(name, value, attrs)
+
 
 class MetaTermSelect2Widget(Select2MultipleWidget):
 
@@ -1,6 +1,7 @@
 import itertools
 from collections import defaultdict
 from enum import Enum
+from types import MappingProxyType
 
 from django.conf import settings
 from django.utils.text import slugify
@@ -27,43 +28,70 @@ class UserPermissions(Enum):
 
 
 class Workflow(dict):
+    """
+    The phases of a workflow, in order, keyed by their name.
+
+    The lookups the helpers below need are compiled once when the workflow is built,
+    workflows are defined at import and never change after that.
+    """
     def __init__(self, name, admin_name, **data):
         self.name = name
         self.admin_name = admin_name
         super().__init__(**data)
+        self.compile()
 
     def __str__(self):
         return self.name
 
-    @property
-    def stages(self):
+    def compile(self):
         stages = []
+        stepped_phases = defaultdict(list)
         for phase in self.values():
             if phase.stage not in stages:
                 stages.append(phase.stage)
-        return stages
+            stepped_phases[phase.step].append(phase)
+
+        self._stages = tuple(stages)
+        self._stage_index = {stage: index for index, stage in enumerate(stages)}
+        self._stepped_phases = MappingProxyType({
+            step: tuple(phases) for step, phases in stepped_phases.items()
+        })
+        # The first phase of each step is the one displayed for it
+        self._display_phases = tuple(phases[0] for phases in self._stepped_phases.values())
+        self._display_index = {phase: index for index, phase in enumerate(self._display_phases)}
+        self._viewable_by_check = statuses_by_check(
+            ((phase.name, phase) for phase in self._display_phases), 'view'
+        )
+        self._action_mapping = action_mapping(self.items())
+
+    @property
+    def stages(self):
+        return self._stages
+
+    def stage_index(self, stage):
+        return self._stage_index[stage]
+
+    def is_final_stage(self, stage):
+        return self._stage_index[stage] == len(self._stages) - 1
 
     @property
     def stepped_phases(self):
-        phases = defaultdict(list)
-        for phase in list(self.values()):
-            phases[phase.step].append(phase)
-        return phases
+        return self._stepped_phases
 
     def phases_for(self, user=None):
         # Grab the first phase for each step - visible only, the display phase
-        return [
-            phase for phase, *_ in self.stepped_phases.values()
-            if not user or phase.permissions.can_view(user)
-        ]
+        if not user:
+            return list(self._display_phases)
+        visible = statuses_for(user, self._viewable_by_check)
+        return [phase for phase in self._display_phases if phase.name in visible]
 
     def previous_visible(self, current, user):
         """Find the latest phase that the user has view permissions for"""
-        display_phase = self.stepped_phases[current.step][0]
-        phases = self.phases_for()
-        index = phases.index(display_phase)
-        for phase in phases[index - 1::-1]:
-            if phase.permissions.can_view(user):
+        display_phase = self._stepped_phases[current.step][0]
+        index = self._display_index[display_phase]
+        visible = statuses_for(user, self._viewable_by_check)
+        for phase in self._display_phases[index - 1::-1]:
+            if phase.name in visible:
                 return phase
 
 
@@ -144,6 +172,37 @@ class Permissions:
         return self.can_do(user, 'view')
 
 
+def statuses_by_check(phases, action):
+    """Map each permission check to the statuses it allows the action in"""
+    statuses = defaultdict(set)
+    for phase_name, phase in phases:
+        for check in phase.permissions.permissions.get(action, list()):
+            statuses[check].add(phase_name)
+    return {check: frozenset(names) for check, names in statuses.items()}
+
+
+def statuses_for(user, by_check):
+    """The statuses from a statuses_by_check table which the user passes a check for"""
+    statuses = set()
+    for check, names in by_check.items():
+        if check(user):
+            statuses |= names
+    return statuses
+
+
+def action_mapping(phases):
+    # Maps action names to the phase they originate from
+    transitions = defaultdict(lambda: {'display': '', 'transitions': []})
+    for phase_name, phase in phases:
+        for transition_name, transition in phase.transitions.items():
+            transition_display = transition['display']
+            transition_key = slugify(transition_display)
+            transitions[transition_key]['transitions'].append(transition_name)
+            transitions[transition_key]['display'] = transition_display
+
+    return dict(transitions)
+
+
 staff_can = lambda user: user.is_apply_staff  # NOQA
 
 applicant_can = lambda user: user.is_applicant  # NOQA
@@ -962,6 +1021,12 @@ WORKFLOWS = {
 # We cannot find the transitions for the first stage in this instance
 PHASES = list(itertools.chain.from_iterable(workflow.items() for workflow in WORKFLOWS.values()))
 
+# Last definition wins where the names clash, as with dict(PHASES)
+PHASES_BY_NAME = dict(PHASES)
+
+# Position of each status across all the workflows, used to tell the direction of a transition
+PHASE_INDEX = {phase_name: index for index, phase_name in enumerate(PHASES_BY_NAME)}
+
 
 def get_stage_change_actions():
     changes = set()
@@ -977,6 +1042,12 @@ def get_stage_change_actions():
 
 STAGE_CHANGE_ACTIONS = get_stage_change_actions()
 
+# Statuses which move straight on to a new stage once they are reached
+STAGE_CHANGE_TRIGGERS = frozenset(
+    phase_name for phase_name, phase in PHASES
+    if set(phase.transitions) & STAGE_CHANGE_ACTIONS
+)
+
 
 STATUSES = defaultdict(set)
 
@@ -989,28 +1060,36 @@ active_statuses = [
 ]
 
 
+REVIEW_ACTIVE_STATUSES = frozenset(active_statuses)
+
+review_active_statuses_by_check = statuses_by_check(
+    ((phase_name, phase) for phase_name, phase in PHASES if phase_name in REVIEW_ACTIVE_STATUSES),
+    'review',
+)
+
+
 def get_review_active_statuses(user=None):
-    reviews = set()
+    if user is None:
+        return set(REVIEW_ACTIVE_STATUSES)
+    return statuses_for(user, review_active_statuses_by_check)
 
-    for phase_name, phase in PHASES:
-        if phase_name in active_statuses:
-            if user is None:
-                reviews.add(phase_name)
-            elif phase.permissions.can_review(user):
-                reviews.add(phase_name)
-    return reviews
 
+def is_review_status(phase_name):
+    return 'review' in phase_name and 'discussion' not in phase_name
 
-def get_review_statuses(user=None):
-    reviews = set()
 
-    for phase_name, phase in PHASES:
-        if 'review' in phase_name and 'discussion' not in phase_name:
-            if user is None:
-                reviews.add(phase_name)
-            elif phase.permissions.can_review(user):
-                reviews.add(phase_name)
-    return reviews
+REVIEW_STATUSES = frozenset(phase_name for phase_name, _ in PHASES if is_review_status(phase_name))
+
+review_statuses_by_check = statuses_by_check(
+    ((phase_name, phase) for phase_name, phase in PHASES if phase_name in REVIEW_STATUSES),
+    'review',
+)
+
+
+def get_review_statuses(user=None):
+    if user is None:
+        return set(REVIEW_STATUSES)
+    return statuses_for(user, review_statuses_by_check)
 
 
 def get_ext_or_higher_statuses():
@@ -1063,21 +1142,13 @@ def get_determination_transitions():
     return transitions
 
 
+ACTION_MAPPING = action_mapping(PHASES)
+
+
 def get_action_mapping(workflow):
-    # Maps action names to the phase they originate from
-    transitions = defaultdict(lambda: {'display': '', 'transitions': []})
     if workflow:
-        phases = workflow.items()
-    else:
-        phases = PHASES
-    for phase_name, phase in phases:
-        for transition_name, transition in phase.transitions.items():
-            transition_display = transition['display']
-            transition_key = slugify(transition_display)
-            transitions[transition_key]['transitions'].append(transition_name)
-            transitions[transition_key]['display'] = transition_display
-
-    return transitions
+        return workflow._action_mapping
+    return ACTION_MAPPING
 
 
 DETERMINATION_OUTCOMES = get_determination_transitions()
@@ -1129,6 +1200,12 @@ PHASES_MAPPING = {
     },
 }
 
+# Set of the statuses in each of the PHASES_MAPPING groups, for membership checks
+PHASES_MAPPING_STATUSES = {
+    key: frozenset(data['statuses'])
+    for key, data in PHASES_MAPPING.items()
+}
+
 OPEN_CALL_PHASES = [
     'com_open_call',
 ]
@@ -1,3 +1,8 @@
+import os
+
+from hypha.apply.funds.files import submission_attachments
+
+
 def flatten(iterable):
     """Flatten the given iterable into an iterable of non-list items"""
     for item in iterable:
@@ -26,3 +31,15 @@ def get_files(project):
     file_fields = (project.submission.data(field) for field in file_field_names)
 
     return list(flatten(file_fields))
+
+
+def project_attachments(project):
+    """The (archive name, storage, name) of each file of the project and its submission"""
+    for packet_file in project.packet_files.all():
+        document = packet_file.document
+        yield os.path.join('documents', os.path.basename(document.name)), document.storage, document.name
+
+    for contract in project.contracts.all():
+        yield os.path.join('contracts', os.path.basename(contract.file.name)), contract.file.storage, contract.file.name
+
+    yield from submission_attachments(project.submission, folder='submission')
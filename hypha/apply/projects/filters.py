@@ -4,10 +4,11 @@ from django.contrib.auth import get_user_model
 from django.db.models import Q
 from django_select2.forms import Select2Widget
 
+from hypha.apply.funds.choices import fund_choices
 from hypha.apply.funds.tables import (
+    DateRangeInputWidget,
     Select2ModelMultipleChoiceFilter,
     Select2MultipleChoiceFilter,
-    get_used_funds,
 )
 
 from .models import (
@@ -28,7 +29,7 @@ def get_project_leads(request):
 
 
 class PaymentRequestListFilter(filters.FilterSet):
-    fund = Select2ModelMultipleChoiceFilter(label='Funds', queryset=get_used_funds, field_name='project__submission__page')
+    fund = Select2ModelMultipleChoiceFilter(label='Funds', queryset=fund_choices, field_name='project__submission__page')
     status = Select2MultipleChoiceFilter(label='Status', choices=REQUEST_STATUS_CHOICES)
     lead = Select2ModelMultipleChoiceFilter(label='Lead', queryset=get_project_leads, field_name='project__lead')
 
@@ -43,7 +44,7 @@ class ProjectListFilter(filters.FilterSet):
         (1, 'Behind schedule'),
     )
 
-    fund = Select2ModelMultipleChoiceFilter(label='Funds', queryset=get_used_funds)
+    fund = Select2ModelMultipleChoiceFilter(label='Funds', queryset=fund_choices)
     lead = Select2ModelMultipleChoiceFilter(label='Lead', queryset=get_project_leads)
     status = Select2MultipleChoiceFilter(label='Status', choices=PROJECT_STATUS_CHOICES)
     query = filters.CharFilter(field_name='title', lookup_expr="icontains", widget=forms.HiddenInput)
@@ -69,20 +70,6 @@ class ProjectListFilter(filters.FilterSet):
         )
 
 
-class DateRangeInputWidget(filters.widgets.SuffixedMultiWidget):
-    template_name = 'application_projects/filters/widgets/date_range_input_widget.html'
-    suffixes = ['after', 'before']
-
-    def __init__(self, attrs=None):
-        widgets = (forms.DateInput, forms.DateInput)
-        super().__init__(widgets, attrs)
-
-    def decompress(self, value):
-        if value:
-            return [value.start, value.stop]
-        return [None, None]
-
-
 class ReportListFilter(filters.FilterSet):
     reporting_period = filters.DateFromToRangeFilter(
         label="Reporting Period",
@@ -1,55 +1,26 @@
-from dateutil.relativedelta import relativedelta
 from django.conf import settings
-from django.contrib.messages.storage.fallback import FallbackStorage
 from django.core.management.base import BaseCommand
-from django.http import HttpRequest
-from django.urls import set_urlconf
-from django.utils import timezone
 
-from hypha.apply.activity.messaging import MESSAGES, messenger
-from hypha.apply.home.models import ApplyHomePage
-from hypha.apply.projects.models import Project
+from hypha.apply.projects.tasks import ReportDueDispatcher, schedule_reports
 
 
 class Command(BaseCommand):
-    help = 'Notify users that they have a report due soon'
+    help = 'Notify users that they have a report due soon, the dispatch_report_due task does the same on a schedule'
 
     def add_arguments(self, parser):
         parser.add_argument('days_before', type=int)
+        parser.add_argument('--batch-size', type=int, default=settings.DISPATCH_BATCH_SIZE)
 
     def handle(self, *args, **options):
-        site = ApplyHomePage.objects.first().get_site()
-        set_urlconf('hypha.apply.urls')
+        schedule_reports()
 
-        # Mock a HTTPRequest in order to pass the site settings into the
-        # templates
-        request = HttpRequest()
-        request.META['SERVER_NAME'] = site.hostname
-        request.META['SERVER_PORT'] = site.port
-        request.META[settings.SECURE_PROXY_SSL_HEADER] = 'https'
-        request.session = {}
-        request._messages = FallbackStorage(request)
-
-        today = timezone.now().date()
-        due_date = today + relativedelta(days=options['days_before'])
-        for project in Project.objects.in_progress():
-            next_report = project.report_config.current_due_report()
-            due_soon = next_report.end_date == due_date
-            not_notified_today = (
-                not next_report.notified or
-                next_report.notified.date() != today
-            )
-            if due_soon and not_notified_today:
-                messenger(
-                    MESSAGES.REPORT_NOTIFY,
-                    request=request,
-                    user=None,
-                    source=project,
-                    related=next_report,
+        dispatcher = ReportDueDispatcher(days_before=options['days_before'])
+        for sent, failed in dispatcher.dispatch_all(options['batch_size']):
+            for report in sent:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Notified project: {report.project_id}')
                 )
-                # Notify about the due report
-                next_report.notified = timezone.now()
-                next_report.save()
+            for report in failed:
                 self.stdout.write(
-                    self.style.SUCCESS(f'Notified project: {project.id}')
+                    self.style.ERROR(f'Failed to notify project: {report.project_id}')
                 )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from hypha.apply.projects.models import Project, ReportConfig
+
+
+class Command(BaseCommand):
+    help = 'Create or move the open report of each project in progress to its next due date, run daily'
+
+    def handle(self, *args, **options):
+        configs = ReportConfig.objects.filter(project__in=Project.objects.in_progress())
+        changed = configs.schedule_reports()
+        self.stdout.write(
+            self.style.SUCCESS(f'Scheduled {changed} reports')
+        )
@@ -12,7 +12,7 @@ from django.contrib.humanize.templatetags.humanize import ordinal
 from django.contrib.postgres.fields import JSONField
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.db.models import (
     Case,
     Count,
@@ -343,6 +343,13 @@ class ProjectQuerySet(models.QuerySet):
             )
         )
 
+    def with_next_report(self):
+        next_report = Report.objects.filter(project=OuterRef('pk')).open()
+        return self.annotate(
+            next_report_id=Subquery(next_report.values('pk')[:1]),
+            next_report_due=Subquery(next_report.values('end_date')[:1]),
+        )
+
     def for_table(self):
         return self.with_amount_paid().with_last_payment().with_outstanding_reports().select_related(
             'report_config',
@@ -434,7 +441,7 @@ class Project(BaseStreamForm, AccessFormData, models.Model):
         # See if there is a form field named "legal name", if not use user name.
         legal_name = submission.get_answer_from_label('legal name') or submission.user.full_name
 
-        return Project.objects.create(
+        project = Project.objects.create(
             submission=submission,
             title=submission.title,
             user=submission.user,
@@ -443,6 +450,8 @@ class Project(BaseStreamForm, AccessFormData, models.Model):
             contact_address=submission.form_data.get('address', ''),
             value=submission.form_data.get('value', 0),
         )
+        submission.queue_pdf()
+        return project
 
     @property
     def start_date(self):
@@ -607,8 +616,62 @@ class ProjectApprovalForm(BaseStreamForm, models.Model):
         return self.name
 
 
+class ReportConfigQueryset(models.QuerySet):
+    def with_schedule(self):
+        today = timezone.now().date()
+        reports = Report.objects.filter(project=OuterRef('project_id'))
+        open_report = reports.open()
+        return self.annotate(
+            project_start=Subquery(
+                Project.objects.filter(
+                    pk=OuterRef('project_id'),
+                ).with_start_date().values('start')[:1]
+            ),
+            # Matches ReportConfig.last_report
+            last_end_date=Subquery(
+                reports.filter(
+                    Q(end_date__lt=today) |
+                    Q(skipped=True) |
+                    Q(submitted__isnull=False)
+                ).values('end_date')[:1]
+            ),
+            open_report_id=Subquery(open_report.values('pk')[:1]),
+            open_report_end_date=Subquery(open_report.values('end_date')[:1]),
+        )
+
+    def schedule_reports(self):
+        """
+        Create or move the open report of each project to its next due date, the same
+        as ReportConfig.schedule_report but in a handful of queries for all of them.
+        """
+        to_create = []
+        to_update = []
+        for config in self.with_schedule():
+            # Project not started - no reporting required
+            if not config.project_start:
+                continue
+
+            end_date = config.due_date(config.project_start, config.last_end_date)
+            if not config.open_report_id:
+                to_create.append(Report(project_id=config.project_id, end_date=end_date))
+            elif config.open_report_end_date != end_date:
+                to_update.append(Report(pk=config.open_report_id, end_date=end_date))
+
+        with transaction.atomic():
+            Report.objects.bulk_create(to_create)
+            Report.objects.bulk_update(to_update, ['end_date'])
+
+        return len(to_create) + len(to_update)
+
+
 class ReportConfig(models.Model):
-    """Persists configuration about the reporting schedule etc"""
+    """
+    Persists configuration about the reporting schedule etc
+
+    The open report for the next period is created by schedule_report, when the
+    schedule changes or a report is submitted or skipped, and for every project by
+    the schedule_reports command which should be run daily.
+    """
 
     WEEK = "week"
     MONTH = "month"
@@ -622,6 +685,8 @@ class ReportConfig(models.Model):
     occurrence = models.PositiveSmallIntegerField(default=1)
     frequency = models.CharField(choices=FREQUENCY_CHOICES, default=MONTH, max_length=5)
 
+    objects = ReportConfigQueryset.as_manager()
+
     def get_frequency_display(self):
         next_report = self.current_due_report()
 
@@ -664,24 +729,19 @@ class ReportConfig(models.Model):
             Q(submitted__isnull=False)
         ).first()
 
-    def current_due_report(self):
-        # Project not started - no reporting required
-        if not self.project.start_date:
-            return None
-
+    def due_date(self, start_date, last_end_date):
+        """The end date of the next report, given the project start and the last report"""
         today = timezone.now().date()
 
-        last_report = self.last_report()
-
-        schedule_date = self.schedule_start or self.project.start_date
+        schedule_date = self.schedule_start or start_date
 
-        if last_report:
-            if last_report.end_date < schedule_date:
+        if last_end_date:
+            if last_end_date < schedule_date:
                 # reporting schedule changed schedule_start is now the next report date
                 next_due_date = schedule_date
             else:
                 # we've had a report since the schedule date so base next deadline from the report
-                next_due_date = self.next_date(last_report.end_date)
+                next_due_date = self.next_date(last_end_date)
         else:
             # first report required
             if self.schedule_start and self.schedule_start >= today:
@@ -695,12 +755,36 @@ class ReportConfig(models.Model):
                     today,
                 )
 
+        return next_due_date
+
+    def next_due_date(self):
+        last_report = self.last_report()
+        return self.due_date(self.project.start_date, last_report and last_report.end_date)
+
+    def current_due_report(self):
+        # Project not started - no reporting required
+        if not self.project.start_date:
+            return None
+
+        report = self.project.reports.open().first()
+        if report:
+            return report
+
+        # Not scheduled yet, show when it will be due without writing anything
+        return Report(project=self.project, end_date=self.next_due_date())
+
+    def schedule_report(self):
+        """Create the open report, or move it, to the next due date"""
+        if not self.project.start_date:
+            return None
+
+        today = timezone.now().date()
         report, _ = self.project.reports.update_or_create(
             project=self.project,
             current__isnull=True,
             skipped=False,
             end_date__gte=today,
-            defaults={'end_date': next_due_date}
+            defaults={'end_date': self.next_due_date()}
         )
         return report
 
@@ -725,6 +809,21 @@ class ReportQueryset(models.QuerySet):
             end_date__lt=today,
         ).order_by('end_date')
 
+    def open(self):
+        # Reports still to be written for a period which hasn't ended
+        today = timezone.now().date()
+        return self.filter(
+            current__isnull=True,
+            skipped=False,
+            end_date__gte=today,
+        ).order_by('end_date')
+
+    def next_due(self):
+        """The open report due soonest for each project"""
+        return self.filter(
+            pk__in=Report.objects.open().order_by('project_id', 'end_date').distinct('project_id').values('pk'),
+        )
+
     def any_very_late(self):
         two_weeks_ago = timezone.now().date() - relativedelta(weeks=2)
         return self.to_do().filter(end_date__lte=two_weeks_ago)
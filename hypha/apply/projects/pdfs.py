@@ -0,0 +1,56 @@
+from bs4 import BeautifulSoup
+
+from hypha.apply.funds.pdfs import submission_pdf_path, submission_section
+from hypha.apply.utils.pdfs import (
+    draw_project_content,
+    make_pdf,
+    pdf_digest,
+    stored_pdf,
+)
+
+
+def project_meta(project):
+    return [
+        project.submission.page,
+        project.submission.round,
+        f"Lead: { project.lead }",
+    ]
+
+
+def simplified_content(page):
+    # Only the wrapped sections of the simplified page are drawn in the PDF,
+    # the rest of the page differs for each user
+    return ''.join(
+        str(section)
+        for section in BeautifulSoup(page, "html5lib").find_all(class_='simplified__wrapper')
+    )
+
+
+def render_project_pdf(project, content, pagesize):
+    return make_pdf(
+        title=project.title,
+        sections=[
+            {
+                'content': draw_project_content(content),
+                'title': 'Project Approval Form',
+                'meta': project_meta(project),
+            },
+            submission_section(project.submission),
+        ],
+        pagesize=pagesize,
+    )
+
+
+def project_pdf(project, page, pagesize):
+    """The PDF of the project from its rendered simplified page, only built when changed"""
+    content = simplified_content(page)
+    digest = pdf_digest(
+        project.title,
+        content,
+        submission_pdf_path(project.submission, pagesize),
+        *project_meta(project),
+    )
+    return stored_pdf(
+        f'pdfs/projects/{project.id}/{digest}-{pagesize}.pdf',
+        lambda: render_project_pdf(project, content, pagesize),
+    )
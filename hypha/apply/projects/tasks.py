@@ -0,0 +1,58 @@
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.utils import timezone
+
+from hypha.apply.activity.dispatch import Dispatcher, run_batch, start_run
+from hypha.apply.activity.messaging import MESSAGES, messenger
+from hypha.apply.activity.tasks import app
+
+from .models import Project, Report, ReportConfig
+
+
+class ReportDueDispatcher(Dispatcher):
+    """Notify projects of the report due in days_before days"""
+    name = 'report_due'
+
+    def due(self):
+        today = timezone.now().date()
+        due_date = today + relativedelta(days=self.options['days_before'])
+        return Report.objects.next_due().filter(
+            project__in=Project.objects.in_progress(),
+            end_date=due_date,
+        ).exclude(
+            notified__date=today,
+        ).select_related('project')
+
+    def send(self, request, report):
+        messenger(
+            MESSAGES.REPORT_NOTIFY,
+            request=request,
+            user=None,
+            source=report.project,
+            related=report,
+        )
+
+    def mark_sent(self, reports):
+        reports.update(notified=timezone.now())
+
+    def describe(self, report):
+        return str(report.project_id)
+
+
+def schedule_reports():
+    ReportConfig.objects.filter(project__in=Project.objects.in_progress()).schedule_reports()
+
+
+@app.task
+def dispatch_report_due(days_before=None, batch_size=None):
+    schedule_reports()
+    start_run(
+        ReportDueDispatcher(days_before=days_before or settings.REPORT_NOTIFY_DAYS_BEFORE),
+        notify_report_due_batch,
+        batch_size or settings.DISPATCH_BATCH_SIZE,
+    )
+
+
+@app.task
+def notify_report_due_batch(run_id, batch_size, days_before):
+    return run_batch(ReportDueDispatcher(days_before=days_before), run_id, batch_size)
@@ -57,3 +57,19 @@ class TestNotifyReportDue(TestCase):
         out = StringIO()
         call_command('notify_report_due', 7, stdout=out)
         self.assertNotIn('Notified project', out.getvalue())
+
+
+class TestScheduleReports(TestCase):
+    def test_schedules_report_for_project_in_progress(self):
+        config = ReportConfigFactory(project__in_progress=True)
+        out = StringIO()
+        call_command('schedule_reports', stdout=out)
+        self.assertIn('Scheduled 1 reports', out.getvalue())
+        self.assertEqual(config.current_due_report().end_date, config.next_due_date())
+        self.assertIsNotNone(config.current_due_report().pk)
+
+    def test_dont_schedule_project_not_in_progress(self):
+        ReportConfigFactory()
+        out = StringIO()
+        call_command('schedule_reports', stdout=out)
+        self.assertIn('Scheduled 0 reports', out.getvalue())
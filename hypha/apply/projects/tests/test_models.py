@@ -237,7 +237,7 @@ class TestReportConfig(TestCase):
 
     def test_no_report_creates_report(self):
         config = ReportConfigFactory()
-        report = config.current_due_report()
+        report = config.schedule_report()
         # Separate day from month for case where start date + 1 month would exceed next month
         # length (31st Oct to 30th Nov)
         # combined => 31th + 1 month = 30th - 1 day = 29th (wrong)
@@ -248,20 +248,20 @@ class TestReportConfig(TestCase):
 
     def test_no_report_creates_report_not_in_past(self):
         config = ReportConfigFactory(schedule_start=self.today - relativedelta(months=3))
-        report = config.current_due_report()
+        report = config.schedule_report()
         self.assertEqual(Report.objects.count(), 1)
         self.assertEqual(report.end_date, self.today)
 
     def test_no_report_creates_report_if_current_skipped(self):
         config = ReportConfigFactory()
         skipped_report = ReportFactory(end_date=self.today + relativedelta(days=3))
-        report = config.current_due_report()
+        report = config.schedule_report()
         self.assertEqual(Report.objects.count(), 2)
         self.assertNotEqual(skipped_report, report)
 
     def test_no_report_schedule_in_future_creates_report(self):
         config = ReportConfigFactory(schedule_start=self.today + relativedelta(days=2))
-        report = config.current_due_report()
+        report = config.schedule_report()
         self.assertEqual(Report.objects.count(), 1)
         self.assertEqual(report.end_date, self.today + relativedelta(days=2))
 
@@ -275,7 +275,7 @@ class TestReportConfig(TestCase):
         # separate => 31th - 1 day = 30th + 1 month = 30th (correct)
         next_due = self.today - relativedelta(days=1) + relativedelta(months=1)
 
-        report = config.current_due_report()
+        report = config.schedule_report()
         self.assertEqual(Report.objects.count(), 2)
         self.assertEqual(report.end_date, next_due)
 
@@ -287,7 +287,7 @@ class TestReportConfig(TestCase):
         config = ReportConfigFactory(schedule_start=self.today + relativedelta(days=3))
         ReportFactory(project=config.project, end_date=self.today - relativedelta(days=1))
 
-        report = config.current_due_report()
+        report = config.schedule_report()
         self.assertEqual(Report.objects.count(), 2)
         self.assertEqual(report.end_date, self.today + relativedelta(days=3))
 
@@ -297,6 +297,64 @@ class TestReportConfig(TestCase):
         next_report = config.current_due_report()
         self.assertNotEqual(report, next_report)
 
+    def test_current_due_report_doesnt_write(self):
+        config = ReportConfigFactory()
+        report = config.current_due_report()
+        self.assertIsNone(report.pk)
+        self.assertEqual(Report.objects.count(), 0)
+        self.assertEqual(report.end_date, config.next_due_date())
+
+    def test_current_due_report_reads_scheduled(self):
+        config = ReportConfigFactory()
+        report = config.schedule_report()
+        self.assertEqual(config.current_due_report(), report)
+
+    def test_schedule_reports_matches_schedule_report(self):
+        configs = [
+            ReportConfigFactory(),
+            ReportConfigFactory(schedule_start=self.today + relativedelta(days=2)),
+            ReportConfigFactory(schedule_start=self.today - relativedelta(months=3), weeks=True),
+        ]
+        ReportFactory(project=configs[0].project, end_date=self.today - relativedelta(days=1))
+        expected = {config.project_id: config.next_due_date() for config in configs}
+
+        changed = ReportConfig.objects.schedule_reports()
+
+        self.assertEqual(changed, 3)
+        self.assertEqual(
+            {report.project_id: report.end_date for report in Report.objects.open()},
+            expected,
+        )
+        # Nothing to do once scheduled
+        self.assertEqual(ReportConfig.objects.schedule_reports(), 0)
+
+    def test_schedule_reports_moves_open_report(self):
+        config = ReportConfigFactory()
+        report = config.schedule_report()
+        config.schedule_start = self.today + relativedelta(days=5)
+        config.save()
+
+        ReportConfig.objects.schedule_reports()
+
+        report.refresh_from_db()
+        self.assertEqual(report.end_date, self.today + relativedelta(days=5))
+        self.assertEqual(Report.objects.count(), 1)
+
+    def test_next_due_report_for_many_projects(self):
+        config = ReportConfigFactory()
+        soonest = ReportFactory(project=config.project, end_date=self.today + relativedelta(days=1))
+        ReportFactory(project=config.project, end_date=self.today + relativedelta(days=10))
+        other = ReportFactory(end_date=self.today + relativedelta(days=3))
+
+        self.assertQuerysetEqual(
+            Report.objects.next_due().order_by('end_date'),
+            [soonest, other],
+            transform=lambda x: x,
+        )
+        project = Project.objects.with_next_report().get(id=config.project_id)
+        self.assertEqual(project.next_report_id, soonest.id)
+        self.assertEqual(project.next_report_due, soonest.end_date)
+
     def test_past_due(self):
         report = ReportFactory(past_due=True)
         config = report.project.report_config
@@ -8,6 +8,7 @@ from .views import (
     PaymentRequestListView,
     PaymentRequestPrivateMedia,
     PaymentRequestView,
+    ProjectAttachmentsView,
     ProjectDetailPDFView,
     ProjectDetailSimplifiedView,
     ProjectDetailView,
@@ -32,6 +33,7 @@ urlpatterns = [
         path('edit/', ProjectEditView.as_view(), name="edit"),
         path('documents/<int:file_pk>/', ProjectPrivateMediaView.as_view(), name="document"),
         path('contract/<int:file_pk>/', ContractPrivateMediaView.as_view(), name="contract"),
+        path('attachments/', ProjectAttachmentsView.as_view(), name="attachments"),
         path('download/', ProjectDetailPDFView.as_view(), name='download'),
         path('simplified/', ProjectDetailSimplifiedView.as_view(), name='simplified'),
         path('request/', CreatePaymentRequestView.as_view(), name='request'),
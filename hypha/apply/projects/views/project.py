@@ -13,6 +13,7 @@ from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
+from django.utils.text import slugify
 from django.utils.translation import gettext as _
 from django.views import View
 from django.views.generic import (
@@ -29,16 +30,12 @@ from django_tables2 import SingleTableMixin
 from hypha.apply.activity.messaging import MESSAGES, messenger
 from hypha.apply.activity.views import ActivityContextMixin, CommentFormView
 from hypha.apply.users.decorators import approver_required, staff_required
+from hypha.apply.utils.archive import zip_response
 from hypha.apply.utils.models import PDFPageSettings
-from hypha.apply.utils.pdfs import (
-    draw_project_content,
-    draw_submission_content,
-    make_pdf,
-)
 from hypha.apply.utils.storage import PrivateMediaView
 from hypha.apply.utils.views import DelegateableView, DelegatedViewMixin, ViewDispatcher
 
-from ..files import get_files
+from ..files import get_files, project_attachments
 from ..filters import PaymentRequestListFilter, ProjectListFilter, ReportListFilter
 from ..forms import (
     ApproveContractForm,
@@ -65,6 +62,7 @@ from ..models import (
     Project,
     Report,
 )
+from ..pdfs import project_pdf
 from ..tables import PaymentRequestsListTable, ProjectsListTable, ReportListTable
 from .report import ReportFrequencyUpdate, ReportingMixin
 
@@ -518,6 +516,19 @@ class ContractPrivateMediaView(UserPassesTestMixin, PrivateMediaView):
         return False
 
 
+@method_decorator(staff_required, name='dispatch')
+class ProjectAttachmentsView(SingleObjectMixin, View):
+    """Stream a zip of the documents and contracts of the project and the files of its submission"""
+    model = Project
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return zip_response(
+            project_attachments(self.object),
+            f'{self.object.id}-{slugify(self.object.title)}-attachments.zip',
+        )
+
+
 # PROJECT EDIT
 
 @method_decorator(staff_required, name='dispatch')
@@ -537,35 +548,10 @@ class ProjectDetailPDFView(SingleObjectMixin, View):
             request=self.request,
             pk=self.object.pk,
         )
-        project = draw_project_content(
-            response.render().content
-        )
-        submission = draw_submission_content(
-            self.object.submission.output_text_answers()
-        )
-        pdf = make_pdf(
-            title=self.object.title,
-            sections=[
-                {
-                    'content': project,
-                    'title': 'Project Approval Form',
-                    'meta': [
-                        self.object.submission.page,
-                        self.object.submission.round,
-                        f"Lead: { self.object.lead }",
-                    ],
-                }, {
-                    'content': submission,
-                    'title': 'Submission',
-                    'meta': [
-                        self.object.submission.stage,
-                        self.object.submission.page,
-                        self.object.submission.round,
-                        f"Lead: { self.object.submission.lead }",
-                    ],
-                },
-            ],
-            pagesize=pdf_page_settings.download_page_size,
+        pdf = project_pdf(
+            self.object,
+            response.render().content,
+            pdf_page_settings.download_page_size,
         )
         return FileResponse(
             pdf,
@@ -26,7 +26,8 @@ class ReportingMixin:
         project = self.get_object()
         if project.is_in_progress:
             if not hasattr(project, 'report_config'):
-                ReportConfig.objects.create(project=project)
+                config = ReportConfig.objects.create(project=project)
+                config.schedule_report()
 
         return super().dispatch(*args, **kwargs)
 
@@ -92,6 +93,10 @@ class ReportUpdateView(ReportAccessMixin, UpdateView):
     def form_valid(self, form):
         response = super().form_valid(form)
 
+        if self.object.current:
+            # The submitted report may have been the open one, schedule the next
+            self.object.project.report_config.schedule_report()
+
         should_notify = True
         if self.object.draft:
             # It was a draft submission
@@ -161,6 +166,7 @@ class ReportSkipView(SingleObjectMixin, View):
         if unsubmitted and not_current:
             report.skipped = not report.skipped
             report.save()
+            report.project.report_config.schedule_report()
             messenger(
                 MESSAGES.SKIPPED_REPORT,
                 request=self.request,
@@ -195,6 +201,7 @@ class ReportFrequencyUpdate(DelegatedViewMixin, UpdateView):
     def form_valid(self, form):
         config = form.instance
         response = super().form_valid(form)
+        config.schedule_report()
         messenger(
             MESSAGES.REPORT_FREQUENCY_CHANGED,
             request=self.request,
@@ -1,6 +1,8 @@
 from django.contrib.postgres.fields import JSONField
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -8,6 +10,7 @@ from wagtail.admin.edit_handlers import FieldPanel, StreamFieldPanel
 from wagtail.core.fields import StreamField
 
 from hypha.apply.funds.models.mixins import AccessFormData
+from hypha.apply.stream_forms.cache import invalidate_form_classes
 from hypha.apply.stream_forms.models import BaseStreamForm
 from hypha.apply.users.groups import (
     PARTNER_GROUP_NAME,
@@ -90,6 +93,12 @@ class ReviewForm(ReviewFormFieldsMixin, models.Model):
         return self.name
 
 
+@receiver(post_save, sender=ReviewForm)
+@receiver(post_delete, sender=ReviewForm)
+def invalidate_review_form_classes(sender, **kwargs):
+    invalidate_form_classes()
+
+
 class ReviewQuerySet(models.QuerySet):
     def submitted(self):
         return self.filter(is_draft=False)
@@ -51,7 +51,7 @@ class ReviewContextMixin:
 
 def get_fields_for_stage(submission):
     forms = submission.get_from_parent('review_forms').all()
-    index = submission.workflow.stages.index(submission.stage)
+    index = submission.workflow.stage_index(submission.stage)
     try:
         return forms[index].form.form_fields
     except IndexError:
@@ -0,0 +1,66 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+DEFINITIONS_VERSION_KEY = 'stream_forms:definitions_version'
+
+
+class FormClassCache:
+    """Per process LRU of the form classes built from the form field streams
+
+    Entries are keyed on a fingerprint of the stream, so editing a form definition
+    never serves an old class. The shared definitions version is part of the key to
+    catch changes which aren't in the stream, e.g. the options of a category.
+    """
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._classes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._classes.move_to_end(key)
+            except KeyError:
+                return None
+            return self._classes[key]
+
+    def set(self, key, form_class):
+        with self._lock:
+            self._classes[key] = form_class
+            self._classes.move_to_end(key)
+            while len(self._classes) > self.maxsize:
+                self._classes.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._classes.clear()
+
+
+form_class_cache = FormClassCache()
+
+
+def definitions_version():
+    return cache.get(DEFINITIONS_VERSION_KEY, 0)
+
+
+def invalidate_form_classes():
+    """Drop the cached form classes in every process"""
+    try:
+        cache.incr(DEFINITIONS_VERSION_KEY)
+    except ValueError:
+        cache.set(DEFINITIONS_VERSION_KEY, 1, None)
+    form_class_cache.clear()
+
+
+def fingerprint(form_fields):
+    # Only streams loaded from the database have their raw JSON to hand, anything
+    # else may be mid edit and isn't cached
+    if not getattr(form_fields, 'is_lazy', False):
+        return None
+    raw = json.dumps(form_fields.stream_data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha1(raw.encode()).hexdigest()
@@ -13,6 +13,7 @@ from .blocks import (
     MultiInputCharFieldBlock,
     TextFieldBlock,
 )
+from .cache import definitions_version, fingerprint, form_class_cache
 from .forms import BlockFieldWrapper, PageStreamBaseForm
 
 
@@ -46,9 +47,10 @@ class BaseStreamForm:
     def get_defined_fields(self):
         return self.form_fields
 
-    def get_form_fields(self, draft=False):
+    def get_form_fields(self, draft=False, field_blocks=None):
         form_fields = OrderedDict()
-        field_blocks = self.get_defined_fields()
+        if field_blocks is None:
+            field_blocks = self.get_defined_fields()
         group_counter = 1
         is_in_group = False
         for struct_child in field_blocks:
@@ -97,8 +99,22 @@ class BaseStreamForm:
 
         return form_fields
 
+    def build_form_class(self, draft=False, field_blocks=None):
+        return type('WagtailStreamForm', (self.submission_form_class,), self.get_form_fields(draft, field_blocks))
+
     def get_form_class(self, draft=False):
-        return type('WagtailStreamForm', (self.submission_form_class,), self.get_form_fields(draft))
+        # Building the class instantiates every field, reuse it for the same definition
+        field_blocks = self.get_defined_fields()
+        field_blocks_fingerprint = fingerprint(field_blocks)
+        if field_blocks_fingerprint is None:
+            return self.build_form_class(draft, field_blocks)
+
+        key = (definitions_version(), self.submission_form_class, draft, field_blocks_fingerprint)
+        form_class = form_class_cache.get(key)
+        if form_class is None:
+            form_class = self.build_form_class(draft, field_blocks)
+            form_class_cache.set(key, form_class)
+        return form_class
 
 
 class AbstractStreamForm(BaseStreamForm, AbstractForm):
@@ -1,7 +1,10 @@
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import AbstractUser, BaseUserManager, Group
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
-from django.db.models import Q
+from django.db.models import Func, OuterRef, Q, Subquery
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from wagtail.admin.edit_handlers import FieldPanel, MultiFieldPanel
@@ -16,6 +19,7 @@ from .groups import (
     REVIEWER_GROUP_NAME,
     STAFF_GROUP_NAME,
 )
+from .roles import invalidate_roles, user_roles
 from .utils import send_activation_email
 
 
@@ -40,6 +44,14 @@ class UserQuerySet(models.QuerySet):
     def approvers(self):
         return self.filter(groups__name=APPROVER_GROUP_NAME)
 
+    def with_roles(self):
+        # Load the group names along with the users for listing their roles. A subquery
+        # rather than a join so the filters on the groups don't limit the names
+        group_names = Group.objects.filter(user=OuterRef('pk')).values('name')
+        return self.annotate(
+            group_names=Func(Subquery(group_names), function='ARRAY', output_field=ArrayField(models.CharField())),
+        )
+
 
 class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     use_in_migrations = True
@@ -126,31 +138,33 @@ class User(AbstractUser):
 
     @cached_property
     def roles(self):
-        return list(self.groups.values_list('name', flat=True))
+        if 'group_names' in self.__dict__:
+            return self.group_names or []
+        return user_roles(self)
 
     @cached_property
     def is_apply_staff(self):
-        return self.groups.filter(name=STAFF_GROUP_NAME).exists() or self.is_superuser
+        return STAFF_GROUP_NAME in self.roles or self.is_superuser
 
     @cached_property
     def is_reviewer(self):
-        return self.groups.filter(name=REVIEWER_GROUP_NAME).exists()
+        return REVIEWER_GROUP_NAME in self.roles
 
     @cached_property
     def is_partner(self):
-        return self.groups.filter(name=PARTNER_GROUP_NAME).exists()
+        return PARTNER_GROUP_NAME in self.roles
 
     @cached_property
     def is_community_reviewer(self):
-        return self.groups.filter(name=COMMUNITY_REVIEWER_GROUP_NAME).exists()
+        return COMMUNITY_REVIEWER_GROUP_NAME in self.roles
 
     @cached_property
     def is_applicant(self):
-        return self.groups.filter(name=APPLICANT_GROUP_NAME).exists()
+        return APPLICANT_GROUP_NAME in self.roles
 
     @cached_property
     def is_approver(self):
-        return self.groups.filter(name=APPROVER_GROUP_NAME).exists()
+        return APPROVER_GROUP_NAME in self.roles
 
     class Meta:
         ordering = ('full_name', 'email')
@@ -182,3 +196,30 @@ class UserSettings(BaseSetting):
             FieldPanel('consent_help'),
         ], 'consent checkbox'),
     ]
+
+
+ROLE_PROPERTIES = [
+    'roles',
+    'is_apply_staff',
+    'is_reviewer',
+    'is_partner',
+    'is_community_reviewer',
+    'is_applicant',
+    'is_approver',
+]
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_roles_on_membership_change(sender, instance, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate_roles()
+        if isinstance(instance, User):
+            # The user changed in place should see its new roles straight away
+            for role_property in ROLE_PROPERTIES:
+                instance.__dict__.pop(role_property, None)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_roles_on_group_change(sender, **kwargs):
+    invalidate_roles()
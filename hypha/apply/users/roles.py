@@ -0,0 +1,29 @@
+import time
+
+from django.core.cache import cache
+
+ROLES_VERSION_KEY = 'users:roles_version'
+ROLES_TIMEOUT = 60 * 60
+
+
+def roles_version():
+    # Start from the time rather than 0 so an evicted version can't bring back old entries
+    return cache.get_or_set(ROLES_VERSION_KEY, lambda: int(time.time()), None)
+
+
+def invalidate_roles():
+    """Drop the cached roles of every user, call when group memberships change"""
+    try:
+        cache.incr(ROLES_VERSION_KEY)
+    except ValueError:
+        roles_version()
+
+
+def user_roles(user):
+    """Group names of the user, shared between requests until the memberships change"""
+    key = f'users:roles:{roles_version()}:{user.pk}'
+    roles = cache.get(key)
+    if roles is None:
+        roles = list(user.groups.values_list('name', flat=True))
+        cache.set(key, roles, ROLES_TIMEOUT)
+    return roles
@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from ..groups import REVIEWER_GROUP_NAME, STAFF_GROUP_NAME
+from .factories import GroupFactory, ReviewerFactory, StaffFactory
+
+User = get_user_model()
+
+
+class TestUserRoles(TestCase):
+    def test_role_flags_share_one_query(self):
+        user = User.objects.get(id=StaffFactory().id)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.is_apply_staff)
+            self.assertFalse(user.is_reviewer)
+            self.assertFalse(user.is_applicant)
+
+    def test_roles_cached_between_instances(self):
+        staff = StaffFactory()
+        User.objects.get(id=staff.id).roles
+        user = User.objects.get(id=staff.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.is_apply_staff)
+
+    def test_roles_updated_when_groups_change(self):
+        staff = StaffFactory()
+        self.assertFalse(staff.is_reviewer)
+        staff.groups.add(GroupFactory(name=REVIEWER_GROUP_NAME))
+        self.assertTrue(staff.is_reviewer)
+        self.assertTrue(User.objects.get(id=staff.id).is_reviewer)
+
+    def test_with_roles(self):
+        StaffFactory()
+        ReviewerFactory()
+        users = list(User.objects.with_roles())
+        with self.assertNumQueries(0):
+            roles = {user.email: user.roles for user in users}
+        for user in users:
+            self.assertEqual(roles[user.email], list(user.groups.values_list('name', flat=True)))
+        self.assertIn([STAFF_GROUP_NAME], roles.values())
+
+    def test_with_roles_not_limited_by_filter(self):
+        staff = StaffFactory()
+        staff.groups.add(GroupFactory(name=REVIEWER_GROUP_NAME))
+        user = User.objects.staff().with_roles().get(id=staff.id)
+        self.assertCountEqual(user.roles, [STAFF_GROUP_NAME, REVIEWER_GROUP_NAME])
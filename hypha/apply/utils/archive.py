@@ -0,0 +1,111 @@
+import logging
+import os
+import time
+import zipfile
+
+from django.http import StreamingHttpResponse
+
+logger = logging.getLogger(__name__)
+
+MISSING_FILES_NAME = 'missing files.txt'
+
+STORED_EXTENSIONS = {
+    '.pdf',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp',
+    '.mp3', '.mp4', '.m4v', '.mov', '.avi', '.mkv', '.webm',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar',
+    '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp',
+}
+
+
+class ZipStream:
+    """
+    Write only file handed to ZipFile, the written bytes are collected until the
+    stream is drained so the archive can be sent as it is written.
+    """
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        # ZipFile writes data descriptors when the stream can't seek
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+def unique_name(name, used):
+    stem, extension = os.path.splitext(name)
+    counter = 1
+    while name in used:
+        counter += 1
+        name = f'{stem} ({counter}){extension}'
+    used.add(name)
+    return name
+
+
+def compress_type(name):
+    # Already compressed formats only cost CPU to deflate again
+    _, extension = os.path.splitext(name)
+    if extension.lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def stream_zip(files):
+    """
+    Yield a zip archive of the given ``(archive name, storage, name)`` files, reading
+    each file from its storage in chunks so neither the files nor the archive are
+    held in memory or on disk.
+
+    Files which can't be read are left out and listed in MISSING_FILES_NAME, the
+    response has already started so the archive is finished rather than aborted.
+    """
+    stream = ZipStream()
+    used = set()
+    missing = []
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for archive_name, storage, name in files:
+            try:
+                media = storage.open(name, 'rb')
+            except OSError as e:
+                logger.warning('Unable to add %s to the archive: %s', name, e)
+                missing.append(archive_name)
+                continue
+
+            with media:
+                entry_info = zipfile.ZipInfo(unique_name(archive_name, used), time.localtime()[:6])
+                entry_info.compress_type = compress_type(archive_name)
+                # The size isn't known up front, so allow for files over 2GB
+                with archive.open(entry_info, 'w', force_zip64=True) as entry:
+                    try:
+                        for chunk in media.chunks():
+                            entry.write(chunk)
+                            yield from stream.drain()
+                    except OSError as e:
+                        logger.warning('Unable to read %s into the archive: %s', name, e)
+                        missing.append(archive_name)
+            yield from stream.drain()
+
+        if missing:
+            archive.writestr(
+                unique_name(MISSING_FILES_NAME, used),
+                'These files could not be read and are not included:\n' + '\n'.join(missing) + '\n',
+            )
+    yield from stream.drain()
+
+
+def zip_response(files, filename):
+    response = StreamingHttpResponse(stream_zip(files), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -1,6 +1,7 @@
-import requests
 from django.conf import settings
 
+from .slack import post_to_slack
+
 
 class SlackNotifications():
 
@@ -47,7 +48,7 @@ class SlackNotifications():
             "room": self.target_room,
             "message": message,
         }
-        response = requests.post(self.destination, json=data)
+        response = post_to_slack(self.destination, data)
 
         return str(response.status_code) + ': ' + response.content.decode()
 
@@ -1,8 +1,10 @@
+import hashlib
 import io
 import os
 from itertools import cycle
 
 from bs4 import BeautifulSoup, NavigableString
+from django.core.files import File
 from reportlab.lib import pagesizes
 from reportlab.lib.colors import Color, white
 from reportlab.lib.styles import ParagraphStyle as PS
@@ -24,6 +26,8 @@ from reportlab.platypus import (
     TableStyle,
 )
 
+from .storage import PrivateStorage
+
 STYLES = {
     'Question': PS(fontName='MontserratBold', fontSize=14, name='Question', spaceAfter=0, spaceBefore=18, leading=21),
     'QuestionSmall': PS(fontName='MontserratBold', fontSize=12, name='QuestionSmall', spaceAfter=0, spaceBefore=16, leading=18),
@@ -151,6 +155,35 @@ def make_pdf(title, sections, pagesize):
     return buffer
 
 
+def pdf_digest(*parts):
+    """Short digest of everything drawn into a PDF other than its stored revision"""
+    return hashlib.sha1('\0'.join(str(part) for part in parts).encode()).hexdigest()[:12]
+
+
+def stored_pdf(path, render, storage=None):
+    """
+    Open the PDF stored at ``path``, calling ``render`` to build and store it first
+    when it isn't there.
+
+    The path identifies the content of the PDF and ends in -<pagesize>.pdf, so any
+    other PDF of the same page size in the directory is an out of date copy and is
+    removed when a new one is stored.
+    """
+    storage = storage or PrivateStorage()
+    if not storage.exists(path):
+        directory, name = os.path.split(path)
+        page_size_suffix = '-' + name.rsplit('-', 1)[-1]
+        try:
+            _, stored_files = storage.listdir(directory)
+        except FileNotFoundError:
+            stored_files = []
+        for stale_file in stored_files:
+            if stale_file.endswith(page_size_suffix):
+                storage.delete(os.path.join(directory, stale_file))
+        storage.save(path, File(render(), name=name))
+    return storage.open(path)
+
+
 def split_text(canvas, text, width):
     return simpleSplit(text, canvas._fontname, canvas._fontsize, width)
 
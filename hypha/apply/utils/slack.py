@@ -0,0 +1,27 @@
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+_local = threading.local()
+
+
+def slack_session():
+    """Keep-alive session for posting to the slack backend, one per thread"""
+    try:
+        return _local.session
+    except AttributeError:
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_maxsize=settings.SLACK_POOL_SIZE))
+        session.mount('http://', HTTPAdapter(pool_maxsize=settings.SLACK_POOL_SIZE))
+        _local.session = session
+        return session
+
+
+def post_to_slack(destination, data):
+    return slack_session().post(
+        destination,
+        json=data,
+        timeout=(settings.SLACK_CONNECT_TIMEOUT, settings.SLACK_READ_TIMEOUT),
+    )
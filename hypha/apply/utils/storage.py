@@ -1,12 +1,167 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.files.storage import get_storage_class
-from django.http import FileResponse
+from django.core.files.storage import FileSystemStorage, get_storage_class
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.utils.cache import add_never_cache_headers, get_conditional_response
+from django.utils.functional import cached_property
+from django.utils.http import http_date, quote_etag
+from django.utils.module_loading import import_string
 from django.views.generic import View
 
 private_file_storage = getattr(settings, 'PRIVATE_FILE_STORAGE', None)
 PrivateStorage = get_storage_class(private_file_storage)
 
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def media_name(storage, media):
+    """The name of the media in its storage, opening a local file gives its full path"""
+    name = media.name
+    if isinstance(storage, FileSystemStorage) and os.path.isabs(name):
+        return os.path.relpath(name, storage.location)
+    return name
+
+
+def content_type(name):
+    return mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+
+class PythonDelivery:
+    """
+    Stream the file through the worker, answering the conditional and range
+    requests so clients can resume or seek without downloading it all again.
+    """
+    chunk_size = 64 * 1024
+
+    def supports(self, storage):
+        return True
+
+    def validators(self, storage, name, size):
+        try:
+            last_modified = int(storage.get_modified_time(name).timestamp())
+        except (NotImplementedError, OSError):
+            return None, None
+        return quote_etag(f'{size:x}-{last_modified:x}'), last_modified
+
+    def byte_range(self, request, etag, size):
+        match = RANGE_RE.match(request.META.get('HTTP_RANGE', ''))
+        if not match or not size:
+            return None
+
+        # A range from a different version of the file gets the whole file
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if if_range and if_range != etag:
+            return None
+
+        start, end = match.groups()
+        if not start:
+            if not end:
+                return None
+            start, end = max(size - int(end), 0), size - 1
+        else:
+            start, end = int(start), min(int(end), size - 1) if end else size - 1
+        if start > end:
+            return False
+        return start, end
+
+    def read_range(self, media, start, end):
+        media.seek(start)
+        remaining = end - start + 1
+        try:
+            while remaining > 0:
+                chunk = media.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            media.close()
+
+    def serve(self, request, storage, media):
+        name = media_name(storage, media)
+        size = media.size
+        etag, last_modified = self.validators(storage, name, size)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            media.close()
+            return response
+
+        byte_range = self.byte_range(request, etag, size)
+        if byte_range is False:
+            media.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                self.read_range(media, start, end),
+                status=206,
+                content_type=content_type(name),
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = end - start + 1
+        else:
+            response = FileResponse(media)
+            response['Content-Length'] = size
+
+        response['Accept-Ranges'] = 'bytes'
+        if etag:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class XAccelRedirectDelivery:
+    """Hand local files over to nginx from an internal location, see PRIVATE_MEDIA_ACCEL_PREFIX"""
+    def supports(self, storage):
+        return isinstance(storage, FileSystemStorage)
+
+    def serve(self, request, storage, media):
+        name = media_name(storage, media)
+        media.close()
+        response = HttpResponse(content_type=content_type(name))
+        response['X-Accel-Redirect'] = settings.PRIVATE_MEDIA_ACCEL_PREFIX.rstrip('/') + '/' + quote(name)
+        return response
+
+
+class XSendfileDelivery:
+    """Hand local files over to Apache mod_xsendfile or another X-Sendfile aware server"""
+    def supports(self, storage):
+        return isinstance(storage, FileSystemStorage)
+
+    def serve(self, request, storage, media):
+        name = media_name(storage, media)
+        media.close()
+        response = HttpResponse(content_type=content_type(name))
+        response['X-Sendfile'] = storage.path(name)
+        return response
+
+
+class SignedRedirectDelivery:
+    """Redirect to a short lived signed url of the file, for storages which sign their urls e.g. S3"""
+    def supports(self, storage):
+        return getattr(storage, 'querystring_auth', False)
+
+    def serve(self, request, storage, media):
+        name = media_name(storage, media)
+        media.close()
+        response = HttpResponseRedirect(storage.url(name, expire=settings.PRIVATE_MEDIA_URL_EXPIRE))
+        # The signed url must not outlive its expiry in a cache
+        add_never_cache_headers(response)
+        return response
+
 
 class PrivateMediaView(LoginRequiredMixin, View):
     """
@@ -16,8 +171,17 @@ class PrivateMediaView(LoginRequiredMixin, View):
     Classes inheriting from this should implement their own access requirements
     based on the file being served, this class will only ensure that the file
     is not made public to unauthenticated users.
+
+    Once the access is checked, the file is delivered by PRIVATE_MEDIA_DELIVERY,
+    falling back to streaming it through the worker when the delivery can't
+    serve files from the file's storage.
     """
     storage = PrivateStorage()
+    fallback_delivery = PythonDelivery()
+
+    @cached_property
+    def delivery(self):
+        return import_string(settings.PRIVATE_MEDIA_DELIVERY)()
 
     def get_media(self, *args, **kwargs):
         """
@@ -31,4 +195,6 @@ class PrivateMediaView(LoginRequiredMixin, View):
 
     def get(self, *args, **kwargs):
         file_to_serve = self.get_media(*args, **kwargs)
-        return FileResponse(file_to_serve)
+        storage = getattr(file_to_serve, 'storage', None) or self.storage
+        delivery = self.delivery if self.delivery.supports(storage) else self.fallback_delivery
+        return delivery.serve(self.request, storage, file_to_serve)
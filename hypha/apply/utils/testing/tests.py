@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.messages.storage.fallback import FallbackStorage
 from django.test import RequestFactory, TestCase, override_settings
@@ -16,6 +18,15 @@ def make_request(user=AnonymousUser(), data={}, method='get', site=None):
     return request
 
 
+class OnCommitMixin:
+    """Runs the transaction.on_commit callbacks straight away, a TestCase never commits"""
+    def setUp(self):
+        patcher = mock.patch('django.db.transaction.on_commit', side_effect=lambda func, using=None: func())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+
 @override_settings(ROOT_URLCONF='hypha.apply.urls')
 class BaseViewTestCase(TestCase):
     """
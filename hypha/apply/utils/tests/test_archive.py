@@ -0,0 +1,36 @@
+import io
+import shutil
+import tempfile
+import zipfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+
+from ..archive import MISSING_FILES_NAME, stream_zip
+
+
+class TestStreamZip(SimpleTestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.storage = FileSystemStorage(location=location)
+
+    def archive(self, *names):
+        files = [(name, self.storage, name) for name in names]
+        return zipfile.ZipFile(io.BytesIO(b''.join(stream_zip(files))))
+
+    def test_missing_file_listed(self):
+        self.storage.save('notes.txt', ContentFile(b'notes'))
+        with self.assertLogs('hypha.apply.utils.archive', 'WARNING'):
+            archive = self.archive('notes.txt', 'lost.txt')
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.namelist(), ['notes.txt', MISSING_FILES_NAME])
+        self.assertIn('lost.txt', archive.read(MISSING_FILES_NAME).decode())
+
+    def test_compressed_formats_stored(self):
+        self.storage.save('scan.pdf', ContentFile(b'%PDF'))
+        self.storage.save('notes.txt', ContentFile(b'notes'))
+        archive = self.archive('scan.pdf', 'notes.txt')
+        self.assertEqual(archive.getinfo('scan.pdf').compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(archive.getinfo('notes.txt').compress_type, zipfile.ZIP_DEFLATED)
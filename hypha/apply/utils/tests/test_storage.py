@@ -0,0 +1,68 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..storage import PythonDelivery, SignedRedirectDelivery, XAccelRedirectDelivery
+
+
+class DeliveryTestCase(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.storage = FileSystemStorage(location=location)
+        self.name = self.storage.save('documents/file.txt', ContentFile(b'0123456789'))
+
+    def serve(self, delivery, **headers):
+        return delivery.serve(self.factory.get('/', **headers), self.storage, self.storage.open(self.name))
+
+
+class TestPythonDelivery(DeliveryTestCase):
+    def content(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_whole_file(self):
+        response = self.serve(PythonDelivery())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.content(response), b'0123456789')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('ETag', response)
+
+    def test_range(self):
+        response = self.serve(PythonDelivery(), HTTP_RANGE='bytes=2-4')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.content(response), b'234')
+        self.assertEqual(response['Content-Range'], 'bytes 2-4/10')
+
+    def test_suffix_range(self):
+        response = self.serve(PythonDelivery(), HTTP_RANGE='bytes=-3')
+        self.assertEqual(self.content(response), b'789')
+
+    def test_unsatisfiable_range(self):
+        response = self.serve(PythonDelivery(), HTTP_RANGE='bytes=20-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_range_of_changed_file_gets_whole_file(self):
+        response = self.serve(PythonDelivery(), HTTP_RANGE='bytes=2-4', HTTP_IF_RANGE='"changed"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_modified(self):
+        etag = self.serve(PythonDelivery())['ETag']
+        response = self.serve(PythonDelivery(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class TestOffloadedDelivery(DeliveryTestCase):
+    @override_settings(PRIVATE_MEDIA_ACCEL_PREFIX='/protected/')
+    def test_accel_redirect(self):
+        response = self.serve(XAccelRedirectDelivery())
+        self.assertEqual(response['X-Accel-Redirect'], '/protected/documents/file.txt')
+        self.assertEqual(response['Content-Type'], 'text/plain')
+        self.assertEqual(response.content, b'')
+
+    def test_unsigned_storage_not_redirected(self):
+        self.assertFalse(SignedRedirectDelivery().supports(self.storage))
@@ -6,6 +6,7 @@ Django settings for hypha project.
 import os
 
 import dj_database_url
+from celery.schedules import crontab
 
 env = os.environ.copy()
 
@@ -550,6 +551,9 @@ if 'SLACK_TYPE_COMMENTS' in env:
     SLACK_TYPE_COMMENTS = env['SLACK_TYPE_COMMENTS'].split(',')
 else:
     SLACK_TYPE_COMMENTS = []
+SLACK_CONNECT_TIMEOUT = float(env.get('SLACK_CONNECT_TIMEOUT', 3))
+SLACK_READ_TIMEOUT = float(env.get('SLACK_READ_TIMEOUT', 10))
+SLACK_POOL_SIZE = int(env.get('SLACK_POOL_SIZE', 10))
 
 
 # Celery config
@@ -558,12 +562,45 @@ if 'REDIS_URL' in env:
 else:
     CELERY_TASK_ALWAYS_EAGER = True
 
+# Run the scheduled tasks with celery beat: celery -A hypha.apply.activity.tasks beat
+CELERY_BEAT_SCHEDULE = {
+    'send-reminders': {
+        'task': 'hypha.apply.funds.tasks.dispatch_reminders',
+        'schedule': crontab(minute='*/15'),
+    },
+    'notify-report-due': {
+        'task': 'hypha.apply.projects.tasks.dispatch_report_due',
+        'schedule': crontab(hour=7, minute=0),
+    },
+    'delete-expired-exports': {
+        'task': 'hypha.apply.funds.tasks.delete_expired_exports',
+        'schedule': crontab(hour=3, minute=0),
+    },
+}
+
+# Number of rows each worker claims at a time when dispatching due messages
+DISPATCH_BATCH_SIZE = int(env.get('DISPATCH_BATCH_SIZE', 100))
+REPORT_NOTIFY_DAYS_BEFORE = int(env.get('REPORT_NOTIFY_DAYS_BEFORE', 7))
+# Days the submission exports and round PDF zips emailed to users can be downloaded for
+EXPORT_EXPIRE_DAYS = int(env.get('EXPORT_EXPIRE_DAYS', 7))
+
+
+# How private media is delivered once the user's access is checked, one of
+# PythonDelivery, XAccelRedirectDelivery, XSendfileDelivery or SignedRedirectDelivery
+# from hypha.apply.utils.storage
+PRIVATE_MEDIA_DELIVERY = env.get('PRIVATE_MEDIA_DELIVERY', 'hypha.apply.utils.storage.PythonDelivery')
+# The internal nginx location aliased to the private media directory
+PRIVATE_MEDIA_ACCEL_PREFIX = env.get('PRIVATE_MEDIA_ACCEL_PREFIX', '/protected/')
+# Seconds a signed private media url is valid for
+PRIVATE_MEDIA_URL_EXPIRE = int(env.get('PRIVATE_MEDIA_URL_EXPIRE', 60))
+
 
 # S3 configuration
 
 if 'AWS_STORAGE_BUCKET_NAME' in env:
     DEFAULT_FILE_STORAGE = 'hypha.storage_backends.PublicMediaStorage'
     PRIVATE_FILE_STORAGE = 'hypha.storage_backends.PrivateMediaStorage'
+    PRIVATE_MEDIA_DELIVERY = env.get('PRIVATE_MEDIA_DELIVERY', 'hypha.apply.utils.storage.SignedRedirectDelivery')
 
     AWS_STORAGE_BUCKET_NAME = env['AWS_STORAGE_BUCKET_NAME']
 
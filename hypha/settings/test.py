@@ -17,3 +17,8 @@ STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
 ]
+
+# The database cache table isn't created for the test database
+CACHES['default'] = {  # noqa
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+}